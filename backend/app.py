@@ -2,16 +2,36 @@
 Backend API - Flask app pentru API REST (JSON responses)
 Nu servește HTML, doar JSON pentru frontend
 """
-from flask import Flask, jsonify, request
-from models.database import init_db
+from flask import Flask, Response, jsonify, request
+from models.database import init_db, init_app
+from models.sql_trace import instrumenteaza_sql
 from routes.auth_routes import auth_bp
 from routes.movie_routes import movie_bp
 from routes.friend_routes import friend_bp
-from services.external_api import search_movies
+from routes.batch_routes import batch_bp
+from routes.dashboard_routes import dashboard_bp
+from services.external_api import search_movies, suggest_movies, statistici_cache_cautari
+from security import statistici_cache_token
+from services.events import hub_recomandari
+from services.delta_sync import curata_periodic
+from metrics import instrumenteaza, linii_valori, registru_http
+from profiling import activeaza_profilare
 
 # Initializam aplicatia Flask pentru API
 app = Flask(__name__)
 
+# Conexiunile la baza de date sunt luate din pool si eliberate la teardown
+init_app(app)
+
+# Metricile HTTP (latenta, statusuri, cereri in curs) sunt inregistrate pentru fiecare cerere
+instrumenteaza(app)
+
+# Urmarirea interogarilor SQL per cerere (doar cu MOVIE_MANAGER_SQL_TRACE activ)
+instrumenteaza_sql(app)
+
+# Profilarea la cerere a unei singure cereri (doar cu MOVIE_MANAGER_PROFILE_KEY setat)
+activeaza_profilare(app)
+
 # CORS headers manual (pentru a nu necesita flask-cors)
 @app.after_request
 def after_request(response):
@@ -33,6 +53,8 @@ def handle_preflight():
 app.register_blueprint(auth_bp, url_prefix='/api')
 app.register_blueprint(movie_bp, url_prefix='/api')
 app.register_blueprint(friend_bp, url_prefix='/api')
+app.register_blueprint(batch_bp, url_prefix='/api')
+app.register_blueprint(dashboard_bp, url_prefix='/api')
 
 # Ruta pentru cautarea filmelor (API extern)
 @app.route('/api/search-movies', methods=['GET'])
@@ -42,15 +64,49 @@ def search_movies_route():
     """
     return search_movies()
 
+# Ruta pentru sugestii de autocomplete (index de titluri in memorie)
+@app.route('/api/search-movies/suggest', methods=['GET'])
+def suggest_movies_route():
+    """
+    Endpoint pentru sugestii de titluri dupa prefix
+    """
+    return suggest_movies()
+
 # Health check endpoint
 @app.route('/api/health', methods=['GET'])
 def health():
     """Endpoint pentru verificarea stării API-ului"""
-    return jsonify({'status': 'ok'}), 200
+    return jsonify({
+        'status': 'ok',
+        'caches': {
+            'token': statistici_cache_token(),
+            'search': statistici_cache_cautari()
+        },
+        'recommendation_stream': hub_recomandari.statistici()
+    }), 200
+
+# Metrici in format text Prometheus
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Endpoint pentru metricile HTTP, ale cache-urilor si ale fluxului de recomandari"""
+    cache_uri = {'token': statistici_cache_token(), 'search': statistici_cache_cautari()}
+    flux = hub_recomandari.statistici()
+    linii = [registru_http.text_prometheus().rstrip('\n')]
+    for camp, tip in (('hits', 'counter'), ('misses', 'counter'), ('evictions', 'counter'), ('size', 'gauge')):
+        linii.extend(linii_valori(f'movie_manager_cache_{camp}' + ('_total' if tip == 'counter' else ''), tip,
+                                  f'Cache-uri in memorie: {camp}',
+                                  {nume: statistici[camp] for nume, statistici in cache_uri.items()}, 'cache'))
+    linii.extend(linii_valori('movie_manager_sse_subscribers', 'gauge', 'Fluxuri SSE deschise',
+                              {'recommendations': flux['subscribers']}, 'stream'))
+    linii.extend(linii_valori('movie_manager_sse_events_dropped_total', 'counter', 'Evenimente SSE pierdute (coada plina)',
+                              {'recommendations': flux['dropped']}, 'stream'))
+    return Response('\n'.join(linii) + '\n', mimetype='text/plain; version=0.0.4')
 
 # Pornim aplicatia
 if __name__ == '__main__':
     # Initializam baza de date la pornirea serverului
     init_db()
+    # Stergem in fundal randurile vechi din jurnalul de modificari
+    curata_periodic()
     # Pornim serverul Flask pe portul 5000
     app.run(debug=True, port=5000)
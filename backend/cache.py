@@ -0,0 +1,131 @@
+"""
+Modul pentru cache-uri in memorie (LRU cu expirare TTL) si coalescarea apelurilor identice
+Folosit pentru rezolvarea token-urilor si pentru rezultatele cautarilor
+"""
+import threading
+import time
+from collections import OrderedDict
+
+# Valoare sentinela pentru "cheia nu exista in cache" (None poate fi o valoare valida)
+LIPSA = object()
+
+class CacheLRU:
+    """
+    Cache marginit ca dimensiune, cu eliminare LRU si expirare TTL per intrare
+    Este sigur pentru folosirea din mai multe thread-uri
+    """
+
+    def __init__(self, dimensiune_maxima=1024, ttl=300):
+        self.dimensiune_maxima = dimensiune_maxima
+        self.ttl = ttl
+        self._intrari = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Returneaza valoarea pentru cheie sau LIPSA daca nu exista / a expirat
+    def obtine(self, cheie):
+        acum = time.monotonic()
+        with self._lock:
+            intrare = self._intrari.get(cheie)
+            if intrare is None or intrare[1] <= acum:
+                if intrare is not None:
+                    del self._intrari[cheie]
+                self.misses += 1
+                return LIPSA
+            self._intrari.move_to_end(cheie)
+            self.hits += 1
+            return intrare[0]
+
+    # Salveaza o valoare (cu TTL-ul implicit sau cu unul specific)
+    def seteaza(self, cheie, valoare, ttl=None):
+        expira = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._intrari[cheie] = (valoare, expira)
+            self._intrari.move_to_end(cheie)
+            while len(self._intrari) > self.dimensiune_maxima:
+                self._intrari.popitem(last=False)
+                self.evictions += 1
+
+    # Elimina o cheie din cache
+    def invalideaza(self, cheie):
+        with self._lock:
+            self._intrari.pop(cheie, None)
+
+    # Goleste complet cache-ul
+    def goleste(self):
+        with self._lock:
+            self._intrari.clear()
+
+    # Returneaza contoarele cache-ului
+    def statistici(self):
+        with self._lock:
+            return {
+                'size': len(self._intrari),
+                'max_size': self.dimensiune_maxima,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+class _ApelInCurs:
+    """
+    Un apel in desfasurare, asteptat de toate cererile identice
+    """
+
+    def __init__(self):
+        self.terminat = threading.Event()
+        self.rezultat = None
+        self.exceptie = None
+
+class SingleFlight:
+    """
+    Coalescarea apelurilor identice concurente: pentru aceeasi cheie, doar primul
+    apelant executa functia, iar ceilalti asteapta si primesc acelasi rezultat
+    (sau aceeasi exceptie)
+    """
+
+    def __init__(self):
+        self._in_curs = {}
+        self._lock = threading.Lock()
+        self.executate = 0
+        self.coalescate = 0
+
+    # Executa functie() o singura data pentru toate apelurile concurente cu aceeasi cheie
+    def executa(self, cheie, functie):
+        with self._lock:
+            apel = self._in_curs.get(cheie)
+            lider = apel is None
+            if lider:
+                apel = _ApelInCurs()
+                self._in_curs[cheie] = apel
+                self.executate += 1
+            else:
+                self.coalescate += 1
+
+        if not lider:
+            apel.terminat.wait()
+            if apel.exceptie is not None:
+                raise apel.exceptie
+            return apel.rezultat
+
+        try:
+            apel.rezultat = functie()
+            return apel.rezultat
+        except Exception as exceptie:
+            apel.exceptie = exceptie
+            raise
+        finally:
+            with self._lock:
+                del self._in_curs[cheie]
+            apel.terminat.set()
+
+    # Returneaza contoarele (apeluri executate efectiv si apeluri coalescate)
+    def statistici(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._in_curs),
+                'executed': self.executate,
+                'coalesced': self.coalescate
+            }
@@ -0,0 +1,232 @@
+"""
+Modul pentru metricile HTTP ale backend-ului, expuse in format text Prometheus (/api/metrics)
+Pentru fiecare endpoint (numele din blueprint, de ex. movie.get_movies) si metoda se pastreaza:
+histograma latentei, numarul de cereri pe status, cererile in curs si histograma dimensiunii
+raspunsurilor.
+
+Inregistrarea este ieftina: contoarele sunt impartite in segmente, fiecare cu lock-ul lui,
+iar un thread scrie mereu in acelasi segment (dupa id-ul nativ), deci lock-urile sunt
+practic necontestate. Seriile si listele de bucket-uri sunt create o singura data, la prima
+cerere pentru un endpoint; o cerere obisnuita doar incrementeaza contoare existente.
+Agregarea segmentelor si formatarea textului se fac doar la citirea metricilor.
+
+Pentru raspunsurile streaming (SSE, export) latenta este masurata pana la crearea
+raspunsului, nu pana la terminarea fluxului, iar dimensiunea nu este cunoscuta.
+
+Metricile sunt per proces. In modul productie (serving.py), fiecare worker primeste
+MOVIE_MANAGER_WORKER (de ex. backend-2), adaugat ca eticheta worker="..." pe toate seriile,
+astfel incat valorile worker-ilor sa poata fi deosebite si adunate.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import request
+
+# Limitele bucket-urilor pentru latenta (secunde)
+LIMITE_LATENTA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Limitele bucket-urilor pentru dimensiunea raspunsurilor (octeti)
+LIMITE_DIMENSIUNE = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608)
+
+# Numarul de segmente (cate un lock fiecare) intre care sunt impartite contoarele
+NUMAR_SEGMENTE = 16
+
+# Eticheta pentru cererile care nu se potrivesc cu nicio ruta (404, 405)
+FARA_ENDPOINT = '<unmatched>'
+
+# Cheia din environ-ul WSGI cu momentul inceperii cererii
+# (environ-ul este propriu fiecarei cereri, inclusiv fiecarui apel dintr-un batch)
+CHEIE_INCEPUT = 'movie_manager.metrics.inceput'
+
+# Cheia din environ-ul WSGI care exclude o cerere din metrici (verificarile interne de sanatate)
+CHEIE_FARA_METRICI = 'movie_manager.metrics.ignora'
+
+# Numele worker-ului (doar in modul productie), adaugat ca eticheta pe toate seriile
+WORKER = os.getenv('MOVIE_MANAGER_WORKER', '')
+
+# Functie pentru eticheta worker-ului (text gol in afara modului productie)
+def _eticheta_worker():
+    return f',worker="{WORKER}"' if WORKER else ''
+
+class _Serie:
+    """
+    Contoarele unui (endpoint, metoda) intr-un segment
+    """
+    __slots__ = ('latente', 'suma_latente', 'dimensiuni', 'suma_dimensiuni', 'statusuri', 'in_curs')
+
+    def __init__(self):
+        self.latente = [0] * (len(LIMITE_LATENTA) + 1)
+        self.suma_latente = 0.0
+        self.dimensiuni = [0] * (len(LIMITE_DIMENSIUNE) + 1)
+        self.suma_dimensiuni = 0
+        self.statusuri = {}
+        self.in_curs = 0
+
+class _Segment:
+    __slots__ = ('lock', 'serii')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # endpoint -> metoda -> _Serie (dict-uri imbricate, fara chei tuple alocate la fiecare cerere)
+        self.serii = {}
+
+    # Returneaza seria pentru endpoint si metoda (apelat cu lock-ul segmentului luat)
+    def serie(self, endpoint, metoda):
+        metode = self.serii.get(endpoint)
+        if metode is None:
+            metode = self.serii[endpoint] = {}
+        serie = metode.get(metoda)
+        if serie is None:
+            serie = metode[metoda] = _Serie()
+        return serie
+
+class RegistruMetrici:
+    """
+    Metricile HTTP, impartite pe segmente
+    Este sigur pentru folosirea din mai multe thread-uri
+    """
+
+    def __init__(self, numar_segmente=NUMAR_SEGMENTE, prefix='movie_manager_http'):
+        self.prefix = prefix
+        self._segmente = tuple(_Segment() for _ in range(numar_segmente))
+
+    # Segmentul thread-ului curent (id-urile native sunt consecutive, deci bine distribuite)
+    def _segment(self):
+        return self._segmente[threading.get_native_id() % len(self._segmente)]
+
+    # Marcheaza inceputul unei cereri
+    def incepe(self, endpoint, metoda):
+        segment = self._segment()
+        with segment.lock:
+            segment.serie(endpoint, metoda).in_curs += 1
+
+    # Marcheaza sfarsitul unei cereri (pereche cu incepe, din acelasi thread)
+    def termina(self, endpoint, metoda):
+        segment = self._segment()
+        with segment.lock:
+            segment.serie(endpoint, metoda).in_curs -= 1
+
+    # Inregistreaza un raspuns: status, durata (secunde) si dimensiunea (octeti sau None)
+    def inregistreaza(self, endpoint, metoda, status, durata, dimensiune=None):
+        index_latenta = bisect_left(LIMITE_LATENTA, durata)
+        index_dimensiune = bisect_left(LIMITE_DIMENSIUNE, dimensiune) if dimensiune is not None else -1
+        segment = self._segment()
+        with segment.lock:
+            serie = segment.serie(endpoint, metoda)
+            serie.latente[index_latenta] += 1
+            serie.suma_latente += durata
+            serie.statusuri[status] = serie.statusuri.get(status, 0) + 1
+            if index_dimensiune >= 0:
+                serie.dimensiuni[index_dimensiune] += 1
+                serie.suma_dimensiuni += dimensiune
+
+    # Aduna seriile din toate segmentele
+    def _agregat(self):
+        agregat = {}
+        for segment in self._segmente:
+            with segment.lock:
+                for endpoint, metode in segment.serii.items():
+                    for metoda, serie in metode.items():
+                        total = agregat.get((endpoint, metoda))
+                        if total is None:
+                            total = agregat[(endpoint, metoda)] = _Serie()
+                        total.latente = [a + b for a, b in zip(total.latente, serie.latente)]
+                        total.suma_latente += serie.suma_latente
+                        total.dimensiuni = [a + b for a, b in zip(total.dimensiuni, serie.dimensiuni)]
+                        total.suma_dimensiuni += serie.suma_dimensiuni
+                        for status, numar in serie.statusuri.items():
+                            total.statusuri[status] = total.statusuri.get(status, 0) + numar
+                        total.in_curs += serie.in_curs
+        return dict(sorted(agregat.items()))
+
+    # Returneaza metricile in formatul text Prometheus (versiunea 0.0.4)
+    def text_prometheus(self):
+        agregat = self._agregat()
+        p = self.prefix
+        w = _eticheta_worker()
+        linii = []
+
+        linii.append(f'# HELP {p}_requests_total Cereri terminate, pe endpoint, metoda si status')
+        linii.append(f'# TYPE {p}_requests_total counter')
+        for (endpoint, metoda), serie in agregat.items():
+            for status, numar in sorted(serie.statusuri.items()):
+                linii.append(f'{p}_requests_total{{endpoint="{endpoint}",method="{metoda}",status="{status}"{w}}} {numar}')
+
+        linii.append(f'# HELP {p}_requests_in_flight Cereri in curs de procesare')
+        linii.append(f'# TYPE {p}_requests_in_flight gauge')
+        for (endpoint, metoda), serie in agregat.items():
+            linii.append(f'{p}_requests_in_flight{{endpoint="{endpoint}",method="{metoda}"{w}}} {serie.in_curs}')
+
+        linii.extend(_histograma(f'{p}_request_duration_seconds', 'Latenta cererilor (secunde)',
+                                 agregat, LIMITE_LATENTA, 'latente', 'suma_latente'))
+        linii.extend(_histograma(f'{p}_response_size_bytes', 'Dimensiunea raspunsurilor (octeti)',
+                                 agregat, LIMITE_DIMENSIUNE, 'dimensiuni', 'suma_dimensiuni'))
+        return '\n'.join(linii) + '\n'
+
+    # Sterge toate metricile (de ex. intre doua rulari ale unui benchmark)
+    def reseteaza(self):
+        for segment in self._segmente:
+            with segment.lock:
+                segment.serii.clear()
+
+# Functie pentru formatarea unei histograme (bucket-uri cumulative, ca in Prometheus)
+def _histograma(nume, descriere, agregat, limite, camp_bucketuri, camp_suma):
+    linii = [f'# HELP {nume} {descriere}', f'# TYPE {nume} histogram']
+    for (endpoint, metoda), serie in agregat.items():
+        bucketuri = getattr(serie, camp_bucketuri)
+        total = sum(bucketuri)
+        if not total:
+            continue
+        etichete = f'endpoint="{endpoint}",method="{metoda}"{_eticheta_worker()}'
+        cumulat = 0
+        for limita, numar in zip(limite, bucketuri):
+            cumulat += numar
+            linii.append(f'{nume}_bucket{{{etichete},le="{limita:g}"}} {cumulat}')
+        linii.append(f'{nume}_bucket{{{etichete},le="+Inf"}} {total}')
+        linii.append(f'{nume}_sum{{{etichete}}} {getattr(serie, camp_suma):g}')
+        linii.append(f'{nume}_count{{{etichete}}} {total}')
+    return linii
+
+# Functie pentru formatarea unor valori simple (gauge sau counter) cu o eticheta
+def linii_valori(nume, tip, descriere, valori, eticheta):
+    """
+    Returneaza liniile Prometheus pentru {valoare_eticheta: valoare}
+    """
+    linii = [f'# HELP {nume} {descriere}', f'# TYPE {nume} {tip}']
+    for valoare_eticheta, valoare in valori.items():
+        linii.append(f'{nume}{{{eticheta}="{valoare_eticheta}"{_eticheta_worker()}}} {valoare}')
+    return linii
+
+# Registrul metricilor HTTP ale backend-ului
+registru_http = RegistruMetrici()
+
+# Functie pentru instrumentarea unei aplicatii Flask
+def instrumenteaza(app, registru=registru_http):
+    """
+    Inregistreaza hook-urile care masoara fiecare cerere
+    Trebuie apelata inaintea celorlalte before_request (ca sa masoare si cererile
+    la care acestea raspund direct, de ex. preflight-ul CORS)
+    """
+    @app.before_request
+    def _inceput_cerere():
+        # Cererile marcate (heartbeat-ul worker-ilor) nu sunt masurate deloc
+        if CHEIE_FARA_METRICI in request.environ:
+            return
+        request.environ[CHEIE_INCEPUT] = time.perf_counter()
+        registru.incepe(request.endpoint or FARA_ENDPOINT, request.method)
+
+    # after_request ruleaza in ordinea inversa inregistrarii: acesta vede raspunsul final
+    @app.after_request
+    def _raspuns_cerere(raspuns):
+        inceput = request.environ.get(CHEIE_INCEPUT)
+        if inceput is not None:
+            registru.inregistreaza(request.endpoint or FARA_ENDPOINT, request.method, raspuns.status_code,
+                                   time.perf_counter() - inceput,
+                                   None if raspuns.is_streamed else raspuns.content_length)
+        return raspuns
+
+    @app.teardown_request
+    def _sfarsit_cerere(exceptie=None):
+        if request.environ.pop(CHEIE_INCEPUT, None) is not None:
+            registru.termina(request.endpoint or FARA_ENDPOINT, request.method)
@@ -4,45 +4,139 @@ Contine functiile pentru conexiune si initializarea tabelelor
 """
 import sqlite3
 import os
+import queue
+from contextlib import contextmanager
+from flask import g, has_app_context
+from models.migrations import aplica_migrarile
+from models.sql_trace import URMARIRE_ACTIVA, ConexiuneUrmarita
 
 # Calea catre baza de date (in folderul instance)
 # Calculam calea relativa la directorul server
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DB_PATH = os.path.join(BASE_DIR, 'instance', 'production.db')
+DB_PATH = os.getenv('MOVIE_MANAGER_DB', os.path.join(BASE_DIR, 'instance', 'production.db'))
 
-# Functie pentru deschiderea conexiunii la baza de date
-def get_db_connection():
+# Numarul maxim de conexiuni inactive pastrate in pool
+DIMENSIUNE_POOL = int(os.getenv('MOVIE_MANAGER_DB_POOL', '8'))
+
+# PRAGMA-uri aplicate o singura data, la crearea fiecarei conexiuni
+PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA cache_size = -16000',
+    'PRAGMA mmap_size = 134217728',
+    'PRAGMA foreign_keys = ON',
+)
+
+# Pool-ul de conexiuni inactive (LIFO, ca sa refolosim conexiunile "calde")
+_pool = queue.LifoQueue(maxsize=DIMENSIUNE_POOL)
+
+# Functie pentru crearea unei conexiuni noi, configurata
+def _creeaza_conexiune():
     """
-    Deschide o conexiune la baza de date SQLite
-    Returneaza: conexiunea la baza de date configurata cu row_factory
+    Deschide o conexiune noua la baza de date si aplica PRAGMA-urile
+    Returneaza: conexiunea configurata cu row_factory
     """
     # Cream directorul instance daca nu exista
-    db_dir = os.path.dirname(DB_PATH)
-    if not os.path.exists(db_dir):
-        os.makedirs(db_dir)
-    
-    # Cream fisierul bazei de date local
-    conn = sqlite3.connect(DB_PATH)
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+
+    # Conexiunea poate fi folosita de thread-uri diferite (dar nu simultan)
+    # Cu MOVIE_MANAGER_SQL_TRACE activ, conexiunea masoara fiecare interogare (models/sql_trace.py)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False,
+                           factory=ConexiuneUrmarita if URMARIRE_ACTIVA else sqlite3.Connection)
     conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
     return conn
 
+# Functie pentru luarea unei conexiuni din pool
+def _ia_din_pool():
+    """
+    Returneaza o conexiune inactiva din pool sau creeaza una noua
+    """
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        return _creeaza_conexiune()
+
+# Functie pentru returnarea unei conexiuni in pool
+def _returneaza_in_pool(conn):
+    """
+    Pune conexiunea inapoi in pool (sau o inchide daca pool-ul este plin)
+    """
+    # Anulam orice tranzactie ramasa deschisa (de ex. dupa o exceptie)
+    if conn.in_transaction:
+        conn.rollback()
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+# Functie pentru deschiderea conexiunii la baza de date
+def get_db_connection():
+    """
+    Returneaza conexiunea la baza de date SQLite
+    In contextul unei cereri Flask, conexiunea este luata din pool o singura data
+    si eliberata automat la teardown (nu trebuie inchisa de apelant).
+    In afara contextului Flask (scripturi, init_db), returneaza o conexiune noua
+    pe care apelantul trebuie sa o inchida.
+    Returneaza: conexiunea la baza de date configurata cu row_factory
+    """
+    if not has_app_context():
+        return _creeaza_conexiune()
+
+    if 'db_conn' not in g:
+        g.db_conn = _ia_din_pool()
+    return g.db_conn
+
+# Functie pentru imprumutarea unei conexiuni din pool, in afara unei cereri
+@contextmanager
+def conexiune_din_pool():
+    """
+    Imprumuta o conexiune din pool pentru un bloc scurt de cod si o returneaza la final
+    (pentru cod care ruleaza dupa terminarea cererii, de exemplu un raspuns streaming)
+    """
+    conn = _ia_din_pool()
+    try:
+        yield conn
+    finally:
+        _returneaza_in_pool(conn)
+
+# Functie apelata la teardown-ul contextului aplicatiei
+def elibereaza_conexiunea(exceptie=None):
+    """
+    Elibereaza conexiunea legata de contextul curent inapoi in pool
+    """
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        _returneaza_in_pool(conn)
+
+# Functie pentru inregistrarea gestionarului de conexiuni intr-o aplicatie Flask
+def init_app(app):
+    """
+    Inregistreaza eliberarea conexiunilor la teardown pentru aplicatia data
+    """
+    app.teardown_appcontext(elibereaza_conexiunea)
+
 # Crearea tabelelor la pornirea serverului
 def init_db():
     """
     Initializeaza baza de date creand toate tabelele necesare
+    si aplicand migrarile in asteptare
     """
-    conn = get_db_connection()
-    
+    conn = _creeaza_conexiune()
+
     # Cream tabelele users si movies daca nu exista deja
     conn.execute('CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, username TEXT UNIQUE, password TEXT)')
     conn.execute('CREATE TABLE IF NOT EXISTS movies (id INTEGER PRIMARY KEY, user_id INTEGER, title TEXT, status TEXT, rating TEXT)')
-    
+
     # Cream tabelul pentru prieteni (relatie bidirectionala)
     conn.execute('CREATE TABLE IF NOT EXISTS friends (id INTEGER PRIMARY KEY, user_id INTEGER, friend_id INTEGER, UNIQUE(user_id, friend_id))')
-    
+
     # Cream tabelul pentru recomandari
     conn.execute('CREATE TABLE IF NOT EXISTS recommendations (id INTEGER PRIMARY KEY, from_user_id INTEGER, to_user_id INTEGER, movie_title TEXT)')
-    
+
     conn.commit()
-    conn.close()
 
+    # Aplicam migrarile versionate (indexuri si modificari ulterioare ale schemei)
+    aplica_migrarile(conn)
+    conn.close()
@@ -0,0 +1,175 @@
+"""
+Modul pentru migrarile versionate ale schemei bazei de date
+Versiunea curenta a schemei este pastrata in PRAGMA user_version.
+Fiecare migrare este aplicata o singura data, intr-o tranzactie proprie,
+impreuna cu actualizarea versiunii.
+
+Utilizare (din directorul backend):
+    python -m models.migrations status   # afiseaza migrarile aplicate / in asteptare
+    python -m models.migrations apply    # aplica migrarile in asteptare
+"""
+import argparse
+import sys
+
+# Lista ordonata a migrarilor: (versiune, descriere, instructiuni SQL)
+# Versiunile sunt consecutive; o migrare noua se adauga mereu la final.
+MIGRARI = [
+    (1, 'Index pentru filmele unui utilizator, grupate pe status', [
+        'CREATE INDEX IF NOT EXISTS idx_movies_user_status ON movies (user_id, status, title, rating)',
+    ]),
+    (2, 'Index pentru recomandarile primite de un utilizator', [
+        'CREATE INDEX IF NOT EXISTS idx_recommendations_to_user ON recommendations (to_user_id, id)',
+    ]),
+    (3, 'Index pentru directia inversa a prieteniilor', [
+        'CREATE INDEX IF NOT EXISTS idx_friends_friend ON friends (friend_id, user_id)',
+    ]),
+    (4, 'Catalog local de show-uri (TVMaze) cu index FTS5 pe nume', [
+        'CREATE TABLE IF NOT EXISTS catalog_shows (id INTEGER PRIMARY KEY, name TEXT NOT NULL, premiered TEXT, type TEXT, poster TEXT)',
+        "CREATE VIRTUAL TABLE IF NOT EXISTS catalog_shows_fts USING fts5 (name, content='catalog_shows', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    ]),
+    (5, 'Index pentru paginarea filmelor dupa (status, title, id), inlocuieste idx_movies_user_status', [
+        'CREATE INDEX IF NOT EXISTS idx_movies_user_keyset ON movies (user_id, status, title, id, rating)',
+        'DROP INDEX IF EXISTS idx_movies_user_status',
+    ]),
+    (6, 'Versiuni de date per utilizator (ETag), incrementate de triggere la fiecare modificare', [
+        'CREATE TABLE IF NOT EXISTS user_versions (user_id INTEGER PRIMARY KEY, version INTEGER NOT NULL)',
+        '''CREATE TRIGGER IF NOT EXISTS trg_movies_versiune_insert AFTER INSERT ON movies BEGIN
+            INSERT INTO user_versions (user_id, version) VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_movies_versiune_update AFTER UPDATE ON movies BEGIN
+            INSERT INTO user_versions (user_id, version) VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_movies_versiune_delete AFTER DELETE ON movies BEGIN
+            INSERT INTO user_versions (user_id, version) VALUES (OLD.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_recommendations_versiune_insert AFTER INSERT ON recommendations BEGIN
+            INSERT INTO user_versions (user_id, version) VALUES (NEW.to_user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_recommendations_versiune_delete AFTER DELETE ON recommendations BEGIN
+            INSERT INTO user_versions (user_id, version) VALUES (OLD.to_user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_friends_versiune_insert AFTER INSERT ON friends BEGIN
+            INSERT INTO user_versions (user_id, version) VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_friends_versiune_delete AFTER DELETE ON friends BEGIN
+            INSERT INTO user_versions (user_id, version) VALUES (OLD.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END''',
+    ]),
+    (7, 'Jurnal de modificari pentru sincronizarea incrementala (filme si recomandari)', [
+        'CREATE TABLE IF NOT EXISTS changes (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, version INTEGER NOT NULL, entity TEXT NOT NULL, entity_id INTEGER NOT NULL, op TEXT NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS idx_changes_user_version ON changes (user_id, version)',
+        # Triggerele de versiune pentru filme si recomandari sunt inlocuite cu unele care
+        # incrementeaza versiunea si scriu in jurnal, in aceasta ordine
+        'DROP TRIGGER IF EXISTS trg_movies_versiune_insert',
+        'DROP TRIGGER IF EXISTS trg_movies_versiune_update',
+        'DROP TRIGGER IF EXISTS trg_movies_versiune_delete',
+        'DROP TRIGGER IF EXISTS trg_recommendations_versiune_insert',
+        'DROP TRIGGER IF EXISTS trg_recommendations_versiune_delete',
+        '''CREATE TRIGGER IF NOT EXISTS trg_movies_changes_insert AFTER INSERT ON movies BEGIN
+            INSERT INTO user_versions (user_id, version) VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+            INSERT INTO changes (user_id, version, entity, entity_id, op)
+            VALUES (NEW.user_id, (SELECT version FROM user_versions WHERE user_id = NEW.user_id), 'movie', NEW.id, 'upsert');
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_movies_changes_update AFTER UPDATE ON movies BEGIN
+            INSERT INTO user_versions (user_id, version) VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+            INSERT INTO changes (user_id, version, entity, entity_id, op)
+            VALUES (NEW.user_id, (SELECT version FROM user_versions WHERE user_id = NEW.user_id), 'movie', NEW.id, 'upsert');
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_movies_changes_delete AFTER DELETE ON movies BEGIN
+            INSERT INTO user_versions (user_id, version) VALUES (OLD.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+            INSERT INTO changes (user_id, version, entity, entity_id, op)
+            VALUES (OLD.user_id, (SELECT version FROM user_versions WHERE user_id = OLD.user_id), 'movie', OLD.id, 'delete');
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_recommendations_changes_insert AFTER INSERT ON recommendations BEGIN
+            INSERT INTO user_versions (user_id, version) VALUES (NEW.to_user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+            INSERT INTO changes (user_id, version, entity, entity_id, op)
+            VALUES (NEW.to_user_id, (SELECT version FROM user_versions WHERE user_id = NEW.to_user_id), 'recommendation', NEW.id, 'upsert');
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_recommendations_changes_delete AFTER DELETE ON recommendations BEGIN
+            INSERT INTO user_versions (user_id, version) VALUES (OLD.to_user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+            INSERT INTO changes (user_id, version, entity, entity_id, op)
+            VALUES (OLD.to_user_id, (SELECT version FROM user_versions WHERE user_id = OLD.to_user_id), 'recommendation', OLD.id, 'delete');
+        END''',
+    ]),
+]
+
+# Functie pentru citirea versiunii curente a schemei
+def versiune_curenta(conn):
+    """
+    Returneaza versiunea schemei salvata in PRAGMA user_version
+    """
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+# Functie pentru listarea migrarilor neaplicate
+def migrari_in_asteptare(conn):
+    """
+    Returneaza migrarile cu versiune mai mare decat versiunea curenta
+    """
+    versiune = versiune_curenta(conn)
+    return [migrare for migrare in MIGRARI if migrare[0] > versiune]
+
+# Functie pentru aplicarea migrarilor
+def aplica_migrarile(conn):
+    """
+    Aplica, in ordine, toate migrarile in asteptare
+    Returns:
+        lista versiunilor aplicate
+    """
+    aplicate = []
+    for versiune, descriere, instructiuni in migrari_in_asteptare(conn):
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            # Recitim versiunea in tranzactie, in caz ca alt proces a aplicat-o deja
+            if versiune_curenta(conn) >= versiune:
+                conn.rollback()
+                continue
+            for instructiune in instructiuni:
+                conn.execute(instructiune)
+            conn.execute(f'PRAGMA user_version = {int(versiune)}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        aplicate.append(versiune)
+    return aplicate
+
+# Punctul de intrare pentru linia de comanda
+def main(argumente=None):
+    from models.database import DB_PATH, init_db, _creeaza_conexiune
+
+    parser = argparse.ArgumentParser(description='Migrari pentru schema bazei de date')
+    parser.add_argument('comanda', nargs='?', default='status', choices=['status', 'apply'])
+    args = parser.parse_args(argumente)
+
+    if args.comanda == 'apply':
+        # init_db creeaza tabelele de baza si aplica migrarile
+        init_db()
+
+    conn = _creeaza_conexiune()
+    versiune = versiune_curenta(conn)
+    in_asteptare = migrari_in_asteptare(conn)
+    conn.close()
+
+    print(f'Baza de date: {DB_PATH}')
+    print(f'Versiune schema: {versiune} (ultima disponibila: {MIGRARI[-1][0]})')
+    for numar, descriere, _ in MIGRARI:
+        stare = 'in asteptare' if numar > versiune else 'aplicata'
+        print(f'  {numar:>3}  [{stare}]  {descriere}')
+
+    # Cod de iesire 1 daca mai sunt migrari de aplicat (util in scripturi de deploy)
+    return 1 if in_asteptare else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
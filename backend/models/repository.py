@@ -0,0 +1,258 @@
+"""
+Modul pentru accesul la date (repository), folosit de rutele backend si de view-urile frontend
+Fiecare nevoie are o singura interogare, scrisa pentru indexurile din migrations.py.
+Textul SQL este constant, astfel incat conexiunile din pool refolosesc instructiunile
+deja pregatite (cache-ul de instructiuni sqlite3). Functiile primesc conexiunea cererii
+curente (get_db_connection) si nu fac commit: tranzactia ramane a apelantului.
+"""
+from contextlib import contextmanager
+from services.data_versions import versiune_utilizator
+from services.friend_graph import lista_prieteni, pagina_prieteni, sunt_prieteni
+from services.pagination import pagina_filme, itereaza_filme, pagina_recomandari, itereaza_recomandari, grupeaza_pe_liste
+
+# Statusurile (listele) valide pentru un film
+STATUSURI_VALIDE = ['To Watch', 'Watching', 'Completed']
+
+# Functie pentru citirea mai multor interogari din acelasi snapshot
+@contextmanager
+def tranzactie_citire(conn):
+    """
+    Deschide o tranzactie de citire (in WAL, toate interogarile vad acelasi snapshot)
+    si o inchide la final; daca exista deja o tranzactie deschisa, o foloseste pe aceea
+    """
+    proprie = not conn.in_transaction
+    if proprie:
+        conn.execute('BEGIN')
+    try:
+        yield conn
+    finally:
+        if proprie:
+            conn.rollback()
+
+# Utilizatori
+
+# Functie pentru cautarea id-ului unui utilizator dupa nume
+def id_utilizator(conn, nume):
+    """
+    Returneaza id-ul utilizatorului sau None daca nu exista (index unic pe username)
+    """
+    rand = conn.execute('SELECT id FROM users WHERE username = ?', (nume,)).fetchone()
+    return rand['id'] if rand else None
+
+# Functie pentru citirea datelor de autentificare
+def utilizator_dupa_nume(conn, nume):
+    """
+    Returneaza randul (id, username, password) al utilizatorului sau None
+    """
+    return conn.execute('SELECT id, username, password FROM users WHERE username = ?', (nume,)).fetchone()
+
+# Functie pentru crearea unui utilizator
+def creeaza_utilizator(conn, nume, parola_criptata):
+    """
+    Insereaza un utilizator nou (arunca sqlite3.IntegrityError daca numele exista deja)
+    """
+    conn.execute('INSERT INTO users (username, password) VALUES (?, ?)', (nume, parola_criptata))
+
+# Filme
+
+# Functie pentru citirea tuturor filmelor unui utilizator
+def filme_utilizator(conn, id_user):
+    """
+    Returneaza randurile (id, title, status, rating), in ordinea indexului (status, title, id)
+    """
+    return conn.execute('''
+        SELECT id, title, status, rating FROM movies
+        WHERE user_id = ?
+        ORDER BY status, title, id
+    ''', (id_user,)).fetchall()
+
+# Functie pentru filmele unui utilizator grupate pe liste
+def filme_pe_liste(conn, id_user, rating_lipsa='-', dimensiune_pagina=None):
+    """
+    Returneaza filmele utilizatorului grupate pe liste (To Watch, Watching, Completed)
+    Args:
+        dimensiune_pagina: daca este dat, filmele sunt citite pagina cu pagina (keyset),
+            din acelasi snapshot, in loc de o singura interogare cu toate randurile
+    """
+    if dimensiune_pagina is None:
+        return grupeaza_pe_liste(filme_utilizator(conn, id_user), rating_lipsa=rating_lipsa)
+    with tranzactie_citire(conn):
+        return grupeaza_pe_liste(itereaza_filme(conn, id_user, dimensiune_pagina), rating_lipsa=rating_lipsa)
+
+# Functie pentru verificarea unui titlu deja adaugat
+def are_film(conn, id_user, titlu):
+    """
+    Verifica daca utilizatorul are deja un film cu acest titlu
+    """
+    return conn.execute('SELECT 1 FROM movies WHERE user_id = ? AND title = ? LIMIT 1', (id_user, titlu)).fetchone() is not None
+
+# Functie pentru adaugarea unui film
+def adauga_film(conn, id_user, titlu, status):
+    """
+    Insereaza un film nou (fara nota) si returneaza id-ul lui
+    """
+    return conn.execute('INSERT INTO movies (user_id, title, status, rating) VALUES (?, ?, ?, ?)',
+                        (id_user, titlu, status, '-')).lastrowid
+
+# Functie pentru mutarea unui film
+def muta_film(conn, id_user, id_film, status):
+    """
+    Schimba lista unui film al utilizatorului
+    Returns:
+        True daca filmul exista si apartine utilizatorului
+    """
+    return conn.execute('UPDATE movies SET status = ? WHERE id = ? AND user_id = ?',
+                        (status, id_film, id_user)).rowcount > 0
+
+# Functie pentru notarea unui film
+def noteaza_film(conn, id_user, id_film, nota):
+    """
+    Salveaza nota unui film al utilizatorului
+    Returns:
+        True daca filmul exista si apartine utilizatorului
+    """
+    return conn.execute('UPDATE movies SET rating = ? WHERE id = ? AND user_id = ?',
+                        (nota, id_film, id_user)).rowcount > 0
+
+# Functie pentru stergerea unui film
+def sterge_film(conn, id_user, id_film):
+    """
+    Sterge un film al utilizatorului
+    Returns:
+        True daca filmul exista si apartine utilizatorului
+    """
+    return conn.execute('DELETE FROM movies WHERE id = ? AND user_id = ?', (id_film, id_user)).rowcount > 0
+
+# Functie pentru cursorul peste toate filmele unui utilizator (pentru export)
+def cursor_filme(conn, id_user):
+    """
+    Returneaza un cursor (title, status, rating) in ordinea (status, title, id);
+    randurile sunt citite cu fetchmany, fara a incarca toata lista in memorie
+    """
+    return conn.execute('''
+        SELECT title, status, rating FROM movies
+        WHERE user_id = ?
+        ORDER BY status, title, id
+    ''', (id_user,))
+
+# Functie pentru verificarea proprietatii mai multor filme
+def filme_detinute(conn, id_user, id_filme):
+    """
+    Returneaza multimea id-urilor din id_filme care apartin utilizatorului
+    """
+    detinute = set()
+    id_filme = list(id_filme)
+    # Impartim in bucati ca sa nu depasim limita de parametri SQLite
+    for inceput in range(0, len(id_filme), 500):
+        bucata = id_filme[inceput:inceput + 500]
+        semne = ','.join('?' * len(bucata))
+        randuri = conn.execute(f'SELECT id FROM movies WHERE user_id = ? AND id IN ({semne})', (id_user, *bucata)).fetchall()
+        detinute.update(rand['id'] for rand in randuri)
+    return detinute
+
+# Functie pentru aplicarea unor operatii pe filme, grupate pe tipuri
+def aplica_operatii_filme(conn, adaugari=(), mutari=(), note=(), stergeri=()):
+    """
+    Aplica operatiile cu executemany, in ordinea: adaugari, mutari, note, stergeri
+    Args:
+        adaugari: tupluri (user_id, title, status, rating)
+        mutari: tupluri (status, id, user_id)
+        note: tupluri (rating, id, user_id)
+        stergeri: tupluri (id, user_id)
+    """
+    if adaugari:
+        conn.executemany('INSERT INTO movies (user_id, title, status, rating) VALUES (?, ?, ?, ?)', adaugari)
+    if mutari:
+        conn.executemany('UPDATE movies SET status = ? WHERE id = ? AND user_id = ?', mutari)
+    if note:
+        conn.executemany('UPDATE movies SET rating = ? WHERE id = ? AND user_id = ?', note)
+    if stergeri:
+        conn.executemany('DELETE FROM movies WHERE id = ? AND user_id = ?', stergeri)
+
+# Prieteni
+
+# Functie pentru adaugarea unei prietenii
+def adauga_prietenie(conn, id_user, id_prieten):
+    """
+    Salveaza prietenia in ambele directii
+    (arunca sqlite3.IntegrityError daca exista deja)
+    """
+    conn.executemany('INSERT INTO friends (user_id, friend_id) VALUES (?, ?)',
+                     ((id_user, id_prieten), (id_prieten, id_user)))
+
+# Recomandari
+
+# Functie pentru citirea tuturor recomandarilor primite
+def recomandari_primite(conn, id_user):
+    """
+    Returneaza recomandarile primite (id, movie_title, from_username), de la cea mai noua
+    """
+    return conn.execute('''
+        SELECT r.id, r.movie_title, u.username as from_username
+        FROM recommendations r
+        INNER JOIN users u ON r.from_user_id = u.id
+        WHERE r.to_user_id = ?
+        ORDER BY r.id DESC
+    ''', (id_user,)).fetchall()
+
+# Functie pentru citirea recomandarilor primite dupa un anumit id
+def recomandari_dupa(conn, id_user, dupa_id):
+    """
+    Returneaza recomandarile primite cu id mai mare decat dupa_id, in ordine crescatoare
+    """
+    return conn.execute('''
+        SELECT r.id, r.movie_title, u.username as from_username
+        FROM recommendations r
+        INNER JOIN users u ON r.from_user_id = u.id
+        WHERE r.to_user_id = ? AND r.id > ?
+        ORDER BY r.id
+    ''', (id_user, dupa_id)).fetchall()
+
+# Functie pentru id-ul celei mai noi recomandari primite
+def ultima_recomandare(conn, id_user):
+    """
+    Returneaza id-ul celei mai noi recomandari primite sau 0 (doar din index)
+    """
+    return conn.execute('SELECT MAX(id) FROM recommendations WHERE to_user_id = ?', (id_user,)).fetchone()[0] or 0
+
+# Functie pentru numararea recomandarilor primite
+def numar_recomandari(conn, id_user):
+    """
+    Returneaza numarul de recomandari primite (doar din indexul pe to_user_id)
+    """
+    return conn.execute('SELECT COUNT(*) FROM recommendations WHERE to_user_id = ?', (id_user,)).fetchone()[0]
+
+# Functie pentru adaugarea unei recomandari
+def adauga_recomandare(conn, id_user, id_prieten, titlu):
+    """
+    Insereaza o recomandare de la id_user catre id_prieten si returneaza id-ul ei
+    """
+    return conn.execute('INSERT INTO recommendations (from_user_id, to_user_id, movie_title) VALUES (?, ?, ?)',
+                        (id_user, id_prieten, titlu)).lastrowid
+
+# Functie pentru stergerea unei recomandari primite
+def sterge_recomandare(conn, id_user, id_recomandare):
+    """
+    Sterge o recomandare primita de utilizator
+    Returns:
+        True daca recomandarea exista si apartine utilizatorului
+    """
+    return conn.execute('DELETE FROM recommendations WHERE id = ? AND to_user_id = ?',
+                        (id_recomandare, id_user)).rowcount > 0
+
+# Dashboard
+
+# Functie pentru datele dashboard-ului
+def date_dashboard(conn, id_user, rating_lipsa='-', dimensiune_pagina=None):
+    """
+    Citeste dintr-un singur snapshot filmele grupate pe liste, prietenii,
+    numarul de recomandari primite si versiunea datelor utilizatorului
+    (dimensiune_pagina are acelasi sens ca la filme_pe_liste)
+    """
+    with tranzactie_citire(conn):
+        return {
+            'version': versiune_utilizator(conn, id_user),
+            'movies': filme_pe_liste(conn, id_user, rating_lipsa=rating_lipsa, dimensiune_pagina=dimensiune_pagina),
+            'friends': lista_prieteni(conn, id_user),
+            'recommendations_count': numar_recomandari(conn, id_user)
+        }
@@ -0,0 +1,206 @@
+"""
+Modul pentru urmarirea interogarilor SQL (optional, activat cu MOVIE_MANAGER_SQL_TRACE=1)
+Cand este activ, conexiunile sunt create cu ConexiuneUrmarita, care masoara fiecare
+execute / executemany / commit, inclusiv timpul de citire a randurilor (fetch*).
+Pentru fiecare cerere se aduna numarul de interogari si timpul total; in modul debug ele
+sunt trimise in header-ele X-DB-Queries si X-DB-Time.
+
+Interogarile mai lente decat MOVIE_MANAGER_SQL_SLOW_MS (implicit 100 ms) sunt scrise in
+logger-ul 'movie_manager.sql' impreuna cu planul lor (EXPLAIN QUERY PLAN), iar aceeasi
+interogare repetata de cel putin MOVIE_MANAGER_SQL_REPEAT ori intr-o cerere (tiparul N+1)
+este semnalata la finalul cererii. Cu MOVIE_MANAGER_SQL_TRACE=all (sau cu logger-ul la
+nivel DEBUG), fiecare instructiune executata de SQLite, cu parametrii inlocuiti, este
+logata prin set_trace_callback, impreuna cu sumarul fiecarei cereri.
+
+Cand urmarirea nu este activa, conexiunile sunt sqlite3.Connection obisnuite si nu se
+inregistreaza niciun hook, deci costul este zero.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# Urmarirea este activata explicit (costa cateva microsecunde per interogare)
+#   1   - numarul si timpul interogarilor, interogarile lente si repetate
+#   all - in plus, fiecare instructiune SQL este logata
+MOD_URMARIRE = os.getenv('MOVIE_MANAGER_SQL_TRACE', '')
+URMARIRE_ACTIVA = MOD_URMARIRE not in ('', '0')
+
+# Pragul (ms) peste care o interogare este logata cu planul ei
+PRAG_LENT_MS = float(os.getenv('MOVIE_MANAGER_SQL_SLOW_MS', '100'))
+
+# De cate ori trebuie repetata aceeasi interogare intr-o cerere ca sa fie semnalata
+PRAG_REPETARI = int(os.getenv('MOVIE_MANAGER_SQL_REPEAT', '10'))
+
+# Instructiunile pentru care se poate obtine un plan cu EXPLAIN QUERY PLAN
+INSTRUCTIUNI_EXPLICABILE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+logger = logging.getLogger('movie_manager.sql')
+if MOD_URMARIRE == 'all':
+    logger.setLevel(logging.DEBUG)
+    if not logger.handlers:
+        logger.addHandler(logging.StreamHandler())
+
+# Statisticile cererii curente, per thread (o cerere ruleaza intr-un singur thread)
+_curent = threading.local()
+
+# Cheia din environ-ul WSGI care marcheaza cererea care a deschis statisticile
+# (apelurile dintr-un batch se aduna la cererea parinte)
+CHEIE_PROPRIETAR = 'movie_manager.sql_trace.proprietar'
+
+class StatisticiCerere:
+    """
+    Interogarile unei cereri: numarul, timpul total si de cate ori a aparut fiecare text SQL
+    """
+    __slots__ = ('interogari', 'timp', 'repetari')
+
+    def __init__(self):
+        self.interogari = 0
+        self.timp = 0.0
+        self.repetari = {}
+
+# Functie pentru adaugarea unei interogari la cererea curenta
+def _adauga(sql, durata, numara_repetari=True):
+    statistici = getattr(_curent, 'statistici', None)
+    if statistici is not None:
+        statistici.interogari += 1
+        statistici.timp += durata
+        if numara_repetari:
+            statistici.repetari[sql] = statistici.repetari.get(sql, 0) + 1
+
+# Functie pentru scrierea unei interogari lente in log
+def _logheaza_lenta(conn, sql, parametri, durata):
+    plan = ''
+    cuvinte = sql.split(None, 1)
+    if parametri is not None and cuvinte and cuvinte[0].upper() in INSTRUCTIUNI_EXPLICABILE:
+        try:
+            randuri = sqlite3.Connection.execute(conn, 'EXPLAIN QUERY PLAN ' + sql, parametri).fetchall()
+            plan = '\n'.join(f'    {rand[3]}' for rand in randuri)
+        except sqlite3.Error as eroare:
+            plan = f'    (planul nu a putut fi obtinut: {eroare})'
+    logger.warning('Interogare lenta (%.1f ms): %s\n  parametri: %r%s',
+                   durata * 1000, ' '.join(sql.split()), parametri, '\n  plan:\n' + plan if plan else '')
+
+class _CursorUrmarit:
+    """
+    Invelis peste un cursor: timpul citirii randurilor se adauga la interogarea care l-a creat
+    """
+    __slots__ = ('_cursor', '_conn', '_sql', '_parametri', '_durata', '_logata')
+
+    def __init__(self, cursor, conn, sql, parametri, durata):
+        self._cursor = cursor
+        self._conn = conn
+        self._sql = sql
+        self._parametri = parametri
+        self._durata = durata
+        self._logata = False
+        self._verifica()
+
+    # Logheaza interogarea o singura data, cand timpul ei total depaseste pragul
+    def _verifica(self):
+        if not self._logata and self._durata * 1000 >= PRAG_LENT_MS:
+            self._logata = True
+            _logheaza_lenta(self._conn, self._sql, self._parametri, self._durata)
+
+    def _citeste(self, metoda, *argumente):
+        inceput = time.perf_counter()
+        try:
+            return metoda(*argumente)
+        finally:
+            durata = time.perf_counter() - inceput
+            self._durata += durata
+            statistici = getattr(_curent, 'statistici', None)
+            if statistici is not None:
+                statistici.timp += durata
+            self._verifica()
+
+    def fetchone(self):
+        return self._citeste(self._cursor.fetchone)
+
+    def fetchmany(self, *argumente):
+        return self._citeste(self._cursor.fetchmany, *argumente)
+
+    def fetchall(self):
+        return self._citeste(self._cursor.fetchall)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        rand = self._citeste(self._cursor.fetchone)
+        if rand is None:
+            raise StopIteration
+        return rand
+
+    def __getattr__(self, nume):
+        return getattr(self._cursor, nume)
+
+class ConexiuneUrmarita(sqlite3.Connection):
+    """
+    Conexiune SQLite care masoara interogarile (folosita ca factory in sqlite3.connect)
+    """
+
+    def __init__(self, *argumente, **optiuni):
+        super().__init__(*argumente, **optiuni)
+        if logger.isEnabledFor(logging.DEBUG):
+            # Fiecare instructiune executata de SQLite, cu parametrii inlocuiti
+            self.set_trace_callback(lambda sql: logger.debug('SQL: %s', sql))
+
+    def execute(self, sql, parametri=()):
+        inceput = time.perf_counter()
+        cursor = super().execute(sql, parametri)
+        durata = time.perf_counter() - inceput
+        _adauga(sql, durata)
+        return _CursorUrmarit(cursor, self, sql, parametri, durata)
+
+    def executemany(self, sql, parametri):
+        inceput = time.perf_counter()
+        cursor = super().executemany(sql, parametri)
+        durata = time.perf_counter() - inceput
+        # Un executemany repetat (insert-uri in loturi) este intentionat, nu un N+1
+        _adauga(sql, durata, numara_repetari=False)
+        # Parametrii (de obicei un generator) au fost consumati: fara EXPLAIN
+        return _CursorUrmarit(cursor, self, sql, None, durata)
+
+    def commit(self):
+        inceput = time.perf_counter()
+        super().commit()
+        _adauga('COMMIT', time.perf_counter() - inceput, numara_repetari=False)
+
+# Functie pentru inregistrarea urmaririi intr-o aplicatie Flask
+def instrumenteaza_sql(app):
+    """
+    Inregistreaza hook-urile care aduna interogarile fiecarei cereri
+    (doar daca MOVIE_MANAGER_SQL_TRACE este activ)
+    """
+    if not URMARIRE_ACTIVA:
+        return
+    from flask import request
+
+    @app.before_request
+    def _inceput_cerere():
+        if getattr(_curent, 'statistici', None) is None:
+            _curent.statistici = StatisticiCerere()
+            request.environ[CHEIE_PROPRIETAR] = True
+
+    @app.after_request
+    def _antete_cerere(raspuns):
+        statistici = getattr(_curent, 'statistici', None)
+        if statistici is not None and request.environ.get(CHEIE_PROPRIETAR) and app.debug:
+            raspuns.headers['X-DB-Queries'] = str(statistici.interogari)
+            raspuns.headers['X-DB-Time'] = f'{statistici.timp * 1000:.2f}ms'
+        return raspuns
+
+    @app.teardown_request
+    def _sfarsit_cerere(exceptie=None):
+        if not request.environ.pop(CHEIE_PROPRIETAR, None):
+            return
+        statistici = _curent.statistici
+        _curent.statistici = None
+        for sql, numar in statistici.repetari.items():
+            if numar >= PRAG_REPETARI:
+                logger.warning('%s %s: aceeasi interogare de %d ori (posibil N+1): %s',
+                               request.method, request.path, numar, ' '.join(sql.split()))
+        logger.debug('%s %s: %d interogari, %.2f ms', request.method, request.path,
+                     statistici.interogari, statistici.timp * 1000)
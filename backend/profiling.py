@@ -0,0 +1,212 @@
+"""
+Modul pentru profilarea la cerere a unei singure cereri (cProfile, stive colapsate, tracemalloc)
+Profilarea este activata doar daca MOVIE_MANAGER_PROFILE_KEY este setat; o cerere este
+profilata doar daca trimite aceeasi cheie in header-ul X-Profile (niciodata in query string,
+ca sa nu ajunga in log-urile de acces, in istoricul browser-ului sau in Referer).
+Fara cheie configurata, middleware-ul nu este instalat deloc, iar pentru celelalte cereri
+costul este o singura cautare in environ-ul WSGI.
+
+Optiuni (header-e):
+    X-Profile-Format: pstats (implicit) sau collapsed
+    X-Profile-Memory: 1 pentru topul liniilor care aloca memorie (tracemalloc)
+
+Rezultatele sunt scrise in MOVIE_MANAGER_PROFILE_DIR (implicit instance/profiles), iar numele
+fisierelor sunt trimise in header-ul X-Profile-Files:
+    *.prof      - pstats (python -m pstats, snakeviz)
+    *.collapsed - stive colapsate ("f1;f2;f3 microsecunde"), pentru flamegraph.pl / speedscope
+    *.mem.txt   - topul alocarilor facute in timpul cererii (tracemalloc urmareste tot
+                  procesul cat timp ruleaza cererea, deci include si alocarile cererilor
+                  concurente; este oprit dupa cerere daca ea l-a pornit)
+
+Pentru raspunsurile streaming este profilata doar crearea raspunsului, nu trimiterea fluxului.
+"""
+import cProfile
+import hmac
+import itertools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+
+# Cheia care autorizeaza profilarea (fara ea, profilarea este dezactivata)
+CHEIE_PROFILARE = os.getenv('MOVIE_MANAGER_PROFILE_KEY', '')
+
+# Directorul in care sunt scrise profilele
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DIRECTOR_PROFILE = os.getenv('MOVIE_MANAGER_PROFILE_DIR', os.path.join(BASE_DIR, 'instance', 'profiles'))
+
+# Numarul de linii din topul alocarilor
+TOP_ALOCARI = int(os.getenv('MOVIE_MANAGER_PROFILE_MEMORY_TOP', '25'))
+
+# Formatele de iesire acceptate
+FORMATE = ('pstats', 'collapsed')
+
+logger = logging.getLogger('movie_manager.profile')
+
+# Contor pentru nume de fisiere unice in acelasi proces
+_numar_profil = itertools.count(1)
+
+# tracemalloc este pornit de cererile care il cer si oprit dupa ele; lock-ul serializeaza
+# cererile profilate cu memorie, ca una sa nu opreasca urmarirea in timpul alteia
+_lock_tracemalloc = threading.Lock()
+
+class ProfilerStive:
+    """
+    Profiler determinist care pastreaza stiva completa (sys.setprofile, doar thread-ul curent)
+    Timpul propriu al fiecarei functii este adunat pe stiva din care a fost apelata
+    """
+
+    def __init__(self):
+        self.timpi = {}
+        self._chei = []
+        self._ultim = 0
+
+    # Numele unei functii Python sau C, ca in flamegraph-uri: modul:functie
+    @staticmethod
+    def _nume_cadru(cadru):
+        cod = cadru.f_code
+        return f'{os.path.basename(cod.co_filename)}:{cod.co_name}'
+
+    @staticmethod
+    def _nume_c(functie):
+        modul = getattr(functie, '__module__', None) or type(getattr(functie, '__self__', None)).__name__
+        return f'{modul}:{getattr(functie, "__qualname__", getattr(functie, "__name__", "?"))}'
+
+    def _eveniment(self, cadru, eveniment, argument):
+        acum = time.perf_counter_ns()
+        chei = self._chei
+        if chei:
+            cheie = chei[-1]
+            self.timpi[cheie] = self.timpi.get(cheie, 0) + acum - self._ultim
+        if eveniment == 'call' or eveniment == 'c_call':
+            nume = self._nume_cadru(cadru) if eveniment == 'call' else self._nume_c(argument)
+            chei.append(f'{chei[-1]};{nume}' if chei else nume)
+        elif chei:
+            # return, c_return, c_exception
+            chei.pop()
+        self._ultim = time.perf_counter_ns()
+
+    def enable(self):
+        self._ultim = time.perf_counter_ns()
+        sys.setprofile(self._eveniment)
+
+    def disable(self):
+        sys.setprofile(None)
+
+    # Scrie stivele in formatul colapsat (o stiva pe linie, cu microsecunde)
+    def scrie(self, cale):
+        with open(cale, 'w', encoding='utf-8') as fisier:
+            for stiva, nanosecunde in sorted(self.timpi.items()):
+                microsecunde = nanosecunde // 1000
+                if microsecunde:
+                    fisier.write(f'{stiva} {microsecunde}\n')
+
+# Functie pentru numele fisierelor unui profil
+def _baza_fisier(mediu):
+    cale = re.sub(r'[^A-Za-z0-9]+', '_', mediu.get('PATH_INFO', '')).strip('_') or 'root'
+    return os.path.join(DIRECTOR_PROFILE, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-"
+                                          f"{next(_numar_profil)}-{mediu.get('REQUEST_METHOD', 'GET')}-{cale[:80]}")
+
+# Functie pentru scrierea topului alocarilor
+def _scrie_alocari(cale, inainte, dupa, mediu):
+    # Alocarile profiler-ului si ale tracemalloc nu fac parte din cerere
+    filtre = [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)]
+    diferente = dupa.filter_traces(filtre).compare_to(inainte.filter_traces(filtre), 'lineno')
+    with open(cale, 'w', encoding='utf-8') as fisier:
+        fisier.write(f"{mediu.get('REQUEST_METHOD')} {mediu.get('PATH_INFO')}: top {TOP_ALOCARI} linii dupa memoria alocata\n")
+        for statistica in diferente[:TOP_ALOCARI]:
+            fisier.write(f'{statistica}\n')
+
+class MiddlewareProfilare:
+    """
+    Middleware WSGI care profileaza cererile autorizate (cheie in header-ul X-Profile)
+    """
+
+    def __init__(self, aplicatie, cheie=CHEIE_PROFILARE):
+        self.aplicatie = aplicatie
+        self.cheie = cheie.encode()
+
+    # Verifica daca cererea are cheia corecta
+    def _autorizata(self, mediu):
+        return hmac.compare_digest(mediu['HTTP_X_PROFILE'].encode(), self.cheie)
+
+    def __call__(self, mediu, start_response):
+        # Calea obisnuita: o singura cautare in environ
+        if 'HTTP_X_PROFILE' not in mediu:
+            return self.aplicatie(mediu, start_response)
+
+        if not self._autorizata(mediu):
+            logger.warning('Cerere de profilare respinsa (cheie invalida): %s', mediu.get('PATH_INFO'))
+            return self.aplicatie(mediu, start_response)
+
+        format_profil = mediu.get('HTTP_X_PROFILE_FORMAT') or 'pstats'
+        if format_profil not in FORMATE:
+            format_profil = 'pstats'
+        memorie = mediu.get('HTTP_X_PROFILE_MEMORY') in ('1', 'true')
+        if memorie:
+            with _lock_tracemalloc:
+                return self._profileaza(mediu, start_response, format_profil, memorie)
+        return self._profileaza(mediu, start_response, format_profil, memorie)
+
+    # Ruleaza cererea sub profiler si scrie rezultatele
+    def _profileaza(self, mediu, start_response, format_profil, memorie):
+        os.makedirs(DIRECTOR_PROFILE, exist_ok=True)
+        baza = _baza_fisier(mediu)
+        fisiere = []
+
+        if memorie:
+            # Daca tracemalloc nu rula deja, il pornim doar pentru aceasta cerere
+            pornit_aici = not tracemalloc.is_tracing()
+            if pornit_aici:
+                tracemalloc.start()
+            inainte = tracemalloc.take_snapshot()
+
+        profiler = cProfile.Profile() if format_profil == 'pstats' else ProfilerStive()
+        antete_raspuns = []
+
+        # Header-ele cu fisierele sunt adaugate dupa profilare (start_response este apelat mai tarziu)
+        def start_response_amanat(status, antete, exc_info=None):
+            antete_raspuns.append((status, antete, exc_info))
+            return lambda date: None
+
+        inceput = time.perf_counter()
+        profiler.enable()
+        try:
+            rezultat = self.aplicatie(mediu, start_response_amanat)
+        finally:
+            profiler.disable()
+            durata = time.perf_counter() - inceput
+
+            if format_profil == 'pstats':
+                profiler.dump_stats(baza + '.prof')
+                fisiere.append(baza + '.prof')
+            else:
+                profiler.scrie(baza + '.collapsed')
+                fisiere.append(baza + '.collapsed')
+            if memorie:
+                dupa = tracemalloc.take_snapshot()
+                if pornit_aici:
+                    tracemalloc.stop()
+                _scrie_alocari(baza + '.mem.txt', inainte, dupa, mediu)
+                fisiere.append(baza + '.mem.txt')
+
+        logger.info('Profil %s %s (%.1f ms): %s', mediu.get('REQUEST_METHOD'), mediu.get('PATH_INFO'),
+                    durata * 1000, ', '.join(fisiere))
+        status, antete, exc_info = antete_raspuns[0]
+        antete = list(antete) + [
+            ('X-Profile-Files', ', '.join(os.path.basename(fisier) for fisier in fisiere)),
+            ('X-Profile-Time', f'{durata * 1000:.2f}ms'),
+        ]
+        start_response(status, antete, exc_info)
+        return rezultat
+
+# Functie pentru activarea profilarii intr-o aplicatie Flask
+def activeaza_profilare(app):
+    """
+    Instaleaza middleware-ul de profilare, doar daca MOVIE_MANAGER_PROFILE_KEY este setat
+    """
+    if CHEIE_PROFILARE:
+        app.wsgi_app = MiddlewareProfilare(app.wsgi_app)
@@ -0,0 +1,128 @@
+"""
+Modul pentru ruta de batch (/batch): mai multe apeluri API intr-un singur request HTTP
+Fiecare apel ruleaza in propriul context de aplicatie si de cerere, ca o cerere obisnuita:
+hook-urile before_request / after_request / teardown (metrici, urmarirea SQL, CORS) ruleaza
+pentru fiecare apel, iar fiecare apel are propriul g (utilizatorul este rezolvat din nou, din
+cache-ul de token-uri). Singura resursa comuna este conexiunea la baza de date a batch-ului,
+data explicit fiecarui apel si eliberata in pool o singura data, la sfarsitul batch-ului.
+Profilarea (middleware WSGI) vede doar cererea batch, nu apelurile din ea.
+"""
+import sys
+
+from flask import Blueprint, request, jsonify, current_app, g
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder
+
+from models.database import get_db_connection
+
+# Cream un Blueprint pentru ruta de batch
+batch_bp = Blueprint('batch', __name__)
+
+# Numarul maxim de apeluri dintr-un singur batch
+MAXIM_APELURI = 20
+
+# Metodele permise pentru apelurile din batch
+METODE_PERMISE = ('GET', 'POST', 'PUT', 'DELETE')
+
+# Functie pentru executarea unui singur apel din batch
+def _executa_apel(apel, token):
+    """
+    Executa un apel API in procesul curent (fara request HTTP nou), cu hook-urile aplicatiei,
+    si returneaza (status, corp JSON)
+    """
+    metoda = str(apel.get('method', 'GET')).upper()
+    cale = apel.get('path', '')
+
+    # Validam apelul: doar rute /api, fara batch-uri imbricate
+    if metoda not in METODE_PERMISE:
+        return 400, {'message': 'Metoda invalida'}
+    if not isinstance(cale, str) or not cale.startswith('/') or cale.startswith('/batch'):
+        return 400, {'message': 'Cale invalida'}
+
+    headere = {}
+    if token:
+        headere['Authorization'] = token
+
+    # Conexiunea batch-ului (din contextul cererii batch), comuna tuturor apelurilor:
+    # un apel vede scrierile apelurilor anterioare
+    conn = get_db_connection()
+    aplicatie = current_app._get_current_object()
+
+    # Cererea apelului are aceeasi gazda si aceeasi radacina ca cererea batch
+    constructor = EnvironBuilder(path='/api' + cale, base_url=request.url_root, method=metoda,
+                                 json=apel.get('body'), headers=headere)
+    try:
+        with aplicatie.app_context():
+            g.db_conn = conn
+            try:
+                with aplicatie.request_context(constructor.get_environ()):
+                    raspuns = _trimite_apel(aplicatie, conn)
+                    return raspuns.status_code, raspuns.get_json(silent=True)
+            finally:
+                # Conexiunea nu este eliberata la teardown-ul apelului, ci la cel al batch-ului
+                g.pop('db_conn', None)
+    finally:
+        constructor.close()
+
+# Functie pentru trimiterea apelului din contextul curent catre ruta lui
+def _trimite_apel(aplicatie, conn):
+    """
+    Ruleaza before_request, ruta si after_request pentru cererea din contextul curent
+    Returneaza raspunsul final (teardown-ul ruleaza la iesirea din context)
+    """
+    try:
+        raspuns = aplicatie.preprocess_request()
+        if raspuns is None:
+            raspuns = aplicatie.dispatch_request()
+        raspuns = aplicatie.make_response(raspuns)
+    except HTTPException as eroare:
+        # Ruta inexistenta, metoda nepermisa sau abort() in ruta
+        raspuns = jsonify({'message': eroare.description})
+        raspuns.status_code = eroare.code
+    except Exception:
+        # O eroare intr-un apel nu opreste restul batch-ului (si nu lasa tranzactia deschisa)
+        aplicatie.log_exception(sys.exc_info())
+        if conn.in_transaction:
+            conn.rollback()
+        raspuns = jsonify({'message': 'Eroare interna'})
+        raspuns.status_code = 500
+
+    # Raspunsurile streaming (de ex. SSE) nu se termina, deci nu pot fi incluse in batch
+    if raspuns.is_streamed:
+        raspuns.close()
+        raspuns = jsonify({'message': 'Raspunsurile streaming nu sunt suportate in batch'})
+        raspuns.status_code = 400
+
+    return aplicatie.process_response(raspuns)
+
+# Ruta pentru executarea mai multor apeluri intr-un singur request
+@batch_bp.route('/batch', methods=['POST'])
+def batch():
+    """
+    Endpoint pentru executarea mai multor apeluri API intr-un singur request
+    Request: {"requests": [{"method": "GET", "path": "/movies", "body": {...}}, ...]}
+    Response: {"responses": [{"status": 200, "body": {...}}, ...]}, in aceeasi ordine
+    """
+    # Preluam datele din cerere
+    date = request.get_json(silent=True)
+
+    # Verificam daca datele au fost trimise
+    if not date or not isinstance(date.get('requests'), list):
+        return jsonify({'message': 'Date lipsa'}), 400
+
+    apeluri = date['requests']
+    if len(apeluri) > MAXIM_APELURI:
+        return jsonify({'message': f'Maxim {MAXIM_APELURI} apeluri per batch'}), 400
+
+    # Token-ul din batch este folosit pentru toate apelurile
+    token = request.headers.get('Authorization')
+
+    raspunsuri = []
+    for apel in apeluri:
+        if not isinstance(apel, dict):
+            raspunsuri.append({'status': 400, 'body': {'message': 'Apel invalid'}})
+            continue
+        status, corp = _executa_apel(apel, token)
+        raspunsuri.append({'status': status, 'body': corp})
+
+    return jsonify({'responses': raspunsuri}), 200
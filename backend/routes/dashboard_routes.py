@@ -0,0 +1,35 @@
+"""
+Modul pentru ruta agregata a dashboard-ului (/dashboard)
+"""
+from flask import Blueprint, request, jsonify
+from models.database import get_db_connection
+from models.repository import date_dashboard
+from security import verifica_token
+from services.data_versions import versiune_utilizator, calculeaza_etag, este_nemodificat, raspuns_nemodificat, cu_etag
+
+# Cream un Blueprint pentru ruta de dashboard
+dashboard_bp = Blueprint('dashboard', __name__)
+
+# Ruta pentru obtinerea datelor dashboard-ului
+@dashboard_bp.route('/dashboard', methods=['GET'])
+def get_dashboard():
+    """
+    Endpoint pentru toate datele dashboard-ului intr-un singur apel
+    Response: {"version": N, "movies": {"To Watch": [...], ...},
+               "friends": [...], "recommendations_count": N}
+    """
+    # Verificam token ul de autentificare
+    token = request.headers.get('Authorization')
+    id_user = verifica_token(token)
+    if not id_user:
+        return jsonify({'message': 'Acces interzis'}), 401
+    
+    conn = get_db_connection()
+    
+    # Daca datele nu s-au schimbat de la ultima cerere a clientului, raspundem 304
+    etag = calculeaza_etag('dashboard', id_user, versiune_utilizator(conn, id_user))
+    if este_nemodificat(etag):
+        return raspuns_nemodificat(etag)
+    
+    # Filmele, prietenii si recomandarile sunt citite din acelasi snapshot
+    return cu_etag(jsonify(date_dashboard(conn, id_user)), etag), 200
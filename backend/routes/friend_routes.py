@@ -1,10 +1,19 @@
 """
 Modul pentru rutele legate de prieteni (/friends, /friends/<username>/movies, /recommendations)
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 import sqlite3
 from models.database import get_db_connection
-from security import verifica_token
+from models.repository import (id_utilizator, lista_prieteni, pagina_prieteni, sunt_prieteni, adauga_prietenie,
+                               filme_pe_liste, pagina_recomandari, recomandari_primite, adauga_recomandare,
+                               sterge_recomandare, ultima_recomandare)
+from security import verifica_token, PREFIX_TOKEN, emite_token_flux, verifica_token_flux, DURATA_TOKEN_FLUX
+from services.events import hub_recomandari, PreaMultiAbonati
+from services.recommendation_stream import flux_recomandari, publica_recomandare, ASTEPTARE_PREA_MULTE_FLUXURI
+from services.friend_graph import LIMITA_IMPLICITA
+from services.pagination import CursorInvalid
+from routes.movie_routes import raspuns_pagina_filme
+from services.data_versions import versiune_utilizator, calculeaza_etag, este_nemodificat, raspuns_nemodificat, cu_etag
 
 # Cream un Blueprint pentru rutele de prieteni
 friend_bp = Blueprint('friends', __name__)
@@ -23,21 +32,37 @@ def get_friends():
     
     conn = get_db_connection()
     
-    # Preluam toti prietenii utilizatorului (relatie bidirectionala)
-    # Cautam atat prietenii unde user_id = id_user, cat si unde friend_id = id_user
-    prieteni = conn.execute('''
-        SELECT DISTINCT u.username 
-        FROM users u
-        INNER JOIN friends f ON (f.friend_id = u.id AND f.user_id = ?) OR (f.user_id = u.id AND f.friend_id = ?)
-        WHERE u.id != ?
-    ''', (id_user, id_user, id_user)).fetchall()
+    # Daca lista nu s-a schimbat de la ultima cerere a clientului, raspundem 304
+    etag = calculeaza_etag('friends', id_user, versiune_utilizator(conn, id_user))
+    if este_nemodificat(etag):
+        return raspuns_nemodificat(etag)
     
-    conn.close()
+    # Preluam toti prietenii utilizatorului (relatia este salvata in ambele directii)
+    prieteni = lista_prieteni(conn, id_user)
     
-    # Organizam prietenii intr-o lista
-    lista_prieteni = [prieten['username'] for prieten in prieteni]
+    return cu_etag(jsonify(prieteni), etag), 200
+
+# Ruta pentru obtinerea listei de prieteni, paginata
+@friend_bp.route('/friends/page', methods=['GET'])
+def get_friends_page():
+    """
+    Endpoint pentru obtinerea unei pagini din lista de prieteni
+    Query: limit (numarul de prieteni), cursor (valoarea next_cursor din pagina anterioara)
+    """
+    # Verificam token ul de autentificare
+    token = request.headers.get('Authorization')
+    id_user = verifica_token(token)
+    if not id_user:
+        return jsonify({'message': 'Acces interzis'}), 401
+    
+    # Preluam parametrii de paginare
+    limita = request.args.get('limit', LIMITA_IMPLICITA, type=int)
+    cursor = request.args.get('cursor', 0, type=int)
     
-    return jsonify(lista_prieteni), 200
+    conn = get_db_connection()
+    prieteni, urmator = pagina_prieteni(conn, id_user, limita, cursor)
+    
+    return jsonify({'friends': prieteni, 'next_cursor': urmator}), 200
 
 # Ruta pentru adaugarea unui prieten
 @friend_bp.route('/friends/add', methods=['POST'])
@@ -67,39 +92,27 @@ def add_friend():
     conn = get_db_connection()
     
     # Cautam utilizatorul prieten in baza de date
-    prieten = conn.execute('SELECT id FROM users WHERE username = ?', (nume_prieten,)).fetchone()
+    id_prieten = id_utilizator(conn, nume_prieten)
     
-    if not prieten:
-        conn.close()
+    if not id_prieten:
         return jsonify({'message': 'Utilizator negasit'}), 404
     
-    id_prieten = prieten['id']
-    
     # Verificam daca nu incearca sa se adauge pe sine
     if id_user == id_prieten:
-        conn.close()
         return jsonify({'message': 'Nu te poti adauga pe tine insuti'}), 400
     
     # Verificam daca prietenia exista deja
-    prietenie_existenta = conn.execute('SELECT id FROM friends WHERE (user_id = ? AND friend_id = ?) OR (user_id = ? AND friend_id = ?)', 
-                                      (id_user, id_prieten, id_prieten, id_user)).fetchone()
-    
-    if prietenie_existenta:
-        conn.close()
+    if sunt_prieteni(conn, id_user, id_prieten):
         return jsonify({'message': 'Prietenia exista deja'}), 400
     
     try:
         # Adaugam prietenia (bidirectionala)
-        conn.execute('INSERT INTO friends (user_id, friend_id) VALUES (?, ?)', (id_user, id_prieten))
-        conn.execute('INSERT INTO friends (user_id, friend_id) VALUES (?, ?)', (id_prieten, id_user))
+        adauga_prietenie(conn, id_user, id_prieten)
         conn.commit()
-        conn.close()
         return jsonify({'message': 'Prieten adaugat'}), 201
     except sqlite3.IntegrityError:
-        conn.close()
         return jsonify({'message': 'Prietenia exista deja'}), 400
     except Exception:
-        conn.close()
         return jsonify({'message': 'Eroare la adaugarea prietenului'}), 400
 
 # Ruta pentru vizualizarea filmelor unui prieten
@@ -117,44 +130,28 @@ def get_friend_movies(friend_username):
     conn = get_db_connection()
     
     # Cautam utilizatorul prieten in baza de date
-    prieten = conn.execute('SELECT id FROM users WHERE username = ?', (friend_username,)).fetchone()
+    id_prieten = id_utilizator(conn, friend_username)
     
-    if not prieten:
-        conn.close()
+    if not id_prieten:
         return jsonify({'message': 'Utilizator negasit'}), 404
     
-    id_prieten = prieten['id']
-    
     # Verificam daca exista prietenia
-    prietenie = conn.execute('SELECT id FROM friends WHERE (user_id = ? AND friend_id = ?) OR (user_id = ? AND friend_id = ?)', 
-                            (id_user, id_prieten, id_prieten, id_user)).fetchone()
-    
-    if not prietenie:
-        conn.close()
+    if not sunt_prieteni(conn, id_user, id_prieten):
         return jsonify({'message': 'Nu sunteti prieteni'}), 403
     
-    # Preluam toate filmele prietenului, grupate pe status
-    date_filme = conn.execute('SELECT id, title, status, rating FROM movies WHERE user_id = ? ORDER BY status, title', 
-                              (id_prieten,)).fetchall()
-    conn.close()
-    
-    # Organizam filmele pe liste (To Watch, Watching, Completed)
-    filme = {
-        'To Watch': [],
-        'Watching': [],
-        'Completed': []
-    }
-    
-    for rand in date_filme:
-        status = rand['status']
-        if status in filme:
-            filme[status].append({
-                'id': rand['id'],
-                'title': rand['title'],
-                'rating': rand['rating'] if rand['rating'] else '-'
-            })
-    
-    return jsonify(filme), 200
+    # Daca filmele prietenului nu s-au schimbat, raspundem 304
+    etag = calculeaza_etag('friend-movies', id_prieten, versiune_utilizator(conn, id_prieten))
+    if este_nemodificat(etag):
+        return raspuns_nemodificat(etag)
+    
+    # Daca se cere paginare (limit / cursor), returnam doar o pagina
+    if 'limit' in request.args or 'cursor' in request.args:
+        return raspuns_pagina_filme(conn, id_prieten, etag)
+    
+    # Preluam toate filmele prietenului, organizate pe liste (To Watch, Watching, Completed)
+    filme = filme_pe_liste(conn, id_prieten)
+    
+    return cu_etag(jsonify(filme), etag), 200
 
 # Ruta pentru recomandarea unui film unui prieten
 @friend_bp.route('/friends/recommend', methods=['POST'])
@@ -188,32 +185,25 @@ def recommend_movie():
     conn = get_db_connection()
     
     # Cautam utilizatorul prieten in baza de date
-    prieten = conn.execute('SELECT id FROM users WHERE username = ?', (nume_prieten,)).fetchone()
+    id_prieten = id_utilizator(conn, nume_prieten)
     
-    if not prieten:
-        conn.close()
+    if not id_prieten:
         return jsonify({'message': 'Utilizator negasit'}), 404
     
-    id_prieten = prieten['id']
-    
     # Verificam daca exista prietenia
-    prietenie = conn.execute('SELECT id FROM friends WHERE (user_id = ? AND friend_id = ?) OR (user_id = ? AND friend_id = ?)', 
-                            (id_user, id_prieten, id_prieten, id_user)).fetchone()
-    
-    if not prietenie:
-        conn.close()
+    if not sunt_prieteni(conn, id_user, id_prieten):
         return jsonify({'message': 'Nu sunteti prieteni'}), 403
     
     try:
         # Adaugam recomandarea in baza de date
-        conn.execute('INSERT INTO recommendations (from_user_id, to_user_id, movie_title) VALUES (?, ?, ?)', 
-                    (id_user, id_prieten, titlu_film))
+        id_recomandare = adauga_recomandare(conn, id_user, id_prieten, titlu_film)
         conn.commit()
-        conn.close()
-        return jsonify({'message': 'Recomandare trimisa'}), 201
     except Exception:
-        conn.close()
         return jsonify({'message': 'Eroare la trimiterea recomandarii'}), 400
+    
+    # Trimitem recomandarea catre fluxurile SSE deschise ale prietenului
+    publica_recomandare(id_prieten, id_recomandare, titlu_film, token.replace(PREFIX_TOKEN, ''))
+    return jsonify({'message': 'Recomandare trimisa'}), 201
 
 # Ruta pentru obtinerea recomandarilor primite
 @friend_bp.route('/recommendations', methods=['GET'])
@@ -229,16 +219,28 @@ def get_recommendations():
     
     conn = get_db_connection()
     
-    # Preluam toate recomandarile primite de utilizator (inclusiv ID-ul pentru stergere)
-    recomandari = conn.execute('''
-        SELECT r.id, r.movie_title, u.username as from_username
-        FROM recommendations r
-        INNER JOIN users u ON r.from_user_id = u.id
-        WHERE r.to_user_id = ?
-        ORDER BY r.id DESC
-    ''', (id_user,)).fetchall()
+    # Daca recomandarile nu s-au schimbat de la ultima cerere a clientului, raspundem 304
+    etag = calculeaza_etag('recommendations', id_user, versiune_utilizator(conn, id_user))
+    if este_nemodificat(etag):
+        return raspuns_nemodificat(etag)
+    
+    # Daca se cere paginare (limit / cursor), returnam doar o pagina
+    if 'limit' in request.args or 'cursor' in request.args:
+        limita = request.args.get('limit', LIMITA_IMPLICITA, type=int)
+        try:
+            recomandari, urmator = pagina_recomandari(conn, id_user, limita, request.args.get('cursor'))
+        except CursorInvalid:
+            return jsonify({'message': 'Cursor invalid'}), 400
+        return cu_etag(jsonify({
+            'recommendations': [
+                {'id': r['id'], 'movie_title': r['movie_title'], 'from_username': r['from_username']}
+                for r in recomandari
+            ],
+            'next_cursor': urmator
+        }), etag), 200
     
-    conn.close()
+    # Preluam toate recomandarile primite de utilizator (inclusiv ID-ul pentru stergere)
+    recomandari = recomandari_primite(conn, id_user)
     
     # Organizam recomandarile intr-o lista
     lista_recomandari = []
@@ -249,7 +251,67 @@ def get_recommendations():
             'from_username': recomandare['from_username']
         })
     
-    return jsonify(lista_recomandari), 200
+    return cu_etag(jsonify(lista_recomandari), etag), 200
+
+# Ruta pentru obtinerea unui token de flux (pentru EventSource din browser)
+@friend_bp.route('/recommendations/stream-token', methods=['POST'])
+def stream_token():
+    """
+    Endpoint pentru un token de scurta durata, acceptat doar de /recommendations/stream
+    Response: {"token": "...", "expires_in": secunde}
+    """
+    # Verificam token ul de autentificare
+    token = request.headers.get('Authorization')
+    id_user = verifica_token(token)
+    if not id_user:
+        return jsonify({'message': 'Acces interzis'}), 401
+    
+    raspuns = jsonify({'token': emite_token_flux(id_user), 'expires_in': DURATA_TOKEN_FLUX})
+    raspuns.headers['Cache-Control'] = 'no-store'
+    return raspuns, 200
+
+# Ruta pentru fluxul de recomandari noi (Server-Sent Events)
+@friend_bp.route('/recommendations/stream', methods=['GET'])
+def stream_recommendations():
+    """
+    Endpoint SSE care trimite recomandarile noi imediat ce sunt create
+    EventSource din browser nu poate trimite header-e: in locul token-ului API primeste
+    ?token= cu un token de flux (POST /recommendations/stream-token), valabil cateva secunde
+    Query: after (id-ul ultimei recomandari afisate); la reconectare browserul trimite
+    header-ul Last-Event-ID, iar recomandarile pierdute sunt trimise intai
+    """
+    # Verificam token ul de autentificare (token-ul API este acceptat doar in header)
+    token = request.headers.get('Authorization')
+    id_user = verifica_token(token) if token else verifica_token_flux(request.args.get('token'))
+    if not id_user:
+        return jsonify({'message': 'Acces interzis'}), 401
+    
+    conn = get_db_connection()
+    versiune = versiune_utilizator(conn, id_user)
+    
+    # Punctul de pornire: ultimul eveniment primit de client sau cea mai noua recomandare
+    ultimul_id = request.headers.get('Last-Event-ID', type=int)
+    if ultimul_id is None:
+        ultimul_id = request.args.get('after', type=int)
+    recupereaza = ultimul_id is not None
+    if not recupereaza:
+        ultimul_id = ultima_recomandare(conn, id_user)
+    
+    try:
+        abonament = hub_recomandari.aboneaza(id_user)
+    except PreaMultiAbonati:
+        raspuns = jsonify({'message': 'Prea multe conexiuni deschise'})
+        raspuns.headers['Retry-After'] = str(ASTEPTARE_PREA_MULTE_FLUXURI)
+        return raspuns, 503
+    
+    # Conexiunea la baza de date este eliberata la sfarsitul cererii, inainte de streaming
+    raspuns = Response(flux_recomandari(abonament, id_user, ultimul_id, versiune, recupereaza),
+                       mimetype='text/event-stream')
+    raspuns.headers['Cache-Control'] = 'no-cache'
+    raspuns.headers['X-Accel-Buffering'] = 'no'
+    # Eliberam abonamentul si daca clientul se deconecteaza inainte de primul mesaj
+    raspuns.call_on_close(lambda: hub_recomandari.dezaboneaza(abonament))
+    return raspuns
 
 # Ruta pentru stergerea unei recomandari primite
 @friend_bp.route('/recommendations/<int:recommendation_id>', methods=['DELETE'])
@@ -265,19 +327,10 @@ def delete_recommendation(recommendation_id):
     
     conn = get_db_connection()
     
-    # Verificam daca recomandarea exista si apartine utilizatorului curent
-    recomandare = conn.execute('SELECT id FROM recommendations WHERE id = ? AND to_user_id = ?', 
-                               (recommendation_id, id_user)).fetchone()
-    
-    if not recomandare:
-        conn.close()
+    # Stergem recomandarea (doar daca exista si apartine utilizatorului curent)
+    if not sterge_recomandare(conn, id_user, recommendation_id):
         return jsonify({'message': 'Recomandare negasita'}), 404
-    
-    # Stergem recomandarea
-    conn.execute('DELETE FROM recommendations WHERE id = ? AND to_user_id = ?', 
-                (recommendation_id, id_user))
     conn.commit()
-    conn.close()
     
     return jsonify({'message': 'Recomandare stearsa'}), 200
 
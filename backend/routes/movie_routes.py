@@ -1,13 +1,39 @@
 """
 Modul pentru rutele legate de filme (/movies, /movies/<id>)
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 from models.database import get_db_connection
+from models.repository import (STATUSURI_VALIDE, filme_pe_liste, adauga_film, muta_film, noteaza_film, sterge_film,
+                               filme_detinute, aplica_operatii_filme)
 from security import verifica_token
+from services.title_index import index_titluri
+from services.pagination import pagina_filme, grupeaza_pe_liste, CursorInvalid, LIMITA_IMPLICITA
+from services.data_versions import versiune_utilizator, calculeaza_etag, este_nemodificat, raspuns_nemodificat, cu_etag
+from services.delta_sync import modificari_de_la, curata_periodic
+from services.library_io import FORMATE, EroareImport, detecteaza_format, importa_filme, exporta_filme
 
 # Cream un Blueprint pentru rutele de filme
 movie_bp = Blueprint('movies', __name__)
 
+# Numarul maxim de operatii dintr-un batch
+MAXIM_OPERATII_BATCH = 1000
+
+# Functie pentru validarea id-ului unui film dintr-o operatie
+def _este_id_film(valoare):
+    # bool este subclasa a lui int, dar True / False nu sunt id-uri
+    return type(valoare) is int
+
+# Functie pentru validarea unei note din batch
+def _nota_valida(nota):
+    """
+    Returneaza nota ca text ('1' - '10', ca in coloana rating) sau None daca este invalida
+    """
+    if type(nota) is int:
+        return str(nota) if 1 <= nota <= 10 else None
+    if isinstance(nota, str) and nota.strip().isdigit() and 1 <= int(nota.strip()) <= 10:
+        return str(int(nota.strip()))
+    return None
+
 # Ruta pentru obtinerea filmelor
 @movie_bp.route('/movies', methods=['GET'])
 def get_movies():
@@ -24,25 +50,68 @@ def get_movies():
     
     baza = get_db_connection()
     
-    # Preluam filmele utilizatorului (inclusiv rating-ul)
-    date_filme = baza.execute('SELECT id, title, status, rating FROM movies WHERE user_id = ?', (id_user,)).fetchall()
-    baza.close()
-    
-    # Organizam filmele in liste pe status
-    liste = {'To Watch': [], 'Watching': [], 'Completed': []}
-    for rand in date_filme:
-        # Verificam daca statusul este valid inainte de a adauga filmul
-        status_film = rand['status']
-        if status_film in liste:
-            # Adaugam filmul cu rating-ul sau '-' daca nu exista
-            rating = rand['rating'] if rand['rating'] else '-'
-            liste[status_film].append({
-                'id': rand['id'], 
-                'title': rand['title'],
-                'rating': rating
-            })
-
-    return jsonify(liste), 200
+    # Daca datele nu s-au schimbat de la ultima cerere a clientului, raspundem 304
+    etag = calculeaza_etag('movies', id_user, versiune_utilizator(baza, id_user))
+    if este_nemodificat(etag):
+        return raspuns_nemodificat(etag)
+    
+    # Daca se cere paginare (limit / cursor), returnam doar o pagina
+    if 'limit' in request.args or 'cursor' in request.args:
+        return raspuns_pagina_filme(baza, id_user, etag)
+    
+    # Preluam filmele utilizatorului (inclusiv rating-ul), organizate in liste pe status
+    liste = filme_pe_liste(baza, id_user)
+
+    return cu_etag(jsonify(liste), etag), 200
+
+# Functie pentru raspunsul paginat cu filmele unui utilizator
+def raspuns_pagina_filme(conn, id_user, etag):
+    """
+    Returneaza o pagina de filme (ordonate dupa status, titlu, id), grupate pe liste,
+    impreuna cu cursorul pentru pagina urmatoare si ETag-ul dat
+    Folosita si pentru filmele unui prieten (friend_routes)
+    """
+    limita = request.args.get('limit', LIMITA_IMPLICITA, type=int)
+    try:
+        randuri, urmator = pagina_filme(conn, id_user, limita, request.args.get('cursor'))
+    except CursorInvalid:
+        return jsonify({'message': 'Cursor invalid'}), 400
+    
+    return cu_etag(jsonify({'movies': grupeaza_pe_liste(randuri), 'next_cursor': urmator}), etag), 200
+
+# Ruta pentru sincronizarea incrementala a bibliotecii
+@movie_bp.route('/movies/changes', methods=['GET'])
+def get_changes():
+    """
+    Endpoint pentru modificarile filmelor si recomandarilor primite dupa o versiune
+    Request: ?since=<versiune> (0 sau lipsa pentru toata biblioteca)
+    Response: {"version": N, "full": bool,
+               "movies": {"upserted": [...], "deleted": [id, ...]},
+               "recommendations": {"upserted": [...], "deleted": [id, ...]}}
+    """
+    # Verificam token ul de autentificare
+    token = request.headers.get('Authorization')
+    id_user = verifica_token(token)
+    
+    # Daca token ul nu este valid, returnam eroare
+    if not id_user:
+        return jsonify({'message': 'Acces interzis'}), 401
+    
+    versiune = request.args.get('since', 0, type=int)
+    if versiune < 0:
+        return jsonify({'message': 'Versiune invalida'}), 400
+    
+    baza = get_db_connection()
+    
+    # Randurile vechi din jurnal sunt sterse periodic, in fundal
+    curata_periodic()
+    
+    # Daca clientul are deja versiunea curenta, raspundem 304
+    etag = calculeaza_etag('changes', id_user, versiune_utilizator(baza, id_user))
+    if este_nemodificat(etag):
+        return raspuns_nemodificat(etag)
+    
+    return cu_etag(jsonify(modificari_de_la(baza, id_user, versiune)), etag), 200
 
 # Ruta pentru adaugarea unui film nou
 @movie_bp.route('/movies', methods=['POST'])
@@ -84,9 +153,11 @@ def add_movie():
     baza = get_db_connection()
     
     # Introducem filmul in baza de date
-    baza.execute('INSERT INTO movies (user_id, title, status, rating) VALUES (?, ?, ?, ?)', (id_user, titlu, status_ales, '-'))
+    adauga_film(baza, id_user, titlu, status_ales)
     baza.commit()
-    baza.close()
+    
+    # Actualizam indexul de autocomplete cu noul titlu
+    index_titluri.adauga(titlu)
     
     return jsonify({'message': 'Film adaugat'}), 201
 
@@ -122,16 +193,10 @@ def move_movie(id_film):
     
     conn = get_db_connection()
     
-    # Verificam daca filmul exista si apartine utilizatorului
-    film = conn.execute('SELECT id FROM movies WHERE id = ? AND user_id = ?', (id_film, uid)).fetchone()
-    if not film:
-        conn.close()
+    # Actualizam statusul filmului (doar daca exista si apartine utilizatorului)
+    if not muta_film(conn, uid, id_film, noua_lista):
         return jsonify({'message': 'Film negasit'}), 404
-    
-    # Actualizam statusul filmului in baza de date
-    conn.execute('UPDATE movies SET status = ? WHERE id = ? AND user_id = ?', (noua_lista, id_film, uid))
     conn.commit()
-    conn.close()
     
     return jsonify({'message': 'Film mutat'}), 200
 
@@ -162,16 +227,10 @@ def rate_movie(id_film):
     
     conn = get_db_connection()
     
-    # Verificam daca filmul exista si apartine utilizatorului
-    film = conn.execute('SELECT id FROM movies WHERE id = ? AND user_id = ?', (id_film, uid)).fetchone()
-    if not film:
-        conn.close()
+    # Actualizam nota filmului (doar daca exista si apartine utilizatorului)
+    if not noteaza_film(conn, uid, id_film, nota):
         return jsonify({'message': 'Film negasit'}), 404
-    
-    # Actualizam nota filmului in baza de date
-    conn.execute('UPDATE movies SET rating = ? WHERE id = ? AND user_id = ?', (nota, id_film, uid))
     conn.commit()
-    conn.close()
     
     return jsonify({'message': 'Nota salvata'}), 200
 
@@ -189,19 +248,170 @@ def delete_movie(id_film):
     
     conn = get_db_connection()
     
-    # Verificam daca filmul exista si apartine utilizatorului
-    film = conn.execute('SELECT id FROM movies WHERE id = ? AND user_id = ?', (id_film, uid)).fetchone()
-    if not film:
-        conn.close()
+    # Stergem filmul (doar daca exista si apartine utilizatorului)
+    if not sterge_film(conn, uid, id_film):
         return jsonify({'message': 'Film negasit'}), 404
-    
-    # Stergem filmul din baza de date
-    conn.execute('DELETE FROM movies WHERE id = ? AND user_id = ?', (id_film, uid))
     conn.commit()
-    conn.close()
     
     return jsonify({'message': 'Film sters'}), 200
 
+# Ruta pentru modificarea mai multor filme intr-o singura tranzactie
+@movie_bp.route('/movies/batch', methods=['POST'])
+def batch_movies():
+    """
+    Endpoint pentru aplicarea mai multor operatii (add, move, rate, delete) intr-o singura tranzactie
+    Request: {"operations": [{"op": "add", "title": "...", "status": "..."},
+                             {"op": "move", "id": 1, "new_list": "..."},
+                             {"op": "rate", "id": 1, "rating": "9"},
+                             {"op": "delete", "id": 1}]}
+    Response: {"results": [{"status": 201, "message": "..."}, ...]}, in aceeasi ordine
+    """
+    # Verificam token ul de autentificare
+    token = request.headers.get('Authorization')
+    uid = verifica_token(token)
+    if not uid:
+        return jsonify({'message': 'Acces interzis'}), 401
+    
+    # Preluam operatiile din cerere
+    date = request.get_json(silent=True)
+    
+    # Verificam daca datele au fost trimise
+    if not date or not isinstance(date.get('operations'), list):
+        return jsonify({'message': 'Date lipsa'}), 400
+    
+    operatii = date['operations']
+    if len(operatii) > MAXIM_OPERATII_BATCH:
+        return jsonify({'message': f'Maxim {MAXIM_OPERATII_BATCH} operatii per batch'}), 400
+    
+    conn = get_db_connection()
+    
+    # Verificam proprietatea tuturor filmelor referite, printr-o singura interogare
+    id_referite = {op.get('id') for op in operatii if isinstance(op, dict) and _este_id_film(op.get('id'))}
+    detinute = filme_detinute(conn, uid, id_referite) if id_referite else set()
+    
+    # Validam operatiile in ordine si le grupam pe tipuri pentru executemany
+    rezultate = []
+    adaugari, mutari, note, stergeri = [], [], [], []
+    for op in operatii:
+        if not isinstance(op, dict):
+            rezultate.append({'status': 400, 'message': 'Operatie invalida'})
+            continue
+        
+        tip = op.get('op')
+        if tip == 'add':
+            titlu = op.get('title')
+            status_ales = op.get('status') or 'To Watch'
+            if not isinstance(titlu, str) or not titlu.strip():
+                rezultate.append({'status': 400, 'message': 'Titlul este obligatoriu'})
+            elif status_ales not in STATUSURI_VALIDE:
+                rezultate.append({'status': 400, 'message': 'Status invalid'})
+            else:
+                adaugari.append((uid, titlu, status_ales, '-'))
+                rezultate.append({'status': 201, 'message': 'Film adaugat'})
+            continue
+        
+        if tip not in ('move', 'rate', 'delete'):
+            rezultate.append({'status': 400, 'message': 'Operatie invalida'})
+            continue
+        
+        id_film = op.get('id')
+        if not _este_id_film(id_film):
+            rezultate.append({'status': 400, 'message': 'Id invalid'})
+            continue
+        if id_film not in detinute:
+            rezultate.append({'status': 404, 'message': 'Film negasit'})
+            continue
+        
+        if tip == 'move':
+            noua_lista = op.get('new_list')
+            if noua_lista not in STATUSURI_VALIDE:
+                rezultate.append({'status': 400, 'message': 'Status invalid'})
+            else:
+                mutari.append((noua_lista, id_film, uid))
+                rezultate.append({'status': 200, 'message': 'Film mutat'})
+        elif tip == 'rate':
+            nota = op.get('rating')
+            if nota is None:
+                rezultate.append({'status': 400, 'message': 'Nota este obligatorie'})
+            elif _nota_valida(nota) is None:
+                rezultate.append({'status': 400, 'message': 'Nota trebuie sa fie intre 1 si 10'})
+            else:
+                nota = _nota_valida(nota)
+                note.append((nota, id_film, uid))
+                rezultate.append({'status': 200, 'message': 'Nota salvata'})
+        else:
+            # Operatiile ulterioare pe acelasi film vor primi 404
+            detinute.discard(id_film)
+            stergeri.append((id_film, uid))
+            rezultate.append({'status': 200, 'message': 'Film sters'})
+    
+    # Aplicam toate modificarile intr-o singura tranzactie (un singur commit)
+    # Stergerile sunt ultimele, iar operatiile de dupa o stergere au fost deja respinse
+    # Toate valorile sunt validate mai sus, deci o eroare aici este o eroare a bazei de date
+    try:
+        aplica_operatii_filme(conn, adaugari, mutari, note, stergeri)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        return jsonify({'message': 'Eroare la aplicarea operatiilor'}), 500
+    
+    # Actualizam indexul de autocomplete cu titlurile noi
+    for adaugare in adaugari:
+        index_titluri.adauga(adaugare[1])
+    
+    return jsonify({'results': rezultate}), 200
+
+# Ruta pentru importul unei biblioteci de filme (CSV sau JSON Lines)
+@movie_bp.route('/movies/import', methods=['POST'])
+def import_movies():
+    """
+    Endpoint pentru importul filmelor din corpul cererii, citit in streaming
+    Formatul vine din ?format=csv|jsonl sau din Content-Type (text/csv, application/x-ndjson)
+    Response: {"imported": N, "skipped": N, "errors": [{"line": N, "message": "..."}, ...]}
+    """
+    # Verificam token ul de autentificare
+    token = request.headers.get('Authorization')
+    uid = verifica_token(token)
+    if not uid:
+        return jsonify({'message': 'Acces interzis'}), 401
+    
+    format_fisier = detecteaza_format(request.args.get('format'), request.content_type)
+    if not format_fisier:
+        return jsonify({'message': 'Format necunoscut (csv sau jsonl)'}), 400
+    
+    conn = get_db_connection()
+    try:
+        rezultat = importa_filme(conn, uid, request.stream, format_fisier)
+    except EroareImport as eroare:
+        return jsonify({'message': str(eroare)}), 400
+    
+    # Dupa un import, indexul de autocomplete este reconstruit la urmatoarea cautare
+    if rezultat['imported']:
+        index_titluri.invalideaza()
+    
+    return jsonify(rezultat), 200
+
+# Ruta pentru exportul bibliotecii de filme (CSV sau JSON Lines)
+@movie_bp.route('/movies/export', methods=['GET'])
+def export_movies():
+    """
+    Endpoint pentru exportul filmelor utilizatorului, generat direct din cursor
+    Query: format (csv sau jsonl, implicit csv)
+    """
+    # Verificam token ul de autentificare
+    token = request.headers.get('Authorization')
+    uid = verifica_token(token)
+    if not uid:
+        return jsonify({'message': 'Acces interzis'}), 401
+    
+    format_fisier = request.args.get('format', 'csv')
+    if format_fisier not in FORMATE:
+        return jsonify({'message': 'Format necunoscut (csv sau jsonl)'}), 400
+    
+    raspuns = Response(exporta_filme(uid, format_fisier), mimetype=FORMATE[format_fisier])
+    raspuns.headers['Content-Disposition'] = f'attachment; filename=movies.{format_fisier}'
+    return raspuns
+
 # Ruta pentru obtinerea username-ului utilizatorului curent
 @movie_bp.route('/user/username', methods=['GET'])
 def get_username():
@@ -1,7 +1,41 @@
 """
 Modul pentru gestionarea securitatii: token-uri si verificare autentificare
 """
+import hashlib
+import hmac
+import os
+import secrets
+import time
+from flask import g, has_request_context
 from models.database import get_db_connection
+from models.repository import id_utilizator
+from cache import CacheLRU, LIPSA
+
+# Prefixul token-urilor generate la login
+PREFIX_TOKEN = 'token_secret_pentru_'
+
+# Cache pentru rezolvarea token-urilor (username -> id utilizator)
+# Doar rezultatele pozitive sunt pastrate: un cont creat din alt proces (frontend
+# sau alt worker) nu poate invalida cache-ul acestui proces
+TTL_TOKEN = float(os.getenv('MOVIE_MANAGER_TOKEN_TTL', '300'))
+_cache_token = CacheLRU(dimensiune_maxima=int(os.getenv('MOVIE_MANAGER_TOKEN_CACHE', '4096')), ttl=TTL_TOKEN)
+
+def _rezolva_utilizator(nume_user):
+    """
+    Cauta id-ul utilizatorului, intai in cache, apoi in baza de date
+    """
+    id_user = _cache_token.obtine(nume_user)
+    if id_user is not LIPSA:
+        return id_user
+
+    baza = get_db_connection()
+
+    # Cautam utilizatorul in baza de date
+    id_user = id_utilizator(baza, nume_user)
+
+    if id_user:
+        _cache_token.seteaza(nume_user, id_user)
+    return id_user
 
 def verifica_token(text_header):
     """
@@ -14,19 +48,67 @@ def verifica_token(text_header):
     # Deocamdata, verificam doar daca token ul este valid
     if not text_header:
         return None
-    
+
+    # Daca token-ul a fost deja rezolvat in cererea curenta, il refolosim
+    if has_request_context():
+        rezolvat = g.get('token_rezolvat')
+        if rezolvat is not None and rezolvat[0] == text_header:
+            return rezolvat[1]
+
     # Luam numele utilizatorului din token
-    nume_user = text_header.replace('token_secret_pentru_', '')
-    baza = get_db_connection()
-    
-    # Cautam utilizatorul in baza de date
-    utilizator = baza.execute('SELECT id FROM users WHERE username = ?', (nume_user,)).fetchone()
-    baza.close()
-    
-    # Daca utilizatorul exista, returnam id ul acestuia
-    if utilizator:
-        return utilizator['id']
-    
-    # Altfel, returnam None
-    return None
+    nume_user = text_header.replace(PREFIX_TOKEN, '')
+    id_user = _rezolva_utilizator(nume_user)
+
+    if has_request_context():
+        g.token_rezolvat = (text_header, id_user)
+
+    # Returnam id ul utilizatorului sau None daca nu exista
+    return id_user
+
+# Token-uri pentru fluxul SSE
+# EventSource nu poate trimite header-e, asa ca token-ul ajunge in URL (si in log-urile de acces,
+# proxy-uri, istoricul browser-ului). In URL nu trimitem token-ul API, ci unul semnat (HMAC),
+# valabil DURATA_TOKEN_FLUX secunde si acceptat doar de /recommendations/stream.
+# Cheia trebuie sa fie aceeasi in toti worker-ii (serving.py o genereaza pentru ei); fara
+# MOVIE_MANAGER_STREAM_SECRET, fiecare proces foloseste o cheie aleatoare proprie.
+DURATA_TOKEN_FLUX = int(os.getenv('MOVIE_MANAGER_STREAM_TOKEN_TTL', '60'))
+_CHEIE_FLUX = (os.getenv('MOVIE_MANAGER_STREAM_SECRET') or secrets.token_hex(32)).encode()
 
+# Functie pentru semnatura unui token de flux
+def _semnatura_flux(continut):
+    return hmac.new(_CHEIE_FLUX, continut.encode(), hashlib.sha256).hexdigest()
+
+def emite_token_flux(id_user):
+    """
+    Returneaza un token de scurta durata pentru fluxul SSE al utilizatorului
+    """
+    continut = f'{int(id_user)}.{int(time.time()) + DURATA_TOKEN_FLUX}'
+    return f'{continut}.{_semnatura_flux(continut)}'
+
+def verifica_token_flux(token):
+    """
+    Verifica un token de flux (semnatura si expirarea)
+    Returns:
+        id-ul utilizatorului daca token-ul este valid, None altfel
+    """
+    parti = (token or '').split('.')
+    if len(parti) != 3 or not parti[0].isdigit() or not parti[1].isdigit():
+        return None
+    continut = f'{parti[0]}.{parti[1]}'
+    if not hmac.compare_digest(parti[2].encode(), _semnatura_flux(continut).encode()):
+        return None
+    if int(parti[1]) < time.time():
+        return None
+    return int(parti[0])
+
+def invalideaza_utilizator(nume_user):
+    """
+    Elimina din cache rezolvarea pentru un utilizator (la creare sau stergere)
+    """
+    _cache_token.invalideaza(nume_user)
+
+def statistici_cache_token():
+    """
+    Returneaza contoarele cache-ului de token-uri (hits, misses, evictions)
+    """
+    return _cache_token.statistici()
@@ -6,6 +6,8 @@ from flask import request, jsonify
 from werkzeug.security import generate_password_hash, check_password_hash
 import sqlite3
 from models.database import get_db_connection
+from models.repository import creeaza_utilizator, utilizator_dupa_nume
+from security import invalideaza_utilizator
 
 # Functie pentru procesarea inregistrarii unui utilizator nou
 def proceseaza_inregistrare():
@@ -38,8 +40,11 @@ def proceseaza_inregistrare():
         parola_criptata = generate_password_hash(parola)
         
         # Introducem datele in tabelul users
-        conn.execute('INSERT INTO users (username, password) VALUES (?, ?)', (nume, parola_criptata))
+        creeaza_utilizator(conn, nume, parola_criptata)
         conn.commit()
+
+        # Eliminam eventuala intrare veche din cache-ul de token-uri
+        invalideaza_utilizator(nume)
         return jsonify({"message": "User created"}), 201
     except sqlite3.IntegrityError:
         # Returnam eroare daca numele exista deja
@@ -47,9 +52,6 @@ def proceseaza_inregistrare():
     except Exception:
         # Returnam eroare pentru alte probleme
         return jsonify({"message": "Registration error"}), 400
-    finally:
-        # Inchidem conexiunea la baza de date
-        conn.close()
 
 # Functie pentru procesarea autentificarii unui utilizator
 def proceseaza_login():
@@ -75,8 +77,7 @@ def proceseaza_login():
     conn = get_db_connection()
     
     # Cautam utilizatorul in baza de date doar dupa username
-    user = conn.execute('SELECT * FROM users WHERE username = ?', (nume,)).fetchone()
-    conn.close()
+    user = utilizator_dupa_nume(conn, nume)
     
     # Verificam daca utilizatorul exista
     if user:
@@ -0,0 +1,168 @@
+"""
+Modul pentru catalogul local de show-uri (copie offline a datelor TVMaze)
+Catalogul este populat dintr-un fisier JSON cu show-uri TVMaze si indexat cu FTS5,
+astfel incat /api/search-movies poate raspunde fara acces la retea.
+
+Utilizare (din directorul backend):
+    python -m services.catalog import shows.json   # importa show-urile din fisier
+    python -m services.catalog search "the office"  # cauta in catalog
+"""
+import argparse
+import json
+import sys
+
+# Numarul de show-uri inserate intr-un singur executemany
+DIMENSIUNE_LOT = 1000
+
+# Functie pentru extragerea campurilor unui show TVMaze
+def _rand_show(item):
+    """
+    Transforma un obiect TVMaze (show simplu sau rezultat de cautare {'show': ...})
+    intr-un tuplu pentru tabelul catalog_shows
+    """
+    show = item.get('show', item)
+    if not show.get('id') or not show.get('name'):
+        return None
+    return (
+        int(show['id']),
+        show['name'],
+        show.get('premiered') or '',
+        show.get('type') or 'show',
+        show.get('image', {}).get('medium', '') if show.get('image') else ''
+    )
+
+# Functie pentru citirea show-urilor dintr-un fisier
+def _citeste_show_uri(cale_fisier):
+    """
+    Genereaza show-urile dintr-un fisier JSON (lista) sau JSON Lines (un show pe linie)
+    """
+    with open(cale_fisier, encoding='utf-8') as fisier:
+        inceput = fisier.read(1)
+        while inceput and inceput.isspace():
+            inceput = fisier.read(1)
+        fisier.seek(0)
+
+        if inceput == '[':
+            # Export TVMaze (/shows?page=N) sau rezultat de cautare: o lista JSON
+            yield from json.load(fisier)
+        else:
+            # JSON Lines: un obiect pe fiecare linie
+            for linie in fisier:
+                if linie.strip():
+                    yield json.loads(linie)
+
+# Functie pentru importul catalogului
+def importa_catalog(conn, cale_fisier):
+    """
+    Importa (sau actualizeaza) show-urile dintr-un fisier in catalogul local
+    Returns:
+        numarul de show-uri importate
+    """
+    instructiune = '''
+        INSERT OR REPLACE INTO catalog_shows (id, name, premiered, type, poster)
+        VALUES (?, ?, ?, ?, ?)
+    '''
+    total = 0
+    lot = []
+    try:
+        for item in _citeste_show_uri(cale_fisier):
+            rand = _rand_show(item)
+            if rand is None:
+                continue
+            lot.append(rand)
+            if len(lot) >= DIMENSIUNE_LOT:
+                conn.executemany(instructiune, lot)
+                total += len(lot)
+                lot = []
+        if lot:
+            conn.executemany(instructiune, lot)
+            total += len(lot)
+
+        # Reconstruim indexul FTS din tabelul de continut
+        conn.execute("INSERT INTO catalog_shows_fts (catalog_shows_fts) VALUES ('rebuild')")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return total
+
+# Functie pentru construirea interogarii FTS5
+def _interogare_fts(termen):
+    """
+    Transforma termenul intr-o interogare FTS5: fiecare cuvant devine un prefix
+    (ex. 'the off' -> '"the"* "off"*')
+    """
+    cuvinte = termen.split()
+    return ' '.join('"' + cuvant.replace('"', '""') + '"*' for cuvant in cuvinte)
+
+# Functie pentru cautarea in catalogul local
+def cauta_in_catalog(conn, termen, limita=10):
+    """
+    Cauta show-uri in catalogul local, ordonate dupa potrivirea numelui
+    (potrivirea exacta mai intai, apoi scorul bm25 din FTS5)
+    Returns:
+        dict de forma {'Response': 'True', 'Search': [...]}, la fel ca TVMaze
+    """
+    interogare = _interogare_fts(termen)
+    rezultate = {
+        'Response': 'True',
+        'Search': []
+    }
+    if not interogare:
+        return rezultate
+
+    randuri = conn.execute('''
+        SELECT s.id, s.name, s.premiered, s.type, s.poster
+        FROM catalog_shows_fts
+        INNER JOIN catalog_shows s ON s.id = catalog_shows_fts.rowid
+        WHERE catalog_shows_fts MATCH ?
+        ORDER BY lower(s.name) = lower(?) DESC, rank
+        LIMIT ?
+    ''', (interogare, termen, limita)).fetchall()
+
+    for rand in randuri:
+        rezultate['Search'].append({
+            'Title': rand['name'],
+            'Year': rand['premiered'][:4] if rand['premiered'] else 'N/A',
+            'Type': rand['type'],
+            'imdbID': str(rand['id']),
+            'Poster': rand['poster']
+        })
+
+    return rezultate
+
+# Functie pentru numarul de show-uri din catalog
+def dimensiune_catalog(conn):
+    """
+    Returneaza numarul de show-uri din catalogul local
+    """
+    return conn.execute('SELECT COUNT(*) FROM catalog_shows').fetchone()[0]
+
+# Punctul de intrare pentru linia de comanda
+def main(argumente=None):
+    from models.database import init_db, _creeaza_conexiune
+
+    parser = argparse.ArgumentParser(description='Catalogul local de show-uri')
+    subcomenzi = parser.add_subparsers(dest='comanda', required=True)
+    importa = subcomenzi.add_parser('import', help='importa show-uri TVMaze dintr-un fisier JSON / JSONL')
+    importa.add_argument('fisier')
+    cauta = subcomenzi.add_parser('search', help='cauta in catalog')
+    cauta.add_argument('termen')
+    args = parser.parse_args(argumente)
+
+    # Ne asiguram ca tabelele catalogului exista
+    init_db()
+    conn = _creeaza_conexiune()
+    try:
+        if args.comanda == 'import':
+            total = importa_catalog(conn, args.fisier)
+            print(f'Importate: {total} show-uri (total in catalog: {dimensiune_catalog(conn)})')
+        else:
+            for rezultat in cauta_in_catalog(conn, args.termen)['Search']:
+                print(f"{rezultat['imdbID']:>8}  {rezultat['Year']:>4}  {rezultat['Title']}")
+    finally:
+        conn.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
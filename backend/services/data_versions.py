@@ -0,0 +1,50 @@
+"""
+Modul pentru versiunile de date ale utilizatorilor si cererile conditionale (ETag)
+Tabelul user_versions este incrementat de triggere la fiecare modificare a filmelor,
+prietenilor sau recomandarilor primite de un utilizator (indiferent daca modificarea
+vine din backend sau din frontend). Un ETag derivat din versiune permite raspunsul
+304 Not Modified dupa o singura cautare in user_versions, fara a citi datele.
+"""
+import zlib
+from flask import request, make_response
+
+# Functie pentru citirea versiunii de date a unui utilizator
+def versiune_utilizator(conn, id_user):
+    """
+    Returneaza versiunea curenta a datelor utilizatorului (0 daca nu a modificat nimic)
+    """
+    rand = conn.execute('SELECT version FROM user_versions WHERE user_id = ?', (id_user,)).fetchone()
+    return rand['version'] if rand else 0
+
+# Functie pentru calcularea ETag-ului unei resurse
+def calculeaza_etag(resursa, id_user, versiune):
+    """
+    Construieste un ETag puternic din resursa, utilizator, versiune si query string
+    (pagini diferite ale aceleiasi resurse au ETag-uri diferite)
+    """
+    parametri = zlib.crc32(request.query_string)
+    return f'{resursa}-{id_user}-{versiune}-{parametri:08x}'
+
+# Functie pentru verificarea cererii conditionale
+def este_nemodificat(etag):
+    """
+    Verifica daca clientul are deja versiunea curenta (If-None-Match)
+    """
+    return request.if_none_match.contains(etag)
+
+# Functie pentru raspunsul 304 Not Modified
+def raspuns_nemodificat(etag):
+    """
+    Returneaza un raspuns 304 fara corp, cu ETag-ul curent
+    """
+    raspuns = make_response('', 304)
+    return cu_etag(raspuns, etag)
+
+# Functie pentru atasarea ETag-ului la un raspuns
+def cu_etag(raspuns, etag):
+    """
+    Ataseaza ETag-ul si cere clientului sa revalideze la fiecare folosire
+    """
+    raspuns.set_etag(etag)
+    raspuns.headers['Cache-Control'] = 'private, no-cache'
+    return raspuns
@@ -0,0 +1,161 @@
+"""
+Modul pentru sincronizarea incrementala a bibliotecii unui utilizator
+Triggerele scriu in tabelul changes fiecare insert/update/delete pe filmele si
+recomandarile primite ale unui utilizator, impreuna cu versiunea de date rezultata.
+Un client care are o copie locala la versiunea N cere doar ce s-a schimbat dupa N:
+entitatile care mai exista sunt trimise cu starea curenta, iar cele sterse ca id-uri.
+
+Jurnalul pastreaza doar ultimele MOVIE_MANAGER_CHANGES_KEEP versiuni ale fiecarui utilizator:
+randurile mai vechi sunt sterse periodic (curata_jurnalul). Un client ramas in urma cu mai
+mult de atatea versiuni primeste toata biblioteca ('full': True), nu un delta incomplet.
+"""
+import logging
+import os
+import threading
+import time
+from models.database import conexiune_din_pool
+from models.repository import tranzactie_citire
+from services.data_versions import versiune_utilizator
+
+# Numarul de id-uri dintr-o interogare IN (...)
+DIMENSIUNE_BUCATA = 500
+
+# Cate versiuni (cele mai noi) din jurnal sunt pastrate pentru fiecare utilizator
+VERSIUNI_PASTRATE = int(os.getenv('MOVIE_MANAGER_CHANGES_KEEP', '1000'))
+
+# Intervalul (secunde) dintre doua curatari ale jurnalului, in acelasi proces
+INTERVAL_CURATARE = float(os.getenv('MOVIE_MANAGER_CHANGES_PRUNE_INTERVAL', '3600'))
+
+logger = logging.getLogger('movie_manager.changes')
+
+# Starea curatarii periodice: o singura curatare la un moment dat
+_lock_curatare = threading.Lock()
+_ultima_curatare = None
+
+# Functie pentru stergerea randurilor vechi din jurnal
+def curata_jurnalul(conn, versiuni_pastrate=VERSIUNI_PASTRATE):
+    """
+    Sterge din changes randurile cu versiune <= versiunea curenta a utilizatorului - versiuni_pastrate
+    Orice since >= versiunea curenta - versiuni_pastrate are in continuare toate randurile
+    de care are nevoie, indiferent cand a rulat curatarea
+    Returns:
+        numarul de randuri sterse
+    """
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        sterse = conn.execute('''
+            DELETE FROM changes WHERE id IN (
+                SELECT c.id FROM user_versions v
+                INNER JOIN changes c ON c.user_id = v.user_id AND c.version <= v.version - ?
+            )
+        ''', (versiuni_pastrate,)).rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return sterse
+
+# Functie pentru curatarea periodica a jurnalului, in fundal
+def curata_periodic():
+    """
+    Porneste o curatare in fundal daca ultima a fost acum mai mult de INTERVAL_CURATARE
+    secunde (prima cerere din proces o porneste imediat); nu blocheaza niciodata cererea
+    """
+    if _ultima_curatare is not None and time.monotonic() - _ultima_curatare < INTERVAL_CURATARE:
+        return
+    if _lock_curatare.acquire(blocking=False):
+        threading.Thread(target=_curata, daemon=True, name='changes-prune').start()
+
+def _curata():
+    global _ultima_curatare
+    try:
+        with conexiune_din_pool() as conn:
+            sterse = curata_jurnalul(conn)
+        if sterse:
+            logger.info('Jurnal de modificari: %d randuri vechi sterse', sterse)
+    except Exception:
+        # Curatarea este reincercata la urmatorul interval
+        logger.exception('Curatarea jurnalului de modificari a esuat')
+    finally:
+        _ultima_curatare = time.monotonic()
+        _lock_curatare.release()
+
+# Functie pentru citirea randurilor curente pentru o lista de id-uri
+def _randuri_curente(conn, interogare, parametri, id_uri):
+    randuri = []
+    id_uri = list(id_uri)
+    for inceput in range(0, len(id_uri), DIMENSIUNE_BUCATA):
+        bucata = id_uri[inceput:inceput + DIMENSIUNE_BUCATA]
+        semne = ','.join('?' * len(bucata))
+        randuri += conn.execute(interogare.format(semne=semne), (*parametri, *bucata)).fetchall()
+    return randuri
+
+# Functie pentru serializarea unui film
+def _film(rand):
+    return {'id': rand['id'], 'title': rand['title'], 'status': rand['status'], 'rating': rand['rating'] if rand['rating'] else '-'}
+
+# Functie pentru serializarea unei recomandari
+def _recomandare(rand):
+    return {'id': rand['id'], 'movie_title': rand['movie_title'], 'from_username': rand['from_username']}
+
+# Functie pentru obtinerea modificarilor de la o versiune
+def modificari_de_la(conn, id_user, versiune):
+    """
+    Returneaza modificarile filmelor si recomandarilor utilizatorului dupa versiunea data
+    Pentru versiune 0, o versiune mai noua decat cea din baza de date (de exemplu dupa o
+    resetare) sau una mai veche decat fereastra pastrata in jurnal, returneaza toata
+    biblioteca, marcata cu 'full': True
+    Returns:
+        dict cu versiunea curenta, 'full' si, pentru 'movies' si 'recommendations',
+        listele 'upserted' (starea curenta) si 'deleted' (id-uri)
+    """
+    # Citim totul dintr-un singur snapshot (tranzactie de citire)
+    with tranzactie_citire(conn):
+        versiune_curenta = versiune_utilizator(conn, id_user)
+        complet = (versiune <= 0 or versiune > versiune_curenta
+                   or versiune < versiune_curenta - VERSIUNI_PASTRATE)
+
+        if complet:
+            filme = conn.execute('SELECT id, title, status, rating FROM movies WHERE user_id = ?', (id_user,)).fetchall()
+            recomandari = conn.execute('''
+                SELECT r.id, r.movie_title, u.username as from_username
+                FROM recommendations r
+                INNER JOIN users u ON r.from_user_id = u.id
+                WHERE r.to_user_id = ?
+            ''', (id_user,)).fetchall()
+            sterse_filme, sterse_recomandari = [], []
+        else:
+            # Entitatile atinse dupa versiunea clientului
+            atinse = conn.execute('''
+                SELECT DISTINCT entity, entity_id FROM changes
+                WHERE user_id = ? AND version > ?
+            ''', (id_user, versiune)).fetchall()
+            id_filme = {rand['entity_id'] for rand in atinse if rand['entity'] == 'movie'}
+            id_recomandari = {rand['entity_id'] for rand in atinse if rand['entity'] == 'recommendation'}
+
+            # Starea curenta a entitatilor atinse; cele care nu mai exista au fost sterse
+            filme = _randuri_curente(conn, '''
+                SELECT id, title, status, rating FROM movies
+                WHERE user_id = ? AND id IN ({semne})
+            ''', (id_user,), id_filme)
+            recomandari = _randuri_curente(conn, '''
+                SELECT r.id, r.movie_title, u.username as from_username
+                FROM recommendations r
+                INNER JOIN users u ON r.from_user_id = u.id
+                WHERE r.to_user_id = ? AND r.id IN ({semne})
+            ''', (id_user,), id_recomandari)
+            sterse_filme = sorted(id_filme - {rand['id'] for rand in filme})
+            sterse_recomandari = sorted(id_recomandari - {rand['id'] for rand in recomandari})
+
+    return {
+        'version': versiune_curenta,
+        'full': complet,
+        'movies': {
+            'upserted': [_film(rand) for rand in filme],
+            'deleted': sterse_filme
+        },
+        'recommendations': {
+            'upserted': [_recomandare(rand) for rand in recomandari],
+            'deleted': sterse_recomandari
+        }
+    }
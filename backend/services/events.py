@@ -0,0 +1,122 @@
+"""
+Modul pentru publicarea evenimentelor catre abonatii conectati (publish/subscribe in proces)
+Fiecare abonat are o coada marginita; un abonat lent nu blocheaza publicarea si nu
+consuma memorie nelimitata: cand coada lui se umple, ea este golita si abonatul este
+marcat ca desincronizat, urmand sa recupereze evenimentele pierdute din baza de date.
+"""
+import os
+import queue
+import threading
+
+# Numarul maxim de evenimente in asteptare pentru un abonat
+DIMENSIUNE_COADA = int(os.getenv('MOVIE_MANAGER_SSE_QUEUE', '64'))
+
+# Numarul maxim de abonati simultani (fiecare tine ocupat un thread al serverului)
+# In modul productie, serving.py il coboara sub numarul de thread-uri ale worker-ului
+MAXIM_ABONATI = int(os.getenv('MOVIE_MANAGER_SSE_MAX', '100'))
+
+class PreaMultiAbonati(Exception):
+    """
+    Limita de abonati simultani a fost atinsa
+    """
+
+class Abonament:
+    """
+    Coada de evenimente a unui singur abonat
+    """
+
+    def __init__(self, cheie, dimensiune=DIMENSIUNE_COADA):
+        self.cheie = cheie
+        self._coada = queue.Queue(maxsize=dimensiune)
+        self._lock = threading.Lock()
+        self.desincronizat = False
+
+    # Adauga un eveniment; daca coada este plina, o goleste si marcheaza abonatul
+    def _livreaza(self, eveniment):
+        try:
+            self._coada.put_nowait(eveniment)
+            return True
+        except queue.Full:
+            with self._lock:
+                while True:
+                    try:
+                        self._coada.get_nowait()
+                    except queue.Empty:
+                        break
+                self.desincronizat = True
+            return False
+
+    # Asteapta urmatorul eveniment; returneaza None daca nu a venit nimic in timeout secunde
+    def asteapta(self, timeout):
+        try:
+            return self._coada.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    # Returneaza si reseteaza indicatorul de desincronizare
+    def verifica_desincronizare(self):
+        with self._lock:
+            desincronizat = self.desincronizat
+            self.desincronizat = False
+            return desincronizat
+
+class HubEvenimente:
+    """
+    Distribuie evenimentele publicate pentru o cheie (de ex. id-ul unui utilizator)
+    tuturor abonatilor acelei chei
+    Este sigur pentru folosirea din mai multe thread-uri
+    """
+
+    def __init__(self, maxim_abonati=MAXIM_ABONATI):
+        self.maxim_abonati = maxim_abonati
+        self._abonati = {}
+        self._numar = 0
+        self._lock = threading.Lock()
+        self.publicate = 0
+        self.livrate = 0
+        self.pierdute = 0
+
+    # Creeaza un abonament pentru cheie
+    def aboneaza(self, cheie):
+        abonament = Abonament(cheie)
+        with self._lock:
+            if self._numar >= self.maxim_abonati:
+                raise PreaMultiAbonati()
+            self._abonati.setdefault(cheie, set()).add(abonament)
+            self._numar += 1
+        return abonament
+
+    # Elimina un abonament
+    def dezaboneaza(self, abonament):
+        with self._lock:
+            abonati = self._abonati.get(abonament.cheie)
+            if abonati is None or abonament not in abonati:
+                return
+            abonati.discard(abonament)
+            if not abonati:
+                del self._abonati[abonament.cheie]
+            self._numar -= 1
+
+    # Publica un eveniment catre toti abonatii cheii; nu blocheaza niciodata
+    def publica(self, cheie, eveniment):
+        with self._lock:
+            abonati = list(self._abonati.get(cheie, ()))
+            self.publicate += 1
+        livrate = sum(1 for abonament in abonati if abonament._livreaza(eveniment))
+        with self._lock:
+            self.livrate += livrate
+            self.pierdute += len(abonati) - livrate
+        return livrate
+
+    # Returneaza contoarele hub-ului
+    def statistici(self):
+        with self._lock:
+            return {
+                'subscribers': self._numar,
+                'published': self.publicate,
+                'delivered': self.livrate,
+                'dropped': self.pierdute
+            }
+
+# Hub-ul pentru recomandarile noi (cheia este id-ul destinatarului)
+hub_recomandari = HubEvenimente()
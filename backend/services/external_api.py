@@ -1,10 +1,121 @@
 """
 Modul pentru interogarea API-urilor externe (TVMaze pentru cautare filme)
 """
-import urllib.request
-import urllib.parse
-import json
+import os
 from flask import request, jsonify
+from cache import CacheLRU, LIPSA, SingleFlight
+from models.database import get_db_connection
+from services.catalog import cauta_in_catalog
+from services.http_pool import PoolConexiuniHTTP
+from services.title_index import sugereaza, LIMITA_IMPLICITA
+
+# Sursa rezultatelor pentru cautare:
+#   'tvmaze' - doar API-ul TVMaze (implicit)
+#   'local'  - doar catalogul local (fara retea)
+#   'auto'   - catalogul local, iar daca nu are rezultate, TVMaze
+SURSA_CAUTARE = os.getenv('MOVIE_MANAGER_SEARCH_BACKEND', 'tvmaze')
+
+# Cache pentru rezultatele cautarilor, cheia fiind termenul normalizat
+# Rezultatele goale sunt pastrate si ele (negative caching), dar pentru mai putin timp
+TTL_CAUTARE = float(os.getenv('MOVIE_MANAGER_SEARCH_TTL', '600'))
+TTL_CAUTARE_GOALA = float(os.getenv('MOVIE_MANAGER_SEARCH_TTL_GOL', '60'))
+_cache_cautari = CacheLRU(dimensiune_maxima=int(os.getenv('MOVIE_MANAGER_SEARCH_CACHE', '2048')), ttl=TTL_CAUTARE)
+
+# Conexiuni keep-alive catre TVMaze, refolosite intre cautari
+URL_TVMAZE = os.getenv('MOVIE_MANAGER_TVMAZE_URL', 'http://api.tvmaze.com')
+_pool_tvmaze = PoolConexiuniHTTP(URL_TVMAZE, dimensiune=int(os.getenv('MOVIE_MANAGER_TVMAZE_POOL', '8')), timeout=5)
+
+# Cautarile identice concurente asteapta un singur apel catre sursa
+_cautari_in_curs = SingleFlight()
+
+# Functie pentru normalizarea termenului de cautare (cheia din cache)
+def normalizeaza_termen(termen):
+    """
+    Normalizeaza termenul de cautare: fara spatii la capete, litere mici,
+    spatiile multiple reduse la unul singur
+    """
+    return ' '.join(termen.split()).lower()
+
+# Functie pentru cautarea pe TVMaze (fara cache)
+def _cauta_tvmaze(termen):
+    """
+    Cauta pe TVMaze si transforma rezultatul in formatul folosit de frontend
+    Returns:
+        dict de forma {'Response': 'True', 'Search': [...]}
+    """
+    # Facem request catre TVMaze API (gratuit, fara cheie necesara)
+    # TVMaze API returneaza filme, seriale, show-uri TV, etc.
+    # Request-ul foloseste o conexiune keep-alive din pool
+    data = _pool_tvmaze.get_json('/search/shows', {'q': termen})
+
+    # Transformam rezultatul TVMaze in format compatibil cu codul existent
+    # TVMaze returneaza o lista de obiecte cu 'show' in interior
+    formatted_results = {
+        'Response': 'True',
+        'Search': []
+    }
+
+    # Extragem informatiile relevante din fiecare rezultat
+    for item in data:
+        show = item.get('show', {})
+        formatted_results['Search'].append({
+            'Title': show.get('name', 'Unknown'),
+            'Year': show.get('premiered', '')[:4] if show.get('premiered') else 'N/A',
+            'Type': show.get('type', 'show'),
+            'imdbID': str(show.get('id', '')),
+            'Poster': show.get('image', {}).get('medium', '') if show.get('image') else ''
+        })
+
+    return formatted_results
+
+# Functie pentru cautarea in sursa configurata
+def _cauta_in_sursa(termen):
+    """
+    Cauta termenul in catalogul local si/sau pe TVMaze, in functie de SURSA_CAUTARE
+    """
+    if SURSA_CAUTARE in ('local', 'auto'):
+        rezultat = cauta_in_catalog(get_db_connection(), termen)
+        if rezultat['Search'] or SURSA_CAUTARE == 'local':
+            return rezultat
+    return _cauta_tvmaze(termen)
+
+# Functie pentru cautare cu cache
+def cauta(termen):
+    """
+    Returneaza rezultatele pentru termen, din cache daca exista
+    Erorile de retea nu sunt salvate in cache (exceptia este propagata)
+    """
+    cheie = normalizeaza_termen(termen)
+    rezultat = _cache_cautari.obtine(cheie)
+    if rezultat is not LIPSA:
+        return rezultat
+
+    # Cererile concurente pentru acelasi termen asteapta un singur apel
+    return _cautari_in_curs.executa(cheie, lambda: _cauta_si_salveaza(cheie))
+
+# Functie pentru cautarea in sursa si salvarea rezultatului in cache
+def _cauta_si_salveaza(cheie):
+    """
+    Cauta in sursa configurata si salveaza rezultatul in cache
+    """
+    # Un apel anterior s-ar fi putut termina intre verificarea cache-ului si acest punct
+    rezultat = _cache_cautari.obtine(cheie)
+    if rezultat is not LIPSA:
+        return rezultat
+
+    rezultat = _cauta_in_sursa(cheie)
+    ttl = TTL_CAUTARE if rezultat['Search'] else TTL_CAUTARE_GOALA
+    _cache_cautari.seteaza(cheie, rezultat, ttl=ttl)
+    return rezultat
+
+# Functie pentru statisticile cache-ului de cautari
+def statistici_cache_cautari():
+    """
+    Returneaza contoarele cache-ului de cautari (hits, misses, evictions)
+    """
+    statistici = _cache_cautari.statistici()
+    statistici['upstream'] = _cautari_in_curs.statistici()
+    return statistici
 
 # Functie pentru cautarea filmelor, serialelor si show-urilor TV pe TVMaze API
 def search_movies():
@@ -15,44 +126,32 @@ def search_movies():
     """
     # Preluam termenul de cautare din query string
     search_term = request.args.get('s', '')
-    
+
     # Verificam daca termenul de cautare a fost trimis
     if not search_term or not search_term.strip():
         return jsonify({'Response': 'False', 'Error': 'Search term required'}), 400
-    
+
     try:
-        # Facem request catre TVMaze API (gratuit, fara cheie necesara)
-        # TVMaze API returneaza filme, seriale, show-uri TV, etc.
-        search_params = urllib.parse.urlencode({
-            'q': search_term.strip()
-        })
-        tvmaze_url = f'http://api.tvmaze.com/search/shows?{search_params}'
-        
-        # Facem request-ul HTTP
-        with urllib.request.urlopen(tvmaze_url, timeout=5) as response:
-            data = json.loads(response.read().decode())
-        
-        # Transformam rezultatul TVMaze in format compatibil cu codul existent
-        # TVMaze returneaza o lista de obiecte cu 'show' in interior
-        formatted_results = {
-            'Response': 'True',
-            'Search': []
-        }
-        
-        # Extragem informatiile relevante din fiecare rezultat
-        for item in data:
-            show = item.get('show', {})
-            formatted_results['Search'].append({
-                'Title': show.get('name', 'Unknown'),
-                'Year': show.get('premiered', '')[:4] if show.get('premiered') else 'N/A',
-                'Type': show.get('type', 'show'),
-                'imdbID': str(show.get('id', '')),
-                'Poster': show.get('image', {}).get('medium', '') if show.get('image') else ''
-            })
-        
         # Returnam rezultatul formatat
-        return jsonify(formatted_results), 200
+        return jsonify(cauta(search_term)), 200
     except Exception as e:
         # In caz de eroare, returnam mesaj de eroare
         return jsonify({'Response': 'False', 'Error': 'Error searching movies'}), 500
 
+# Functie pentru sugestiile de autocomplete dupa prefix
+def suggest_movies():
+    """
+    Returneaza titlurile cunoscute (din listele utilizatorilor si din catalogul local)
+    care incep cu prefixul dat, din indexul in memorie
+    Returns:
+        JSON response cu lista de sugestii
+    """
+    prefix = request.args.get('prefix', '')
+    limita = request.args.get('limit', LIMITA_IMPLICITA, type=int)
+
+    # Verificam daca prefixul a fost trimis
+    if not prefix or not prefix.strip():
+        return jsonify({'message': 'Prefix required'}), 400
+
+    sugestii = sugereaza(get_db_connection(), prefix, limita)
+    return jsonify({'prefix': prefix, 'suggestions': sugestii}), 200
@@ -0,0 +1,63 @@
+"""
+Modul pentru interogarea grafului de prieteni
+Prieteniile sunt salvate in ambele directii (add_friend insereaza (a, b) si (b, a)),
+asa ca toate cautarile pornesc doar din directia user_id = ?, care foloseste
+indexul unic pe friends (user_id, friend_id).
+"""
+
+# Numarul implicit si maxim de prieteni returnati pe o pagina
+LIMITA_IMPLICITA = 50
+LIMITA_MAXIMA = 500
+
+# Functie pentru obtinerea listei de prieteni
+def lista_prieteni(conn, id_user):
+    """
+    Returneaza username-urile tuturor prietenilor utilizatorului
+    """
+    prieteni = conn.execute('''
+        SELECT u.username
+        FROM friends f
+        INNER JOIN users u ON u.id = f.friend_id
+        WHERE f.user_id = ?
+        ORDER BY f.friend_id
+    ''', (id_user,)).fetchall()
+
+    return [prieten['username'] for prieten in prieteni]
+
+# Functie pentru obtinerea unei pagini din lista de prieteni
+def pagina_prieteni(conn, id_user, limita=LIMITA_IMPLICITA, dupa=0):
+    """
+    Returneaza o pagina de prieteni, ordonata dupa id-ul prietenului
+    Args:
+        limita: numarul maxim de prieteni din pagina
+        dupa: id-ul ultimului prieten din pagina anterioara (0 pentru prima pagina)
+    Returns:
+        (lista de username-uri, cursorul pentru pagina urmatoare sau None)
+    """
+    limita = max(1, min(limita, LIMITA_MAXIMA))
+
+    # Cerem un rand in plus ca sa stim daca mai exista o pagina
+    randuri = conn.execute('''
+        SELECT f.friend_id, u.username
+        FROM friends f
+        INNER JOIN users u ON u.id = f.friend_id
+        WHERE f.user_id = ? AND f.friend_id > ?
+        ORDER BY f.friend_id
+        LIMIT ?
+    ''', (id_user, dupa, limita + 1)).fetchall()
+
+    urmator = None
+    if len(randuri) > limita:
+        randuri = randuri[:limita]
+        urmator = randuri[-1]['friend_id']
+
+    return [rand['username'] for rand in randuri], urmator
+
+# Functie pentru verificarea prieteniei
+def sunt_prieteni(conn, id_user, id_prieten):
+    """
+    Verifica daca doi utilizatori sunt prieteni (o singura cautare in index)
+    """
+    rand = conn.execute('SELECT 1 FROM friends WHERE user_id = ? AND friend_id = ?',
+                        (id_user, id_prieten)).fetchone()
+    return rand is not None
@@ -0,0 +1,94 @@
+"""
+Modul pentru conexiuni HTTP keep-alive catre un serviciu extern
+Conexiunile sunt pastrate intr-un pool si refolosite intre cereri,
+in loc sa deschidem o conexiune TCP noua la fiecare apel.
+"""
+import http.client
+import json
+import queue
+import urllib.parse
+
+class EroareHTTP(Exception):
+    """
+    Raspuns HTTP cu status diferit de 2xx de la serviciul extern
+    """
+
+    def __init__(self, status, motiv):
+        super().__init__(f'HTTP {status} {motiv}')
+        self.status = status
+
+class PoolConexiuniHTTP:
+    """
+    Pool de conexiuni HTTP/1.1 persistente catre o singura gazda
+    """
+
+    def __init__(self, url_baza, dimensiune=8, timeout=5):
+        parti = urllib.parse.urlsplit(url_baza)
+        self.schema = parti.scheme or 'http'
+        self.gazda = parti.hostname
+        self.port = parti.port
+        self.prefix = parti.path.rstrip('/')
+        self.timeout = timeout
+        self._inactive = queue.LifoQueue(maxsize=dimensiune)
+
+    # Deschide o conexiune noua (TCP-ul se stabileste la prima cerere)
+    def _conexiune_noua(self):
+        clasa = http.client.HTTPSConnection if self.schema == 'https' else http.client.HTTPConnection
+        return clasa(self.gazda, self.port, timeout=self.timeout)
+
+    # Ia o conexiune inactiva din pool sau creeaza una noua
+    def _ia(self):
+        try:
+            return self._inactive.get_nowait(), True
+        except queue.Empty:
+            return self._conexiune_noua(), False
+
+    # Pune conexiunea inapoi in pool (sau o inchide daca pool-ul este plin)
+    def _elibereaza(self, conn):
+        try:
+            self._inactive.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    # Face o cerere GET si returneaza corpul raspunsului decodat ca JSON
+    def get_json(self, cale, parametri=None):
+        url = self.prefix + cale
+        if parametri:
+            url += '?' + urllib.parse.urlencode(parametri)
+
+        conn, refolosita = self._ia()
+        try:
+            try:
+                conn.request('GET', url, headers={'Accept': 'application/json'})
+                raspuns = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Serverul a inchis conexiunea keep-alive intre timp: reincercam o data
+                conn.close()
+                if not refolosita:
+                    raise
+                conn = self._conexiune_noua()
+                conn.request('GET', url, headers={'Accept': 'application/json'})
+                raspuns = conn.getresponse()
+
+            # Citim tot corpul, altfel conexiunea nu poate fi refolosita
+            corp = raspuns.read()
+        except Exception:
+            conn.close()
+            raise
+
+        if raspuns.will_close:
+            conn.close()
+        else:
+            self._elibereaza(conn)
+
+        if raspuns.status < 200 or raspuns.status >= 300:
+            raise EroareHTTP(raspuns.status, raspuns.reason)
+        return json.loads(corp.decode())
+
+    # Inchide toate conexiunile inactive
+    def inchide(self):
+        while True:
+            try:
+                self._inactive.get_nowait().close()
+            except queue.Empty:
+                return
@@ -0,0 +1,153 @@
+"""
+Modul pentru importul si exportul bibliotecii de filme (CSV si JSON Lines), in streaming
+Importul citeste corpul cererii rand cu rand si insereaza in loturi (executemany, cate un
+commit per lot), iar exportul genereaza randurile direct dintr-un cursor. In ambele
+directii memoria folosita nu depinde de dimensiunea bibliotecii.
+
+Format CSV: antet cu coloana title si, optional, status si rating
+Format JSON Lines: un obiect {"title": ..., "status": ..., "rating": ...} pe fiecare linie
+"""
+import csv
+import io
+import json
+from models.database import conexiune_din_pool
+from models.repository import STATUSURI_VALIDE, aplica_operatii_filme, cursor_filme, tranzactie_citire
+
+# Numarul de filme inserate (sau exportate) intr-un singur lot
+DIMENSIUNE_LOT = 1000
+
+# Numarul maxim de erori detaliate in raspunsul importului
+MAXIM_ERORI = 20
+
+# Formatele acceptate si tipurile MIME corespunzatoare
+FORMATE = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+class EroareImport(ValueError):
+    """
+    Fisierul importat nu poate fi citit (antet lipsa, codare sau sintaxa invalida)
+    """
+
+# Functie pentru alegerea formatului unei cereri
+def detecteaza_format(format_cerut, tip_continut):
+    """
+    Returneaza 'csv' sau 'jsonl' din parametrul format sau din Content-Type, altfel None
+    """
+    if format_cerut:
+        return format_cerut if format_cerut in FORMATE else None
+    tip_continut = (tip_continut or '').split(';')[0].strip().lower()
+    if tip_continut in ('text/csv', 'application/csv'):
+        return 'csv'
+    if tip_continut in ('application/x-ndjson', 'application/jsonl', 'application/json-lines'):
+        return 'jsonl'
+    return None
+
+# Functie pentru citirea randurilor CSV
+def _randuri_csv(text):
+    # strict: ghilimele neinchise sunt o eroare, nu un titlu care inghite restul fisierului
+    cititor = csv.DictReader(text, strict=True)
+    if not cititor.fieldnames or 'title' not in cititor.fieldnames:
+        raise EroareImport('Antetul CSV trebuie sa contina coloana title')
+    for rand in cititor:
+        yield cititor.line_num, rand
+
+# Functie pentru citirea randurilor JSON Lines
+def _randuri_jsonl(text):
+    for numar, linie in enumerate(text, start=1):
+        if not linie.strip():
+            continue
+        try:
+            yield numar, json.loads(linie)
+        except ValueError:
+            yield numar, None
+
+# Functie pentru validarea unui rand importat
+def _film_importat(rand):
+    """
+    Returns:
+        (title, status, rating) sau mesajul de eroare (str)
+    """
+    if not isinstance(rand, dict):
+        return 'Rand invalid'
+    titlu = rand.get('title')
+    if not isinstance(titlu, str) or not titlu.strip():
+        return 'Titlul este obligatoriu'
+    status = rand.get('status') or 'To Watch'
+    if status not in STATUSURI_VALIDE:
+        return 'Status invalid'
+    nota = rand.get('rating')
+    nota = '-' if nota is None or str(nota).strip() == '' else str(nota).strip()
+    return titlu, status, nota
+
+# Functie pentru importul filmelor dintr-un flux
+def importa_filme(conn, id_user, flux, format_fisier):
+    """
+    Importa filmele dintr-un flux binar (de ex. request.stream), lot cu lot
+    Fiecare lot este inserat cu executemany si salvat cu un commit propriu
+    Returns:
+        dict cu numarul de filme importate, de randuri ignorate si primele erori
+    Raises:
+        EroareImport daca fisierul nu poate fi citit (loturile anterioare raman salvate)
+    """
+    # utf-8-sig elimina BOM-ul pus de unele programe de calcul tabelar
+    text = io.TextIOWrapper(flux, encoding='utf-8-sig', newline='')
+    randuri = _randuri_csv(text) if format_fisier == 'csv' else _randuri_jsonl(text)
+
+    rezultat = {'imported': 0, 'skipped': 0, 'errors': []}
+    lot = []
+    try:
+        for numar, rand in randuri:
+            film = _film_importat(rand)
+            if isinstance(film, str):
+                rezultat['skipped'] += 1
+                if len(rezultat['errors']) < MAXIM_ERORI:
+                    rezultat['errors'].append({'line': numar, 'message': film})
+                continue
+            lot.append((id_user, *film))
+            if len(lot) >= DIMENSIUNE_LOT:
+                aplica_operatii_filme(conn, adaugari=lot)
+                conn.commit()
+                rezultat['imported'] += len(lot)
+                lot = []
+        if lot:
+            aplica_operatii_filme(conn, adaugari=lot)
+            conn.commit()
+            rezultat['imported'] += len(lot)
+    except (UnicodeDecodeError, csv.Error) as eroare:
+        conn.rollback()
+        raise EroareImport(f'Fisier invalid: {eroare}')
+    finally:
+        # Fluxul cererii ramane deschis (il inchide serverul)
+        text.detach()
+    return rezultat
+
+# Functie pentru formatarea unui lot de randuri
+def _formateaza_lot(randuri, format_fisier):
+    if format_fisier == 'jsonl':
+        return ''.join(
+            json.dumps({'title': rand['title'], 'status': rand['status'], 'rating': rand['rating'] or '-'}) + '\n'
+            for rand in randuri
+        )
+    buffer = io.StringIO()
+    scriitor = csv.writer(buffer, lineterminator='\n')
+    scriitor.writerows((rand['title'], rand['status'], rand['rating'] or '-') for rand in randuri)
+    return buffer.getvalue()
+
+# Generator pentru exportul filmelor
+def exporta_filme(id_user, format_fisier):
+    """
+    Genereaza biblioteca utilizatorului in formatul cerut, lot cu lot, direct din cursor
+    Foloseste o conexiune proprie din pool (raspunsul este trimis dupa terminarea cererii)
+    si o tranzactie de citire, deci exportul este un snapshot consistent
+    """
+    if format_fisier == 'csv':
+        yield 'title,status,rating\n'
+    with conexiune_din_pool() as conn, tranzactie_citire(conn):
+        cursor = cursor_filme(conn, id_user)
+        while True:
+            randuri = cursor.fetchmany(DIMENSIUNE_LOT)
+            if not randuri:
+                return
+            yield _formateaza_lot(randuri, format_fisier)
@@ -0,0 +1,187 @@
+"""
+Modul pentru paginarea listelor dupa cheie (keyset pagination)
+Filmele sunt parcurse in ordinea (status, title, id), iar recomandarile in ordinea
+descrescatoare a id-ului. Cursorul este un token opac cu ultima cheie din pagina,
+astfel incat fiecare pagina este o cautare in index, indiferent cat de departe
+este in lista (fara OFFSET). Un status sau titlu NULL este pastrat in cursor ca null
+si este ordonat inaintea oricarei valori, ca in ORDER BY din SQLite.
+"""
+import base64
+import json
+
+# Numarul implicit si maxim de elemente dintr-o pagina
+LIMITA_IMPLICITA = 100
+LIMITA_MAXIMA = 1000
+
+class CursorInvalid(ValueError):
+    """
+    Cursorul primit de la client nu poate fi decodat
+    """
+
+# Functie pentru codificarea unui cursor
+def encodeaza_cursor(cheie):
+    """
+    Transforma cheia ultimului element intr-un token opac (base64url)
+    """
+    text = json.dumps(cheie, separators=(',', ':'))
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip('=')
+
+# Functie pentru decodificarea unui cursor
+def decodeaza_cursor(token):
+    """
+    Transforma token-ul primit inapoi in cheie (lista)
+    """
+    try:
+        text = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        cheie = json.loads(text)
+    except Exception:
+        raise CursorInvalid('Cursor invalid')
+    if not isinstance(cheie, list):
+        raise CursorInvalid('Cursor invalid')
+    return cheie
+
+# Functie pentru validarea unui id din cursor (intreg SQLite pe 64 de biti)
+def _este_id(valoare):
+    return isinstance(valoare, int) and not isinstance(valoare, bool) and -2 ** 63 <= valoare < 2 ** 63
+
+# Functie pentru validarea unei chei text din cursor (NULL in baza de date este null in cursor)
+def _este_text(valoare):
+    return valoare is None or isinstance(valoare, str)
+
+# Functie pentru conditia "dupa cheie" in ordinea SQLite (NULL inaintea oricarei valori)
+def _conditie_dupa(coloane, valori):
+    """
+    Construieste conditia (c1, c2, ...) > (v1, v2, ...) pentru ORDER BY c1, c2, ...
+    Fara valori NULL, comparatia pe randuri poate fi cautata direct in index; o valoare NULL
+    in cursor nu poate fi comparata cu > sau =, asa ca este tratata explicit
+    Returns:
+        (textul SQL, lista de parametri)
+    """
+    if None not in valori:
+        return f"({', '.join(coloane)}) > ({', '.join('?' * len(valori))})", list(valori)
+    coloana, valoare = coloane[0], valori[0]
+    if len(coloane) == 1:
+        return f'{coloana} IS NOT NULL', []
+    rest, parametri = _conditie_dupa(coloane[1:], valori[1:])
+    if valoare is None:
+        return f'({coloana} IS NOT NULL OR ({coloana} IS NULL AND {rest}))', parametri
+    return f'({coloana} > ? OR ({coloana} = ? AND {rest}))', [valoare, valoare, *parametri]
+
+# Functie pentru limitarea dimensiunii paginii
+def limiteaza(limita):
+    """
+    Aduce dimensiunea paginii in intervalul [1, LIMITA_MAXIMA]
+    """
+    return max(1, min(limita, LIMITA_MAXIMA))
+
+# Functie pentru obtinerea unei pagini de filme
+def pagina_filme(conn, id_user, limita=LIMITA_IMPLICITA, cursor=None):
+    """
+    Returneaza o pagina de filme ale utilizatorului, ordonate dupa (status, title, id)
+    Returns:
+        (lista de randuri, cursorul pentru pagina urmatoare sau None)
+    """
+    limita = limiteaza(limita)
+
+    # Cerem un rand in plus ca sa stim daca mai exista o pagina
+    if cursor is None:
+        randuri = conn.execute('''
+            SELECT id, title, status, rating FROM movies
+            WHERE user_id = ?
+            ORDER BY status, title, id
+            LIMIT ?
+        ''', (id_user, limita + 1)).fetchall()
+    else:
+        cheie = decodeaza_cursor(cursor)
+        if len(cheie) != 3 or not _este_text(cheie[0]) or not _este_text(cheie[1]) or not _este_id(cheie[2]):
+            raise CursorInvalid('Cursor invalid')
+        conditie, parametri = _conditie_dupa(('status', 'title', 'id'), cheie)
+        randuri = conn.execute(f'''
+            SELECT id, title, status, rating FROM movies
+            WHERE user_id = ? AND {conditie}
+            ORDER BY status, title, id
+            LIMIT ?
+        ''', (id_user, *parametri, limita + 1)).fetchall()
+
+    urmator = None
+    if len(randuri) > limita:
+        randuri = randuri[:limita]
+        ultim = randuri[-1]
+        urmator = encodeaza_cursor([ultim['status'], ultim['title'], ultim['id']])
+    return randuri, urmator
+
+# Functie pentru parcurgerea tuturor filmelor, pagina cu pagina
+def itereaza_filme(conn, id_user, dimensiune_pagina=LIMITA_IMPLICITA):
+    """
+    Genereaza filmele utilizatorului in ordinea (status, title, id),
+    citind cate o pagina din baza de date doar cand este nevoie
+    """
+    cursor = None
+    while True:
+        randuri, cursor = pagina_filme(conn, id_user, dimensiune_pagina, cursor)
+        yield from randuri
+        if cursor is None:
+            return
+
+# Functie pentru gruparea filmelor pe liste
+def grupeaza_pe_liste(randuri, rating_lipsa='-'):
+    """
+    Organizeaza randurile (id, title, status, rating) pe liste (To Watch, Watching, Completed)
+    Args:
+        rating_lipsa: valoarea folosita pentru filmele fara nota
+    """
+    liste = {'To Watch': [], 'Watching': [], 'Completed': []}
+    for rand in randuri:
+        if rand['status'] in liste:
+            rating = rand['rating'] if rand['rating'] and rand['rating'] != '-' else rating_lipsa
+            liste[rand['status']].append({
+                'id': rand['id'],
+                'title': rand['title'],
+                'rating': rating
+            })
+    return liste
+
+# Functie pentru obtinerea unei pagini de recomandari
+def pagina_recomandari(conn, id_user, limita=LIMITA_IMPLICITA, cursor=None):
+    """
+    Returneaza o pagina de recomandari primite, de la cea mai noua la cea mai veche
+    Returns:
+        (lista de randuri, cursorul pentru pagina urmatoare sau None)
+    """
+    limita = limiteaza(limita)
+
+    if cursor is None:
+        # Fara cursor: pornim de la cel mai mare id posibil
+        ultimul_id = 2 ** 63 - 1
+    else:
+        cheie = decodeaza_cursor(cursor)
+        if len(cheie) != 1 or not _este_id(cheie[0]):
+            raise CursorInvalid('Cursor invalid')
+        ultimul_id = cheie[0]
+
+    randuri = conn.execute('''
+        SELECT r.id, r.movie_title, u.username as from_username
+        FROM recommendations r
+        INNER JOIN users u ON r.from_user_id = u.id
+        WHERE r.to_user_id = ? AND r.id < ?
+        ORDER BY r.id DESC
+        LIMIT ?
+    ''', (id_user, ultimul_id, limita + 1)).fetchall()
+
+    urmator = None
+    if len(randuri) > limita:
+        randuri = randuri[:limita]
+        urmator = encodeaza_cursor([randuri[-1]['id']])
+    return randuri, urmator
+
+# Functie pentru parcurgerea tuturor recomandarilor, pagina cu pagina
+def itereaza_recomandari(conn, id_user, dimensiune_pagina=LIMITA_IMPLICITA):
+    """
+    Genereaza recomandarile primite, citind cate o pagina doar cand este nevoie
+    """
+    cursor = None
+    while True:
+        randuri, cursor = pagina_recomandari(conn, id_user, dimensiune_pagina, cursor)
+        yield from randuri
+        if cursor is None:
+            return
@@ -0,0 +1,113 @@
+"""
+Modul pentru fluxul Server-Sent Events cu recomandarile primite
+recommend_movie publica fiecare recomandare noua in hub_recomandari, iar fiecare client
+conectat o primeste imediat, fara sa mai interogheze tabelul recommendations.
+Recomandarile scrise din alt proces (frontend-ul sau alt worker in modul productie) sunt
+prinse prin baza de date, canalul comun tuturor proceselor: la fiecare MOVIE_MANAGER_SSE_POLL
+secunde se verifica versiunea de date a utilizatorului (o cautare in user_versions), iar daca
+s-a schimbat se citesc doar recomandarile cu id mai mare decat ultimul trimis.
+"""
+import json
+import os
+import time
+from models.database import conexiune_din_pool
+from models.repository import recomandari_dupa
+from services.data_versions import versiune_utilizator
+from services.events import hub_recomandari
+
+# Intervalul (secunde) dintre doua mesaje keep-alive, cand nu exista evenimente
+INTERVAL_HEARTBEAT = float(os.getenv('MOVIE_MANAGER_SSE_HEARTBEAT', '15'))
+
+# Intervalul (secunde) la care se verifica recomandarile scrise din alte procese
+# (serving.py il micsoreaza cand exista mai multi worker-i)
+INTERVAL_VERIFICARE = min(INTERVAL_HEARTBEAT, float(os.getenv('MOVIE_MANAGER_SSE_POLL', str(INTERVAL_HEARTBEAT))))
+
+# Intervalul (milisecunde) dupa care browserul se reconecteaza
+INTERVAL_RECONECTARE = 3000
+
+# Dupa cate secunde poate reincerca un client respins (prea multe fluxuri deschise)
+ASTEPTARE_PREA_MULTE_FLUXURI = 30
+
+# Functie pentru publicarea unei recomandari noi
+def publica_recomandare(id_destinatar, id_recomandare, titlu, nume_expeditor):
+    """
+    Trimite recomandarea tuturor fluxurilor deschise ale destinatarului
+    """
+    hub_recomandari.publica(id_destinatar, {
+        'id': id_recomandare,
+        'movie_title': titlu,
+        'from_username': nume_expeditor
+    })
+
+# Functie pentru formatarea unui eveniment SSE
+def _eveniment_sse(recomandare):
+    return f"event: recommendation\ndata: {json.dumps(recomandare)}\n\n"
+
+# Functie pentru citirea din baza de date a recomandarilor netrimise
+def _din_baza(id_user, dupa_id):
+    """
+    Returns:
+        (versiunea curenta a datelor, recomandarile cu id > dupa_id)
+    """
+    with conexiune_din_pool() as conn:
+        versiune = versiune_utilizator(conn, id_user)
+        randuri = recomandari_dupa(conn, id_user, dupa_id)
+    return versiune, [
+        {'id': rand['id'], 'movie_title': rand['movie_title'], 'from_username': rand['from_username']}
+        for rand in randuri
+    ]
+
+# Generatorul fluxului de evenimente pentru un abonat
+def flux_recomandari(abonament, id_user, ultimul_id, versiune, recupereaza=False):
+    """
+    Genereaza mesajele SSE pentru recomandarile primite de utilizator
+    Id-ul SSE (Last-Event-ID la reconectare) este cel mai mare id pana la care toate
+    recomandarile au fost trimise; id-urile nu sosesc neaparat in ordine (recomandarile
+    din alt proces sunt citite din baza de date), asa ca o reconectare poate retrimite
+    cateva recomandari, pe care clientul le recunoaste dupa id
+    Args:
+        abonament: abonamentul din hub_recomandari (eliberat la inchiderea fluxului)
+        ultimul_id: toate recomandarile cu id <= ultimul_id sunt deja la client
+        versiune: versiunea de date a utilizatorului la deschiderea fluxului
+        recupereaza: trimite intai recomandarile cu id > ultimul_id (reconectare)
+    """
+    # confirmat: toate recomandarile cu id <= confirmat au fost trimise
+    # trimise: id-urile mai mari decat confirmat, trimise deja din hub
+    confirmat, trimise = ultimul_id, set()
+    ultimul_mesaj = time.monotonic()
+    try:
+        yield f'retry: {INTERVAL_RECONECTARE}\nid: {confirmat}\n\n'
+        citeste_din_baza = recupereaza
+        while True:
+            if citeste_din_baza:
+                versiune, recomandari = _din_baza(id_user, confirmat)
+                for recomandare in recomandari:
+                    if recomandare['id'] not in trimise:
+                        yield _eveniment_sse(recomandare)
+                if recomandari:
+                    confirmat = recomandari[-1]['id']
+                    trimise = {id_trimis for id_trimis in trimise if id_trimis > confirmat}
+                    yield f'id: {confirmat}\n\n'
+                    ultimul_mesaj = time.monotonic()
+                citeste_din_baza = False
+
+            eveniment = abonament.asteapta(INTERVAL_VERIFICARE)
+
+            # Coada s-a umplut si a fost golita: recuperam din baza de date
+            if abonament.verifica_desincronizare():
+                citeste_din_baza = True
+                continue
+
+            if eveniment is None:
+                # Nicio recomandare publicata in acest proces; verificam doar versiunea
+                with conexiune_din_pool() as conn:
+                    citeste_din_baza = versiune_utilizator(conn, id_user) != versiune
+                if time.monotonic() - ultimul_mesaj >= INTERVAL_HEARTBEAT:
+                    yield ': keepalive\n\n'
+                    ultimul_mesaj = time.monotonic()
+            elif eveniment['id'] > confirmat and eveniment['id'] not in trimise:
+                trimise.add(eveniment['id'])
+                yield _eveniment_sse(eveniment)
+                ultimul_mesaj = time.monotonic()
+    finally:
+        hub_recomandari.dezaboneaza(abonament)
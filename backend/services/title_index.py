@@ -0,0 +1,154 @@
+"""
+Modul pentru indexul de titluri in memorie (autocomplete dupa prefix)
+Titlurile sunt pastrate intr-o lista sortata dupa cheia normalizata, iar sugestiile
+pentru un prefix sunt gasite cu bisect (O(log n) + numarul de rezultate).
+Indexul este construit din titlurile din tabelul movies si din catalogul local.
+Prima construire este sincrona; reconstruirile ulterioare ruleaza intr-un singur thread
+de fundal, iar pana la terminare cererile folosesc indexul vechi.
+"""
+import bisect
+import logging
+import os
+import threading
+import time
+from models.database import conexiune_din_pool
+
+# Numarul implicit si maxim de sugestii returnate
+LIMITA_IMPLICITA = 10
+LIMITA_MAXIMA = 50
+
+# Dupa cate secunde indexul este reconstruit complet (pentru titlurile adaugate
+# din alt proces, de ex. din frontend, care nu trec prin adauga())
+INTERVAL_RECONSTRUIRE = float(os.getenv('MOVIE_MANAGER_SUGGEST_REBUILD', '300'))
+
+logger = logging.getLogger('movie_manager.suggest')
+
+# Functie pentru cheia de sortare / cautare a unui titlu
+def _cheie(titlu):
+    return ' '.join(titlu.split()).lower()
+
+class IndexTitluri:
+    """
+    Index sortat de titluri, fara duplicate (dupa cheia normalizata)
+    """
+
+    def __init__(self):
+        self._intrari = []
+        self._chei = set()
+        self._lock = threading.Lock()
+        # O singura construire la un moment dat (celelalte cereri folosesc indexul existent)
+        self._lock_construire = threading.Lock()
+        # Titlurile adaugate in timpul unei construiri (pot lipsi din citirea bazei de date)
+        self._adaugate = None
+        self._gata = False
+        self.construit_la = None
+
+    # Reconstruieste indexul din baza de date
+    def construieste(self, conn):
+        with self._lock:
+            self._adaugate = []
+        try:
+            titluri = [rand[0] for rand in conn.execute('SELECT DISTINCT title FROM movies WHERE title IS NOT NULL')]
+            titluri += [rand[0] for rand in conn.execute('SELECT name FROM catalog_shows')]
+        except Exception:
+            with self._lock:
+                self._adaugate = None
+            raise
+
+        intrari = {}
+        for titlu in titluri:
+            cheie = _cheie(titlu)
+            if cheie and cheie not in intrari:
+                intrari[cheie] = titlu
+
+        with self._lock:
+            for cheie, titlu in self._adaugate:
+                intrari.setdefault(cheie, titlu)
+            self._adaugate = None
+            self._intrari = sorted(intrari.items())
+            self._chei = set(intrari)
+            self._gata = True
+            self.construit_la = time.monotonic()
+
+    # Se asigura ca indexul exista si porneste reconstruirea daca este vechi
+    def actualizeaza(self, conn, deschide_conexiune=conexiune_din_pool):
+        """
+        Prima construire ruleaza in cererea curenta (cererile concurente o asteapta);
+        dupa aceea, un index vechi este reconstruit in fundal, o singura data
+        """
+        if not self._gata:
+            with self._lock_construire:
+                if not self._gata:
+                    self.construieste(conn)
+            return
+        if self.trebuie_construit() and self._lock_construire.acquire(blocking=False):
+            threading.Thread(target=self._reconstruieste, args=(deschide_conexiune,),
+                             daemon=True, name='title-index').start()
+
+    # Reconstruirea din fundal, cu o conexiune proprie (lock-ul de construire este deja luat)
+    def _reconstruieste(self, deschide_conexiune):
+        try:
+            with deschide_conexiune() as conn:
+                self.construieste(conn)
+        except Exception:
+            # Indexul vechi ramane in folosinta; urmatoarea cerere reincearca
+            logger.exception('Reconstruirea indexului de titluri a esuat')
+        finally:
+            self._lock_construire.release()
+
+    # Verifica daca indexul trebuie (re)construit
+    def trebuie_construit(self):
+        return self.construit_la is None or time.monotonic() - self.construit_la > INTERVAL_RECONSTRUIRE
+
+    # Marcheaza indexul pentru reconstruire (in fundal) la urmatoarea cautare
+    # (dupa un import mare, reconstruirea este mai ieftina decat adaugarea fiecarui titlu)
+    def invalideaza(self):
+        with self._lock:
+            self.construit_la = None
+
+    # Adauga un titlu nou (actualizare incrementala)
+    def adauga(self, titlu):
+        cheie = _cheie(titlu)
+        if not cheie:
+            return
+        with self._lock:
+            if self._adaugate is not None:
+                self._adaugate.append((cheie, titlu))
+            if not self._gata or cheie in self._chei:
+                return
+            bisect.insort(self._intrari, (cheie, titlu))
+            self._chei.add(cheie)
+
+    # Returneaza titlurile care incep cu prefixul dat
+    def sugestii(self, prefix, limita=LIMITA_IMPLICITA):
+        cheie = _cheie(prefix)
+        if not cheie:
+            return []
+        limita = max(1, min(limita, LIMITA_MAXIMA))
+
+        with self._lock:
+            intrari = self._intrari
+            pozitie = bisect.bisect_left(intrari, (cheie,))
+            rezultat = []
+            while pozitie < len(intrari) and len(rezultat) < limita:
+                cheie_intrare, titlu = intrari[pozitie]
+                if not cheie_intrare.startswith(cheie):
+                    break
+                rezultat.append(titlu)
+                pozitie += 1
+        return rezultat
+
+    # Numarul de titluri din index
+    def __len__(self):
+        return len(self._intrari)
+
+# Indexul folosit de aplicatie
+index_titluri = IndexTitluri()
+
+# Functie pentru sugestiile dupa prefix
+def sugereaza(conn, prefix, limita=LIMITA_IMPLICITA):
+    """
+    Returneaza sugestiile pentru prefix, construind indexul la prima folosire
+    """
+    index_titluri.actualizeaza(conn)
+    return index_titluri.sugestii(prefix, limita)
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark pentru rutele backend-ului, rulate in proces cu app.test_client()
+Pentru fiecare dimensiune de biblioteca (numar de filme ale unui utilizator) se
+populeaza o baza de date temporara si se masoara fiecare ruta: operatii pe secunda
+si latentele p50 / p95 / p99. Rezultatele pot fi salvate ca JSON si comparate cu o
+rulare anterioara; scriptul se termina cu cod 1 daca o ruta a regresat peste prag.
+
+Scenariile care scriu ruleaza mereu pe o copie temporara a bazei de date (stearsa la final),
+asa ca o baza data cu --db primeste doar schema si utilizatorii populati, iar rularile
+succesive masoara acelasi set de date. Singura ruta nemasurata este fluxul SSE
+(/api/recommendations/stream), care nu se termina.
+
+Utilizare (din directorul proiectului):
+    python benchmarks/bench_routes.py --sizes 1000,100000 --output rezultate.json
+    python benchmarks/bench_routes.py --sizes 1000 --compare rezultate.json --threshold 0.25
+    python benchmarks/bench_routes.py --sizes 1000000 --db /tmp/bench.db   # refoloseste baza populata
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+BACKEND_DIR = BASE_DIR / 'backend'
+
+# Numarul de filme inserate intr-un singur executemany la populare
+DIMENSIUNE_LOT = 10000
+
+# Numarul de filme ale prietenului si de recomandari primite de fiecare utilizator de test
+FILME_PRIETEN = 1000
+RECOMANDARI = 500
+
+STATUSURI = ('To Watch', 'Watching', 'Completed')
+
+# Functie pentru calculul unei percentile (nearest-rank) dintr-o lista sortata
+def percentila(valori_sortate, procent):
+    if not valori_sortate:
+        return 0.0
+    index = max(0, min(len(valori_sortate) - 1, int(round(procent / 100 * len(valori_sortate) + 0.5)) - 1))
+    return valori_sortate[index]
+
+# Functie pentru popularea bazei de date
+def populeaza(cale_db, dimensiuni):
+    """
+    Creeaza cate un utilizator bench_<n> cu n filme pentru fiecare dimensiune,
+    un prieten comun (bench_friend) cu FILME_PRIETEN filme si RECOMANDARI recomandari
+    primite de fiecare utilizator; utilizatorii existenti nu sunt repopulati
+    Returns:
+        True daca a fost adaugat cel putin un utilizator
+    """
+    from werkzeug.security import generate_password_hash
+
+    conn = sqlite3.connect(cale_db)
+    parola = generate_password_hash('bench')
+
+    def utilizator(nume):
+        rand = conn.execute('SELECT id FROM users WHERE username = ?', (nume,)).fetchone()
+        if rand:
+            return rand[0], False
+        return conn.execute('INSERT INTO users (username, password) VALUES (?, ?)', (nume, parola)).lastrowid, True
+
+    def filme(id_user, numar):
+        for inceput in range(0, numar, DIMENSIUNE_LOT):
+            conn.executemany(
+                'INSERT INTO movies (user_id, title, status, rating) VALUES (?, ?, ?, ?)',
+                ((id_user, f'Movie {i:07d}', STATUSURI[i % 3], str(i % 10 + 1) if i % 3 == 2 else '-')
+                 for i in range(inceput, min(numar, inceput + DIMENSIUNE_LOT)))
+            )
+            conn.commit()
+
+    id_prieten, nou = utilizator('bench_friend')
+    modificat = nou
+    if nou:
+        filme(id_prieten, FILME_PRIETEN)
+
+    for dimensiune in dimensiuni:
+        inceput = time.perf_counter()
+        id_user, nou = utilizator(f'bench_{dimensiune}')
+        if not nou:
+            continue
+        modificat = True
+        filme(id_user, dimensiune)
+        conn.executemany('INSERT OR IGNORE INTO friends (user_id, friend_id) VALUES (?, ?)',
+                         ((id_user, id_prieten), (id_prieten, id_user)))
+        conn.executemany('INSERT INTO recommendations (from_user_id, to_user_id, movie_title) VALUES (?, ?, ?)',
+                         ((id_prieten, id_user, f'Movie {i:07d}') for i in range(RECOMANDARI)))
+        conn.commit()
+        print(f'  populat bench_{dimensiune}: {dimensiune} filme in {time.perf_counter() - inceput:.1f}s')
+
+    conn.execute('ANALYZE')
+    conn.commit()
+    conn.close()
+    return modificat
+
+# Functie pentru copierea unei baze de date (consistenta, inclusiv continutul din WAL)
+def copiaza_baza(sursa, destinatie):
+    conn_sursa = sqlite3.connect(sursa)
+    conn_destinatie = sqlite3.connect(destinatie)
+    try:
+        conn_sursa.backup(conn_destinatie)
+    finally:
+        conn_destinatie.close()
+        conn_sursa.close()
+
+# Functie pentru datele consumate de scenariile care sterg sau creeaza entitati unice
+def pregateste_consumabile(id_user, dimensiune, numar):
+    """
+    Creeaza, pentru fiecare apel, un film si o recomandare de sters si un utilizator
+    care poate fi adaugat ca prieten (in copia temporara a bazei de date)
+    Returns:
+        (id-urile filmelor, id-urile recomandarilor, numele utilizatorilor)
+    """
+    from models.database import conexiune_din_pool
+    from models.repository import id_utilizator, adauga_film, adauga_recomandare, creeaza_utilizator
+
+    with conexiune_din_pool() as conn:
+        id_prieten = id_utilizator(conn, 'bench_friend')
+        parola = conn.execute("SELECT password FROM users WHERE username = 'bench_friend'").fetchone()[0]
+        id_filme = [adauga_film(conn, id_user, f'Bench delete {i}', 'To Watch') for i in range(numar)]
+        id_recomandari = [adauga_recomandare(conn, id_prieten, id_user, f'Bench delete {i}') for i in range(numar)]
+        nume = [f'bench_add_{dimensiune}_{i}' for i in range(numar)]
+        for nume_user in nume:
+            creeaza_utilizator(conn, nume_user, parola)
+        conn.commit()
+    return id_filme, id_recomandari, nume
+
+# Functie pentru lista de scenarii (nume, functie care executa o cerere)
+def scenarii(client, dimensiune, numar_apeluri):
+    """
+    Returneaza scenariile pentru utilizatorul bench_<dimensiune>: (nume, apel, status asteptat)
+    Fiecare apel primeste numarul iteratiei (unic, de la 0 la numar_apeluri - 1) si returneaza raspunsul
+    """
+    from security import verifica_token
+
+    token = f'token_secret_pentru_bench_{dimensiune}'
+    H = {'Authorization': token}
+    with client.application.app_context():
+        from models.database import get_db_connection
+        from models.repository import id_utilizator
+        id_user = id_utilizator(get_db_connection(), f'bench_{dimensiune}')
+    sterse_filme, sterse_recomandari, prieteni_noi = pregateste_consumabile(id_user, dimensiune, numar_apeluri)
+
+    # Corpul unui import: 100 de filme noi la fiecare apel
+    def corp_import(i):
+        return 'title,status,rating\n' + ''.join(f'Import {i}-{k},Completed,{k % 10 + 1}\n' for k in range(100))
+
+    # Datele de care au nevoie scenariile: un film propriu si versiunea curenta
+    filme = client.get('/api/movies?limit=1', headers=H).get_json()['movies']
+    id_film = next(film['id'] for lista in filme.values() for film in lista)
+    etag = client.get('/api/movies', headers=H).headers['ETag']
+    versiune = client.get('/api/movies/changes?since=0', headers=H).get_json()['version']
+
+    class _RaspunsToken:
+        status_code = 200
+
+    def token_cache(_):
+        with client.application.app_context():
+            verifica_token(token)
+        return _RaspunsToken
+
+    return [
+        ('verifica_token', token_cache, 200),
+        ('GET /api/movies', lambda i: client.get('/api/movies', headers=H), 200),
+        ('GET /api/movies (304)', lambda i: client.get('/api/movies', headers=dict(H, **{'If-None-Match': etag})), 304),
+        ('GET /api/movies?limit=100', lambda i: client.get('/api/movies?limit=100', headers=H), 200),
+        ('GET /api/movies/changes', lambda i: client.get(f'/api/movies/changes?since={max(1, versiune - 10)}', headers=H), 200),
+        ('GET /api/dashboard', lambda i: client.get('/api/dashboard', headers=H), 200),
+        ('GET /api/friends', lambda i: client.get('/api/friends', headers=H), 200),
+        ('GET /api/friends/page', lambda i: client.get('/api/friends/page?limit=50', headers=H), 200),
+        ('GET /api/friends/<u>/movies', lambda i: client.get('/api/friends/bench_friend/movies', headers=H), 200),
+        ('GET /api/friends/<u>/movies?limit=100', lambda i: client.get('/api/friends/bench_friend/movies?limit=100', headers=H), 200),
+        ('GET /api/recommendations', lambda i: client.get('/api/recommendations', headers=H), 200),
+        ('GET /api/recommendations?limit=50', lambda i: client.get('/api/recommendations?limit=50', headers=H), 200),
+        ('GET /api/user/username', lambda i: client.get('/api/user/username', headers=H), 200),
+        ('GET /api/health', lambda i: client.get('/api/health'), 200),
+        ('GET /api/metrics', lambda i: client.get('/api/metrics'), 200),
+        ('GET /api/search-movies/suggest', lambda i: client.get('/api/search-movies/suggest?prefix=movie 00', headers=H), 200),
+        ('GET /api/search-movies', lambda i: client.get(f'/api/search-movies?s=movie {i % 50}', headers=H), 200),
+        ('POST /api/movies', lambda i: client.post('/api/movies', json={'title': f'Bench {i}'}, headers=H), 201),
+        ('PUT /api/movies/<id>/move', lambda i: client.put(f'/api/movies/{id_film}/move', json={'new_list': STATUSURI[i % 3]}, headers=H), 200),
+        ('PUT /api/movies/<id>/rate', lambda i: client.put(f'/api/movies/{id_film}/rate', json={'rating': str(i % 10 + 1)}, headers=H), 200),
+        ('DELETE /api/movies/<id>', lambda i: client.delete(f'/api/movies/{sterse_filme[i]}', headers=H), 200),
+        ('POST /api/movies/batch', lambda i: client.post('/api/movies/batch', json={'operations': [
+            {'op': 'add', 'title': f'Bench batch {i}'}, {'op': 'move', 'id': id_film, 'new_list': STATUSURI[i % 3]},
+            {'op': 'rate', 'id': id_film, 'rating': str(i % 10 + 1)}]}, headers=H), 200),
+        ('POST /api/movies/import', lambda i: client.post('/api/movies/import', data=corp_import(i),
+                                                          content_type='text/csv', headers=H), 200),
+        ('POST /api/friends/add', lambda i: client.post('/api/friends/add', json={'friend_username': prieteni_noi[i]}, headers=H), 201),
+        ('POST /api/friends/recommend', lambda i: client.post('/api/friends/recommend', json={
+            'friend_username': 'bench_friend', 'movie_title': f'Bench {i}'}, headers=H), 201),
+        ('DELETE /api/recommendations/<id>', lambda i: client.delete(f'/api/recommendations/{sterse_recomandari[i]}', headers=H), 200),
+        ('POST /api/login', lambda i: client.post('/api/login', json={'username': f'bench_{dimensiune}', 'password': 'bench'}), 200),
+        ('POST /api/register', lambda i: client.post('/api/register', json={
+            'username': f'bench_reg_{dimensiune}_{i}', 'password': 'bench'}), 201),
+        ('POST /api/batch', lambda i: client.post('/api/batch', json={'requests': [
+            {'method': 'GET', 'path': '/friends'}, {'method': 'GET', 'path': '/recommendations?limit=10'}]}, headers=H), 200),
+        ('GET /api/movies/export', lambda i: client.get('/api/movies/export?format=jsonl', headers=H), 200),
+    ]
+
+# Functie pentru masurarea unui scenariu
+def masoara(apel, status_asteptat, iteratii, incalzire, timp_maxim):
+    """
+    Ruleaza apelul de cel mult `iteratii` ori (sau pana la `timp_maxim` secunde, minim 3 ori)
+    Apelurile masurate continua numerotarea celor de incalzire (fiecare apel are alt numar)
+    Returns:
+        dict cu ops_per_sec, p50_ms, p95_ms, p99_ms, n si errors
+    """
+    for i in range(incalzire):
+        raspuns = apel(i)
+        if hasattr(raspuns, 'get_data'):
+            raspuns.get_data()
+
+    latente = []
+    erori = 0
+    inceput = time.perf_counter()
+    for i in range(iteratii):
+        t0 = time.perf_counter_ns()
+        raspuns = apel(incalzire + i)
+        if hasattr(raspuns, 'get_data'):
+            # Raspunsurile streaming sunt consumate complet
+            raspuns.get_data()
+        latente.append((time.perf_counter_ns() - t0) / 1e6)
+        if raspuns.status_code != status_asteptat:
+            erori += 1
+        if i >= 2 and time.perf_counter() - inceput > timp_maxim:
+            break
+    durata = time.perf_counter() - inceput
+
+    latente.sort()
+    return {
+        'n': len(latente),
+        'ops_per_sec': round(len(latente) / durata, 1) if durata else 0.0,
+        'p50_ms': round(percentila(latente, 50), 4),
+        'p95_ms': round(percentila(latente, 95), 4),
+        'p99_ms': round(percentila(latente, 99), 4),
+        'errors': erori,
+    }
+
+# Functie pentru compararea cu o rulare anterioara
+def compara(rezultate, referinta, prag, delta_minima_ms):
+    """
+    Compara p95 pentru fiecare (dimensiune, ruta) prezenta in ambele rulari
+    Returns:
+        lista de regresii (dimensiune, ruta, p95 vechi, p95 nou, raport)
+    """
+    regresii = []
+    print()
+    print(f"{'dimensiune':>10}  {'ruta':<40} {'p95 vechi':>10} {'p95 nou':>10} {'raport':>7}")
+    for dimensiune, rute in rezultate['results'].items():
+        for ruta, nou in rute.items():
+            vechi = referinta.get('results', {}).get(dimensiune, {}).get(ruta)
+            if not vechi:
+                continue
+            raport = nou['p95_ms'] / vechi['p95_ms'] if vechi['p95_ms'] else float('inf')
+            regresie = raport > 1 + prag and nou['p95_ms'] - vechi['p95_ms'] > delta_minima_ms
+            marcaj = '  REGRESIE' if regresie else ''
+            print(f"{dimensiune:>10}  {ruta:<40} {vechi['p95_ms']:>10.3f} {nou['p95_ms']:>10.3f} {raport:>7.2f}{marcaj}")
+            if regresie:
+                regresii.append((dimensiune, ruta, vechi['p95_ms'], nou['p95_ms'], raport))
+    return regresii
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark pentru rutele backend-ului (in proces)')
+    parser.add_argument('--sizes', default='1000', help='dimensiunile bibliotecii, separate prin virgula (ex. 1000,100000,1000000)')
+    parser.add_argument('--iterations', type=int, default=200, help='numarul maxim de cereri per ruta')
+    parser.add_argument('--warmup', type=int, default=5, help='cereri de incalzire per ruta (nemasurate)')
+    parser.add_argument('--max-seconds', type=float, default=5.0, help='timpul maxim per ruta')
+    parser.add_argument('--routes', default='', help='ruleaza doar rutele care contin acest text')
+    parser.add_argument('--db', help='baza de date populata o singura data si refolosita (scenariile ruleaza pe o copie); '
+                                     'implicit una temporara')
+    parser.add_argument('--output', help='fisierul JSON in care se salveaza rezultatele')
+    parser.add_argument('--compare', help='fisierul JSON al unei rulari anterioare')
+    parser.add_argument('--threshold', type=float, default=0.25, help='cresterea relativa a p95 considerata regresie (0.25 = 25%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=0.5, help='diferenta absoluta minima a p95 pentru o regresie')
+    args = parser.parse_args(argv)
+
+    dimensiuni = [int(d) for d in args.sizes.split(',') if d.strip()]
+
+    # Scenariile ruleaza pe o copie temporara a bazei (--db ramane neatinsa de scrierile lor)
+    director = tempfile.mkdtemp(prefix='movie-bench-')
+    try:
+        return _ruleaza(args, dimensiuni, director)
+    finally:
+        shutil.rmtree(director, ignore_errors=True)
+
+def _ruleaza(args, dimensiuni, director):
+    cale_db = os.path.join(director, 'bench.db')
+    if args.db and os.path.exists(args.db):
+        copiaza_baza(args.db, cale_db)
+
+    # Baza de date si sursa cautarilor trebuie alese inainte de importul backend-ului
+    os.environ['MOVIE_MANAGER_DB'] = cale_db
+    os.environ.setdefault('MOVIE_MANAGER_SEARCH_BACKEND', 'local')
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.chdir(BACKEND_DIR)
+
+    from app import app
+    from models.database import init_db
+    from models.migrations import versiune_curenta
+
+    init_db()
+    print(f'Baza de date: {args.db or cale_db}' + (f' (copie in {cale_db})' if args.db else ''))
+    modificat = populeaza(cale_db, dimensiuni)
+
+    # Schema si utilizatorii noi sunt salvati in --db, inainte de orice scenariu
+    if args.db:
+        conn = sqlite3.connect(args.db)
+        versiune_veche = versiune_curenta(conn)
+        conn.close()
+        conn = sqlite3.connect(cale_db)
+        versiune_noua = versiune_curenta(conn)
+        conn.close()
+        if modificat or versiune_noua != versiune_veche:
+            copiaza_baza(cale_db, args.db)
+
+    client = app.test_client()
+    rezultate = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'iterations': args.iterations,
+        },
+        'results': {}
+    }
+
+    erori = 0
+    for dimensiune in dimensiuni:
+        print()
+        print(f'== {dimensiune} filme ==')
+        print(f"{'ruta':<40} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'n':>6}")
+        rezultate['results'][str(dimensiune)] = {}
+        for nume, apel, status_asteptat in scenarii(client, dimensiune, args.warmup + args.iterations):
+            if args.routes and args.routes not in nume:
+                continue
+            rezultat = masoara(apel, status_asteptat, args.iterations, args.warmup, args.max_seconds)
+            rezultate['results'][str(dimensiune)][nume] = rezultat
+            erori += rezultat['errors']
+            marcaj = f"  ({rezultat['errors']} erori)" if rezultat['errors'] else ''
+            print(f"{nume:<40} {rezultat['ops_per_sec']:>10.1f} {rezultat['p50_ms']:>9.3f} "
+                  f"{rezultat['p95_ms']:>9.3f} {rezultat['p99_ms']:>9.3f} {rezultat['n']:>6}{marcaj}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fisier:
+            json.dump(rezultate, fisier, indent=2)
+        print()
+        print(f'Rezultate salvate in {args.output}')
+
+    cod = 0
+    if erori:
+        print(f'{erori} cereri au returnat alt status decat cel asteptat')
+        cod = 1
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as fisier:
+            referinta = json.load(fisier)
+        regresii = compara(rezultate, referinta, args.threshold, args.min_delta_ms)
+        if regresii:
+            print(f'{len(regresii)} rute au regresat peste {args.threshold:.0%}')
+            cod = 1
+    return cod
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Server TVMaze fals, local, pentru testele de incarcare (fara acces la retea)
+Raspunde la GET /search/shows?q=... cu rezultate deterministe in formatul TVMaze,
+dupa o latenta configurabila (simuleaza API-ul real). Backend-ul il foloseste prin
+MOVIE_MANAGER_TVMAZE_URL.
+
+Utilizare (din directorul proiectului):
+    python benchmarks/fake_tvmaze.py --port 5099 --latency-ms 80
+    MOVIE_MANAGER_TVMAZE_URL=http://127.0.0.1:5099 python backend/app.py
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.parse
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Numarul de rezultate returnate pentru o cautare
+NUMAR_REZULTATE = 10
+
+TIPURI = ('Scripted', 'Reality', 'Animation', 'Documentary')
+
+# Functie pentru rezultatele unei cautari
+def rezultate_cautare(termen):
+    """
+    Returneaza show-urile (format TVMaze /search/shows) pentru termen; aceleasi pentru acelasi termen
+    """
+    termen = ' '.join(termen.split())
+    if not termen:
+        return []
+    baza = zlib.crc32(termen.lower().encode()) % 100000
+    rezultate = []
+    for index in range(NUMAR_REZULTATE):
+        id_show = baza * NUMAR_REZULTATE + index + 1
+        nume = termen.title() if index == 0 else f'{termen.title()} {index + 1}'
+        rezultate.append({
+            'score': round(1.0 - index / NUMAR_REZULTATE, 2),
+            'show': {
+                'id': id_show,
+                'name': nume,
+                'premiered': f'{1990 + id_show % 35}-01-01',
+                'type': TIPURI[id_show % len(TIPURI)],
+                'image': {'medium': f'https://static.tvmaze.invalid/{id_show}.jpg'},
+            }
+        })
+    return rezultate
+
+class _Handler(BaseHTTPRequestHandler):
+    # Raspunsurile sunt HTTP/1.1, ca backend-ul sa poata pastra conexiunile keep-alive
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        parti = urllib.parse.urlsplit(self.path)
+        if parti.path != '/search/shows':
+            self._raspunde(404, {'message': 'Not Found'})
+            return
+        termen = urllib.parse.parse_qs(parti.query).get('q', [''])[0]
+        if self.server.latenta:
+            time.sleep(self.server.latenta)
+        with self.server.lock:
+            self.server.cereri += 1
+        self._raspunde(200, rezultate_cautare(termen))
+
+    def _raspunde(self, status, date):
+        corp = json.dumps(date).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(corp)))
+        self.end_headers()
+        self.wfile.write(corp)
+
+    # Fara log pentru fiecare cerere
+    def log_message(self, format, *args):
+        pass
+
+# Functie pentru pornirea serverului intr-un thread
+def porneste(port=0, latenta_ms=0.0, gazda='127.0.0.1'):
+    """
+    Porneste serverul in fundal (port 0 = un port liber ales de sistem)
+    Returns:
+        serverul; URL-ul este f'http://{gazda}:{server.server_port}', oprirea cu server.shutdown()
+    """
+    server = ThreadingHTTPServer((gazda, port), _Handler)
+    server.daemon_threads = True
+    server.latenta = latenta_ms / 1000.0
+    server.cereri = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Server TVMaze fals (GET /search/shows)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='latenta adaugata fiecarui raspuns')
+    args = parser.parse_args(argv)
+
+    server = porneste(args.port, args.latency_ms, args.host)
+    print(f'TVMaze fals pe http://{args.host}:{server.server_port} (latenta {args.latency_ms:g} ms)')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
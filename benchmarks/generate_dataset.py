@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Generator de date sintetice pentru benchmark-uri si teste de incarcare
+Scrie direct intr-un fisier SQLite cu schema din production.db (init_db + migrari):
+utilizatori, prietenii (in ambele directii, ca /api/friends/add), filme si recomandari.
+
+Forma datelor:
+- numarul de prieteni urmeaza o lege de putere (modelul Chung-Lu): putini utilizatori
+  au sute de prieteni, majoritatea au cativa
+- popularitatea titlurilor este de tip Zipf: cateva titluri apar in multe biblioteci
+- numarul de filme per utilizator este lognormal; statusurile si notele sunt amestecate
+- recomandarile vin de la prieteni si folosesc aceeasi popularitate a titlurilor
+- titlurile sunt scrise si in catalogul local (catalog_shows), pentru cautarea offline
+
+Rezultatul este determinist pentru aceeasi valoare --seed (cu exceptia hash-ului parolei,
+care are salt aleator). Toti utilizatorii au aceeasi parola (--password).
+
+Inserarea se face in loturi cu executemany, fara indexuri si triggere (recreate la final)
+si cu jurnalul dezactivat, deci ~10M randuri se genereaza in cateva minute.
+
+Utilizare (din directorul proiectului):
+    python benchmarks/generate_dataset.py --output /tmp/load.db
+    python benchmarks/generate_dataset.py --output /tmp/10m.db --users 100000 --avg-movies 80 --avg-friends 10 --avg-recommendations 5
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+BACKEND_DIR = BASE_DIR / 'backend'
+
+# Numarul de randuri trimise intr-un singur executemany
+DIMENSIUNE_LOT = 50000
+
+# Tabelele ale caror indexuri si triggere sunt suspendate in timpul popularii
+TABELE_POPULATE = ('users', 'movies', 'friends', 'recommendations', 'changes', 'user_versions')
+
+# Statusurile si ponderile lor (majoritatea filmelor sunt in To Watch sau Completed)
+STATUSURI = ('To Watch', 'Watching', 'Completed')
+PONDERI_STATUS = (50, 15, 35)
+
+# Ponderile notelor 1..10 pentru filmele vazute (distributie inclinata spre 7-8)
+PONDERI_NOTE = (1, 1, 2, 3, 5, 8, 12, 14, 10, 6)
+
+# Procentul filmelor vazute care nu au primit nota
+PROCENT_FARA_NOTA = 10
+
+# Cuvintele din care sunt compuse titlurile
+ADJECTIVE = (
+    'Dark', 'Silent', 'Broken', 'Golden', 'Lost', 'Hidden', 'Final', 'Crimson', 'Last', 'Wild',
+    'Frozen', 'Endless', 'Electric', 'Burning', 'Secret', 'Midnight', 'Iron', 'Quiet', 'Little', 'Northern',
+    'Hollow', 'Savage', 'Bright', 'Fallen', 'Restless', 'Distant', 'Stolen', 'Cold', 'Empty', 'Rising',
+)
+SUBSTANTIVE = (
+    'City', 'Kingdom', 'River', 'Empire', 'House', 'Road', 'Signal', 'Garden', 'Ocean', 'Frontier',
+    'Station', 'Island', 'Dynasty', 'Circle', 'Mirror', 'Harbor', 'Valley', 'Witness', 'Hunter', 'Orbit',
+    'Academy', 'Legacy', 'Heist', 'Tide', 'Machine', 'Summer', 'Crown', 'Shadow', 'Protocol', 'Line',
+)
+TIPURI = ('Scripted', 'Scripted', 'Scripted', 'Reality', 'Animation', 'Documentary', 'Talk Show')
+
+# Functie pentru generarea catalogului de titluri
+def genereaza_titluri(rng, numar):
+    """
+    Returneaza `numar` titluri unice, in ordinea popularitatii (primul este cel mai popular)
+    """
+    titluri = []
+    folosite = set()
+    while len(titluri) < numar:
+        titlu = f'{rng.choice(ADJECTIVE)} {rng.choice(SUBSTANTIVE)}'
+        if rng.random() < 0.3:
+            titlu = f'The {titlu}'
+        if rng.random() < 0.2:
+            titlu = f'{titlu}: {rng.choice(SUBSTANTIVE)}'
+        baza, sufix = titlu, 2
+        while titlu in folosite:
+            titlu = f'{baza} {sufix}'
+            sufix += 1
+        folosite.add(titlu)
+        titluri.append(titlu)
+    return titluri
+
+# Functie pentru ponderile cumulative ale unei distributii Zipf
+def ponderi_zipf(numar, exponent):
+    cumulat, total = [], 0.0
+    for rang in range(1, numar + 1):
+        total += 1.0 / rang ** exponent
+        cumulat.append(total)
+    return cumulat
+
+# Functie pentru generarea grafului de prietenii
+def genereaza_prietenii(rng, numar_utilizatori, grad_mediu, exponent):
+    """
+    Modelul Chung-Lu: capetele fiecarei muchii sunt alese cu probabilitate proportionala
+    cu ponderea utilizatorului, ponderile urmand o lege de putere cu exponentul dat
+    Returns:
+        lista de perechi (a, b) cu a < b, fara duplicate (id-uri 1..numar_utilizatori)
+    """
+    if numar_utilizatori < 2 or grad_mediu <= 0:
+        return []
+    # Ponderile sunt atribuite in ordine aleatoare, ca utilizatorii populari sa nu fie primii
+    ordine = list(range(1, numar_utilizatori + 1))
+    rng.shuffle(ordine)
+    exponent_pondere = 1.0 / (exponent - 1.0)
+    cumulat, total = [], 0.0
+    for rang in range(1, numar_utilizatori + 1):
+        total += rang ** -exponent_pondere
+        cumulat.append(total)
+
+    maxim_muchii = numar_utilizatori * (numar_utilizatori - 1) // 2
+    tinta = min(maxim_muchii, int(numar_utilizatori * grad_mediu / 2))
+    muchii = set()
+    incercari = 0
+    while len(muchii) < tinta and incercari < 50 * tinta:
+        lipsa = tinta - len(muchii)
+        capete_a = rng.choices(ordine, cum_weights=cumulat, k=lipsa)
+        capete_b = rng.choices(ordine, cum_weights=cumulat, k=lipsa)
+        incercari += lipsa
+        for a, b in zip(capete_a, capete_b):
+            if a != b:
+                muchii.add((a, b) if a < b else (b, a))
+    return sorted(muchii)
+
+# Functie pentru numarul de elemente al unui utilizator (lognormal cu media data)
+def numar_lognormal(rng, medie, sigma=1.0):
+    if medie <= 0:
+        return 0
+    return int(rng.lognormvariate(math.log(medie) - sigma * sigma / 2, sigma))
+
+# Generator pentru filmele utilizatorilor
+def genereaza_filme(rng, numar_utilizatori, medie, titluri, cumulat):
+    """
+    Genereaza randurile (user_id, title, status, rating); un utilizator nu are acelasi titlu de doua ori
+    """
+    maxim_per_utilizator = max(1, len(titluri) // 2)
+    note = [str(nota) for nota in range(1, 11)]
+    for id_user in range(1, numar_utilizatori + 1):
+        numar = min(maxim_per_utilizator, numar_lognormal(rng, medie))
+        alese = set()
+        for _ in range(10):
+            if len(alese) >= numar:
+                break
+            alese.update(rng.choices(range(len(titluri)), cum_weights=cumulat, k=numar - len(alese)))
+        statusuri = rng.choices(STATUSURI, weights=PONDERI_STATUS, k=len(alese))
+        for index, status in zip(sorted(alese), statusuri):
+            nota = '-'
+            if status == 'Completed' and rng.randrange(100) >= PROCENT_FARA_NOTA:
+                nota = rng.choices(note, weights=PONDERI_NOTE)[0]
+            yield id_user, titluri[index], status, nota
+
+# Generator pentru recomandari
+def genereaza_recomandari(rng, vecini, medie, titluri, cumulat):
+    """
+    Genereaza randurile (from_user_id, to_user_id, movie_title), de la prieteni ai destinatarului
+    """
+    for id_user in range(1, len(vecini)):
+        prieteni = vecini[id_user]
+        if not prieteni:
+            continue
+        numar = int(rng.expovariate(1.0 / medie)) if medie > 0 else 0
+        if not numar:
+            continue
+        expeditori = rng.choices(prieteni, k=numar)
+        for expeditor, index in zip(expeditori, rng.choices(range(len(titluri)), cum_weights=cumulat, k=numar)):
+            yield expeditor, id_user, titluri[index]
+
+# Functie pentru inserarea in loturi a unui generator de randuri
+def insereaza(conn, nume, instructiune, randuri):
+    """
+    Insereaza randurile lot cu lot si afiseaza progresul
+    Returns:
+        numarul de randuri inserate
+    """
+    inceput = time.perf_counter()
+    total = 0
+    randuri = iter(randuri)
+    while True:
+        lot = list(itertools.islice(randuri, DIMENSIUNE_LOT))
+        if not lot:
+            break
+        conn.executemany(instructiune, lot)
+        total += len(lot)
+        if total % (20 * DIMENSIUNE_LOT) == 0:
+            print(f'  {nume}: {total} randuri...', flush=True)
+    conn.commit()
+    durata = time.perf_counter() - inceput
+    print(f'  {nume}: {total} randuri in {durata:.1f}s')
+    return total
+
+# Functie pentru suspendarea indexurilor si triggerelor tabelelor populate
+def suspenda_schema(conn):
+    """
+    Sterge indexurile (cu exceptia celor UNIQUE din definitia tabelelor) si triggerele
+    tabelelor populate
+    Returns:
+        instructiunile SQL pentru recrearea lor
+    """
+    semne = ','.join('?' * len(TABELE_POPULATE))
+    obiecte = conn.execute(f'''
+        SELECT type, name, sql FROM sqlite_master
+        WHERE type IN ('index', 'trigger') AND sql IS NOT NULL AND tbl_name IN ({semne})
+    ''', TABELE_POPULATE).fetchall()
+    for tip, nume, _ in obiecte:
+        conn.execute(f'DROP {tip.upper()} {nume}')
+    conn.commit()
+    # Indexurile inaintea triggerelor
+    return [sql for tip, _, sql in sorted(obiecte, key=lambda obiect: obiect[0] != 'index')]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generator de date sintetice (schema production.db)')
+    parser.add_argument('--output', required=True, help='fisierul SQLite creat')
+    parser.add_argument('--force', action='store_true', help='suprascrie fisierul daca exista')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--users', type=int, default=10000, help='numarul de utilizatori')
+    parser.add_argument('--avg-friends', type=float, default=20, help='numarul mediu de prieteni per utilizator')
+    parser.add_argument('--friend-exponent', type=float, default=2.5, help='exponentul legii de putere pentru numarul de prieteni (> 2)')
+    parser.add_argument('--avg-movies', type=float, default=100, help='numarul mediu de filme per utilizator')
+    parser.add_argument('--avg-recommendations', type=float, default=10, help='numarul mediu de recomandari primite')
+    parser.add_argument('--titles', type=int, default=50000, help='numarul de titluri distincte (catalogul)')
+    parser.add_argument('--title-exponent', type=float, default=1.1, help='exponentul Zipf pentru popularitatea titlurilor')
+    parser.add_argument('--password', default='parola123', help='parola tuturor utilizatorilor')
+    parser.add_argument('--username-prefix', default='user', help='numele utilizatorilor: <prefix><numar>')
+    args = parser.parse_args(argv)
+
+    if args.friend_exponent <= 2:
+        parser.error('--friend-exponent trebuie sa fie mai mare decat 2')
+    if args.users < 1 or args.titles < 1:
+        parser.error('--users si --titles trebuie sa fie pozitive')
+
+    cale_db = os.path.abspath(args.output)
+    if os.path.exists(cale_db):
+        if not args.force:
+            parser.error(f'{cale_db} exista deja (foloseste --force pentru a-l suprascrie)')
+        for sufix in ('', '-wal', '-shm'):
+            if os.path.exists(cale_db + sufix):
+                os.remove(cale_db + sufix)
+
+    # Schema este creata de init_db, exact ca pentru production.db
+    os.environ['MOVIE_MANAGER_DB'] = cale_db
+    sys.path.insert(0, str(BACKEND_DIR))
+    from models.database import init_db
+    from werkzeug.security import generate_password_hash
+    init_db()
+
+    inceput = time.perf_counter()
+    rng = random.Random(args.seed)
+    conn = sqlite3.connect(cale_db)
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA cache_size = -262144')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    schema = suspenda_schema(conn)
+
+    print(f'Generare in {cale_db} (seed {args.seed})')
+    titluri = genereaza_titluri(rng, args.titles)
+    cumulat_titluri = ponderi_zipf(len(titluri), args.title_exponent)
+    total = 0
+
+    # Catalogul local, ca titlurile sa poata fi gasite de /api/search-movies
+    total_catalog = insereaza(conn, 'catalog_shows', 'INSERT INTO catalog_shows (id, name, premiered, type, poster) VALUES (?, ?, ?, ?, ?)', (
+        (index + 1, titlu, f'{rng.randint(1960, 2025)}-01-01', rng.choice(TIPURI), '')
+        for index, titlu in enumerate(titluri)
+    ))
+    conn.execute("INSERT INTO catalog_shows_fts (catalog_shows_fts) VALUES ('rebuild')")
+    conn.commit()
+
+    latime = len(str(args.users))
+    parola = generate_password_hash(args.password)
+    total += insereaza(conn, 'users', 'INSERT INTO users (id, username, password) VALUES (?, ?, ?)', (
+        (id_user, f'{args.username_prefix}{id_user:0{latime}d}', parola) for id_user in range(1, args.users + 1)
+    ))
+
+    muchii = genereaza_prietenii(rng, args.users, args.avg_friends, args.friend_exponent)
+    vecini = [[] for _ in range(args.users + 1)]
+    for a, b in muchii:
+        vecini[a].append(b)
+        vecini[b].append(a)
+    # Ambele directii, in aceeasi ordine ca adauga_prietenie
+    total += insereaza(conn, 'friends', 'INSERT INTO friends (user_id, friend_id) VALUES (?, ?)', (
+        rand for a, b in muchii for rand in ((a, b), (b, a))
+    ))
+    del muchii
+
+    total += insereaza(conn, 'movies', 'INSERT INTO movies (user_id, title, status, rating) VALUES (?, ?, ?, ?)',
+                       genereaza_filme(rng, args.users, args.avg_movies, titluri, cumulat_titluri))
+    total += insereaza(conn, 'recommendations', 'INSERT INTO recommendations (from_user_id, to_user_id, movie_title) VALUES (?, ?, ?)',
+                       genereaza_recomandari(rng, vecini, args.avg_recommendations, titluri, cumulat_titluri))
+
+    # Triggerele nu au rulat: fiecare utilizator porneste de la versiunea 1, fara istoric in changes
+    conn.execute('INSERT INTO user_versions (user_id, version) SELECT id, 1 FROM users')
+    conn.commit()
+
+    print('  recreare indexuri si triggere...', flush=True)
+    inceput_indexuri = time.perf_counter()
+    for sql in schema:
+        conn.execute(sql)
+    conn.commit()
+    conn.execute('ANALYZE')
+    conn.commit()
+    print(f'  indexuri si triggere in {time.perf_counter() - inceput_indexuri:.1f}s')
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.close()
+
+    grade = sorted((len(lista) for lista in vecini[1:]), reverse=True)
+    durata = time.perf_counter() - inceput
+    print(f'Gata: {total} randuri (+{total_catalog} titluri in catalog) in {durata:.1f}s ({total / durata:,.0f} randuri/s)')
+    print(f'Prieteni per utilizator: maxim {grade[0]}, median {grade[len(grade) // 2]}, '
+          f'fara prieteni {sum(1 for grad in grade if grad == 0)}')
+    print(f'Autentificare: {args.username_prefix}{1:0{latime}d} .. {args.username_prefix}{args.users:0{latime}d}, parola {args.password!r}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
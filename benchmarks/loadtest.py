@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+Test de incarcare end-to-end pentru frontend si backend (mai multe procese)
+Utilizatorii virtuali se autentifica si repeta parcursuri ponderate, prin APIClient
+(backend) si prin formularele frontend-ului, ca un browser:
+    login            - POST /login (formular) + APIClient.login
+    dashboard        - GET /dashboard (HTML) + APIClient.get_dashboard
+    add_move_rate    - cautare, adaugare (formular), sync, mutare, nota (formular), stergere
+    friend_profile   - APIClient.get_friends + GET /friends/<prieten> (HTML)
+    recommend        - POST /friends/<prieten>/recommend (formular)
+    recommendations  - GET /recommendations (HTML)
+
+Fara --backend-url / --frontend-url, scriptul porneste singur stiva: un server TVMaze
+fals (fake_tvmaze.py, fara retea), backend-ul si frontend-ul pe porturi proprii, pe o
+baza de date generata cu generate_dataset.py (sau pe cea data cu --db).
+La final afiseaza debitul, percentilele latentei si rata de erori pentru fiecare pas.
+
+Utilizare (din directorul proiectului):
+    python benchmarks/loadtest.py --vus 50 --duration 60
+    python benchmarks/loadtest.py --db /tmp/10m.db --vus 200 --processes 8 --output load.json
+    python benchmarks/loadtest.py --backend-url http://127.0.0.1:5000 --frontend-url http://127.0.0.1:5001 \\
+        --user-count 10000 --vus 20
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+BACKEND_DIR = BASE_DIR / 'backend'
+FRONTEND_DIR = BASE_DIR / 'frontend'
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# Ponderile implicite ale parcursurilor
+MIX_IMPLICIT = 'login=5,dashboard=30,add_move_rate=20,friend_profile=20,recommend=10,recommendations=15'
+
+# Serverele pornite de script (fara debug si reloader, cu un thread per cerere)
+SCRIPT_BACKEND = ("import sys; from app import app, init_db; init_db(); "
+                  "app.run(host='127.0.0.1', port=int(sys.argv[1]), threaded=True)")
+SCRIPT_FRONTEND = ("import sys; from app import app; "
+                   "app.run(host='127.0.0.1', port=int(sys.argv[1]), threaded=True)")
+
+# Termenii folositi pentru cautari (rezultatele vin de la TVMaze-ul fals sau real)
+TERMENI = ('dark', 'river', 'empire', 'station', 'garden', 'signal', 'crown', 'harbor', 'orbit', 'legacy')
+
+STATUSURI = ('To Watch', 'Watching', 'Completed')
+
+class EroarePas(Exception):
+    """
+    Un pas al unui parcurs a primit un raspuns neasteptat
+    """
+
+# Functie pentru calculul unei percentile (nearest-rank) dintr-o lista sortata
+def percentila(valori_sortate, procent):
+    if not valori_sortate:
+        return 0.0
+    index = max(0, min(len(valori_sortate) - 1, int(round(procent / 100 * len(valori_sortate) + 0.5)) - 1))
+    return valori_sortate[index]
+
+# Functie pentru citirea ponderilor parcursurilor
+def citeste_mix(text):
+    """
+    Transforma 'login=5,dashboard=30,...' intr-un dict {parcurs: pondere}
+    """
+    mix = {}
+    for parte in text.split(','):
+        if not parte.strip():
+            continue
+        nume, _, pondere = parte.partition('=')
+        nume = nume.strip()
+        if nume not in PARCURSURI:
+            raise ValueError(f'Parcurs necunoscut: {nume} (disponibile: {", ".join(PARCURSURI)})')
+        mix[nume] = float(pondere or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError('Cel putin un parcurs trebuie sa aiba pondere pozitiva')
+    return mix
+
+class UtilizatorVirtual:
+    """
+    Un utilizator care se autentifica si ruleaza parcursuri pana la termen
+    Are propria sesiune de browser (cookie-uri frontend) si propriul APIClient
+    """
+
+    def __init__(self, config, index, statistici):
+        from utils.api_client import APIClient
+
+        self.config = config
+        self.rng = random.Random(config['seed'] * 100003 + index)
+        self.statistici = statistici
+        self.browser = requests.Session()
+        self.api = APIClient(session=requests.Session())
+        self.frontend = config['frontend_url']
+        self.timeout = config['timeout']
+        latime = len(str(config['user_count']))
+        numar = self.rng.randint(1, config['user_count'])
+        self.username = f"{config['username_prefix']}{numar:0{latime}d}"
+        self.prieteni = None
+
+    # Masoara un pas; functia returneaza True daca raspunsul este cel asteptat
+    def _pas(self, nume, functie):
+        inceput = time.perf_counter()
+        try:
+            reusit = functie()
+            eroare = None if reusit else 'raspuns neasteptat'
+        except Exception as exceptie:
+            eroare = f'{type(exceptie).__name__}: {exceptie}'
+        durata = (time.perf_counter() - inceput) * 1000
+        self.statistici.inregistreaza(nume, durata, eroare)
+        if eroare:
+            raise EroarePas(eroare)
+
+    # Cereri catre frontend (fara redirect-uri automate, ca sa putem verifica destinatia)
+    def _get(self, cale):
+        return self.browser.get(self.frontend + cale, timeout=self.timeout, allow_redirects=False)
+
+    def _post(self, cale, date):
+        return self.browser.post(self.frontend + cale, data=date, timeout=self.timeout, allow_redirects=False)
+
+    # Verifica un redirect catre pagina asteptata (nu catre /login)
+    @staticmethod
+    def _redirect_spre(raspuns, cale):
+        return raspuns.status_code == 302 and raspuns.headers.get('Location', '').split('?')[0].endswith(cale)
+
+    def _prieten(self):
+        if self.prieteni is None:
+            self._pas('api friends', lambda: self._incarca_prietenii())
+        return self.rng.choice(self.prieteni) if self.prieteni else None
+
+    def _incarca_prietenii(self):
+        reusit, prieteni = self.api.get_friends()
+        self.prieteni = prieteni if reusit else []
+        return reusit
+
+    def login(self):
+        parola = self.config['password']
+        self._pas('POST /login', lambda: self._redirect_spre(
+            self._post('/login', {'username': self.username, 'password': parola}), '/dashboard'))
+        self._pas('api login', lambda: self.api.login(self.username, parola)[0])
+        self.prieteni = None
+
+    def dashboard(self):
+        self._pas('GET /dashboard', lambda: self._get('/dashboard').status_code == 200)
+        self._pas('api dashboard', lambda: self.api.get_dashboard()[0])
+
+    def add_move_rate(self):
+        termen = f'{self.rng.choice(TERMENI)} {self.rng.randint(1, 1000)}'
+        rezultate = {}
+
+        def cauta():
+            reusit, date = self.api.search_movies(termen)
+            rezultate.update(date)
+            return reusit and bool(date.get('Search'))
+
+        self._pas('api search', cauta)
+        titlu = self.rng.choice(rezultate['Search'])['Title']
+        self._pas('POST /movies/add', lambda: self._redirect_spre(
+            self._post('/movies/add', {'title': titlu, 'status': 'To Watch', 'movie_validated': '1'}), '/dashboard'))
+
+        biblioteca = {}
+
+        def sincronizeaza():
+            reusit, date = self.api.sync()
+            biblioteca.update(date if reusit else {})
+            return reusit
+
+        self._pas('api sync', sincronizeaza)
+        id_film = next((film['id'] for film in biblioteca['movies'].values() if film['title'] == titlu), None)
+        if id_film is None:
+            self.statistici.inregistreaza('api sync', 0.0, f'filmul adaugat lipseste din sync: {titlu}')
+            return
+        self._pas('api move', lambda: self.api.move_movie(id_film, self.rng.choice(STATUSURI[1:]))[0])
+        self._pas('POST /movies/<id>/rate', lambda: self._redirect_spre(
+            self._post(f'/movies/{id_film}/rate', {'rating': str(self.rng.randint(1, 10))}), '/dashboard'))
+        # Stergem filmul, ca biblioteca sa nu creasca pe durata testului
+        self._pas('api delete', lambda: self.api.delete_movie(id_film)[0])
+
+    def friend_profile(self):
+        prieten = self._prieten()
+        if prieten is None:
+            return
+        self._pas('GET /friends/<u>', lambda: self._get(f'/friends/{prieten}').status_code == 200)
+
+    def recommend(self):
+        prieten = self._prieten()
+        if prieten is None:
+            return
+        titlu = f'{self.rng.choice(TERMENI).title()} {self.rng.randint(1, 1000)}'
+        self._pas('POST /friends/<u>/recommend', lambda: self._redirect_spre(
+            self._post(f'/friends/{prieten}/recommend', {'movie_title': titlu, 'movie_validated': '1'}), f'/friends/{prieten}'))
+
+    def recommendations(self):
+        self._pas('GET /recommendations', lambda: self._get('/recommendations').status_code == 200)
+
+    # Ruleaza parcursuri pana la termen
+    def ruleaza(self, termen):
+        nume = list(self.config['mix'])
+        ponderi = [self.config['mix'][parcurs] for parcurs in nume]
+        autentificat = False
+        while time.perf_counter() < termen:
+            parcurs = self.rng.choices(nume, weights=ponderi)[0] if autentificat else 'login'
+            inceput = time.perf_counter()
+            try:
+                getattr(self, parcurs)()
+                autentificat = True
+                self.statistici.parcurs(parcurs, (time.perf_counter() - inceput) * 1000, True)
+            except EroarePas:
+                self.statistici.parcurs(parcurs, (time.perf_counter() - inceput) * 1000, False)
+                if parcurs == 'login':
+                    # Evitam o bucla stransa de login-uri esuate
+                    time.sleep(0.5)
+            if self.config['think'] > 0:
+                time.sleep(self.rng.expovariate(1.0 / self.config['think']))
+
+# Parcursurile disponibile (metodele UtilizatorVirtual)
+PARCURSURI = ('login', 'dashboard', 'add_move_rate', 'friend_profile', 'recommend', 'recommendations')
+
+class Statistici:
+    """
+    Latentele si erorile unui proces (list.append este atomic, deci fara lock pe calea rapida)
+    """
+
+    def __init__(self):
+        self.pasi = {}
+        self.parcursuri = {}
+        self.erori = {}
+        self._lock = threading.Lock()
+
+    def inregistreaza(self, nume, durata_ms, eroare=None):
+        self.pasi.setdefault(nume, []).append(durata_ms)
+        if eroare:
+            with self._lock:
+                exemple = self.erori.setdefault(nume, {'count': 0, 'samples': []})
+                exemple['count'] += 1
+                if len(exemple['samples']) < 3:
+                    exemple['samples'].append(eroare[:200])
+
+    def parcurs(self, nume, durata_ms, reusit):
+        self.parcursuri.setdefault(nume, {'ok': [], 'failed': 0})
+        if reusit:
+            self.parcursuri[nume]['ok'].append(durata_ms)
+        else:
+            self.parcursuri[nume]['failed'] += 1
+
+    def ca_dict(self):
+        return {'steps': self.pasi, 'journeys': self.parcursuri, 'errors': self.erori}
+
+# Punctul de intrare al unui proces de incarcare
+def proces_incarcare(config, indecsi, termen_start, coada):
+    """
+    Ruleaza utilizatorii virtuali cu indecsii dati (cate un thread fiecare) si
+    trimite statisticile in coada la final
+    """
+    os.environ['BACKEND_API_URL'] = config['backend_url'].rstrip('/') + '/api'
+    sys.path.insert(0, str(FRONTEND_DIR))
+
+    statistici = Statistici()
+    utilizatori = [UtilizatorVirtual(config, index, statistici) for index in indecsi]
+    # Toate procesele incep in acelasi moment
+    time.sleep(max(0.0, termen_start - time.time()))
+    termen = time.perf_counter() + config['duration']
+    threaduri = [threading.Thread(target=utilizator.ruleaza, args=(termen,), daemon=True) for utilizator in utilizatori]
+    for thread in threaduri:
+        thread.start()
+    for thread in threaduri:
+        thread.join()
+    coada.put(statistici.ca_dict())
+
+# Functie pentru asteptarea unui server
+def asteapta_server(url, timeout=30.0):
+    termen = time.monotonic() + timeout
+    while time.monotonic() < termen:
+        try:
+            if requests.get(url, timeout=1, allow_redirects=False).status_code < 500:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.1)
+    return False
+
+# Functie pentru pornirea stivei (TVMaze fals, backend, frontend)
+def porneste_stiva(args, cale_db, director):
+    """
+    Returns:
+        (url backend, url frontend, lista de procese, serverul TVMaze fals)
+    """
+    import fake_tvmaze
+
+    tvmaze = fake_tvmaze.porneste(0, args.tvmaze_latency_ms)
+    url_backend = f'http://127.0.0.1:{args.backend_port}'
+    url_frontend = f'http://127.0.0.1:{args.frontend_port}'
+    mediu = dict(os.environ,
+                 MOVIE_MANAGER_DB=cale_db,
+                 MOVIE_MANAGER_TVMAZE_URL=f'http://127.0.0.1:{tvmaze.server_port}',
+                 MOVIE_MANAGER_SEARCH_BACKEND='tvmaze',
+                 BACKEND_API_URL=url_backend + '/api')
+
+    procese = []
+    for nume, script, cwd, port in (('backend', SCRIPT_BACKEND, BACKEND_DIR, args.backend_port),
+                                    ('frontend', SCRIPT_FRONTEND, FRONTEND_DIR, args.frontend_port)):
+        log = open(os.path.join(director, f'{nume}.log'), 'w')
+        procese.append((nume, subprocess.Popen([sys.executable, '-c', script, str(port)], cwd=str(cwd),
+                                               env=mediu, stdout=log, stderr=subprocess.STDOUT), log))
+
+    for (nume, proces, log), url in zip(procese, (url_backend + '/api/health', url_frontend + '/login')):
+        if not asteapta_server(url) or proces.poll() is not None:
+            opreste_stiva(procese, tvmaze)
+            # Directorul cu loguri este sters la final (fara --keep): includem finalul logului in eroare
+            with open(log.name, encoding='utf-8', errors='replace') as fisier:
+                final_log = ''.join(fisier.readlines()[-20:])
+            raise RuntimeError(f'{nume} nu a pornit ({log.name}):\n{final_log}')
+    return url_backend, url_frontend, procese, tvmaze
+
+# Functie pentru oprirea stivei pornite de script
+def opreste_stiva(procese, tvmaze):
+    for _, proces, log in procese:
+        if proces.poll() is None:
+            proces.terminate()
+            try:
+                proces.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proces.kill()
+        log.close()
+    tvmaze.shutdown()
+
+# Functie pentru colectarea rezultatelor proceselor de incarcare
+def colecteaza_rezultate(coada, lucratori, termen):
+    """
+    Asteapta cate un rezultat de la fiecare proces, fara sa se blocheze daca unul cade
+    Raises:
+        RuntimeError daca un proces s-a oprit fara rezultat sau termenul a expirat
+    """
+    rezultate = []
+    while len(rezultate) < len(lucratori):
+        try:
+            rezultate.append(coada.get(timeout=1.0))
+            continue
+        except queue.Empty:
+            pass
+        cazuti = [lucrator for lucrator in lucratori if lucrator.exitcode not in (None, 0)]
+        if cazuti:
+            coduri = ', '.join(f'{lucrator.name}: cod {lucrator.exitcode}' for lucrator in cazuti)
+            raise RuntimeError(f'{len(cazuti)} procese de incarcare au cazut ({coduri})')
+        # Toate procesele s-au terminat normal, iar coada a ramas goala o secunda
+        if all(lucrator.exitcode == 0 for lucrator in lucratori):
+            raise RuntimeError(f'{len(lucratori) - len(rezultate)} procese s-au oprit fara rezultat')
+        if time.time() > termen:
+            raise RuntimeError('Procesele de incarcare nu au terminat in timp')
+    return rezultate
+
+# Functie pentru agregarea statisticilor tuturor proceselor
+def agrega(rezultate, durata):
+    pasi, parcursuri, erori = {}, {}, {}
+    for rezultat in rezultate:
+        for nume, latente in rezultat['steps'].items():
+            pasi.setdefault(nume, []).extend(latente)
+        for nume, date in rezultat['journeys'].items():
+            parcurs = parcursuri.setdefault(nume, {'ok': [], 'failed': 0})
+            parcurs['ok'].extend(date['ok'])
+            parcurs['failed'] += date['failed']
+        for nume, date in rezultat['errors'].items():
+            eroare = erori.setdefault(nume, {'count': 0, 'samples': []})
+            eroare['count'] += date['count']
+            eroare['samples'] = (eroare['samples'] + date['samples'])[:3]
+
+    def sumar(latente, esuate):
+        latente = sorted(latente)
+        total = len(latente)
+        return {
+            'count': total,
+            'errors': esuate,
+            'error_rate': round(esuate / total, 4) if total else 0.0,
+            'per_sec': round(total / durata, 2),
+            'p50_ms': round(percentila(latente, 50), 2),
+            'p95_ms': round(percentila(latente, 95), 2),
+            'p99_ms': round(percentila(latente, 99), 2),
+            'max_ms': round(latente[-1], 2) if latente else 0.0,
+        }
+
+    total_cereri = sum(len(latente) for latente in pasi.values())
+    total_erori = sum(eroare['count'] for eroare in erori.values())
+    return {
+        'duration_s': durata,
+        'requests': total_cereri,
+        'requests_per_sec': round(total_cereri / durata, 2),
+        'errors': total_erori,
+        'error_rate': round(total_erori / total_cereri, 4) if total_cereri else 0.0,
+        'steps': {nume: sumar(latente, erori.get(nume, {}).get('count', 0)) for nume, latente in sorted(pasi.items())},
+        'journeys': {nume: sumar(date['ok'], date['failed']) for nume, date in sorted(parcursuri.items())},
+        'error_samples': erori,
+    }
+
+# Functie pentru afisarea raportului
+def afiseaza(raport):
+    print()
+    print(f"{'pas':<30} {'cereri':>8} {'/s':>8} {'erori':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for nume, date in raport['steps'].items():
+        print(f"{nume:<30} {date['count']:>8} {date['per_sec']:>8.1f} {date['error_rate']:>7.2%} "
+              f"{date['p50_ms']:>9.1f} {date['p95_ms']:>9.1f} {date['p99_ms']:>9.1f}")
+    print()
+    print(f"{'parcurs':<30} {'reusite':>8} {'/s':>8} {'esuate':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for nume, date in raport['journeys'].items():
+        print(f"{nume:<30} {date['count']:>8} {date['per_sec']:>8.1f} {date['errors']:>7} "
+              f"{date['p50_ms']:>9.1f} {date['p95_ms']:>9.1f} {date['p99_ms']:>9.1f}")
+    print()
+    print(f"Total: {raport['requests']} cereri in {raport['duration_s']:.0f}s "
+          f"({raport['requests_per_sec']:.1f} cereri/s), erori {raport['error_rate']:.2%}")
+    for nume, eroare in raport['error_samples'].items():
+        for exemplu in eroare['samples']:
+            print(f'  {nume}: {exemplu}')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Test de incarcare pentru frontend si backend')
+    parser.add_argument('--backend-url', help='backend-ul deja pornit (ex. http://127.0.0.1:5000)')
+    parser.add_argument('--frontend-url', help='frontend-ul deja pornit (ex. http://127.0.0.1:5001)')
+    parser.add_argument('--db', help='baza de date a stivei pornite de script (implicit una generata)')
+    parser.add_argument('--dataset-users', type=int, default=1000, help='utilizatorii bazei generate')
+    parser.add_argument('--user-count', type=int, help='numarul de utilizatori <prefix><numar> din baza tinta')
+    parser.add_argument('--username-prefix', default='user')
+    parser.add_argument('--password', default='parola123')
+    parser.add_argument('--vus', type=int, default=20, help='numarul de utilizatori virtuali concurenti')
+    parser.add_argument('--processes', type=int, default=min(4, os.cpu_count() or 1), help='procesele care genereaza incarcarea')
+    parser.add_argument('--duration', type=float, default=30, help='durata testului (secunde)')
+    parser.add_argument('--think-ms', type=float, default=0, help='pauza medie intre parcursuri (exponentiala)')
+    parser.add_argument('--mix', default=MIX_IMPLICIT, help=f'ponderile parcursurilor (implicit {MIX_IMPLICIT})')
+    parser.add_argument('--timeout', type=float, default=30, help='timeout-ul unei cereri (secunde)')
+    parser.add_argument('--tvmaze-latency-ms', type=float, default=50, help='latenta TVMaze-ului fals')
+    parser.add_argument('--backend-port', type=int, default=5100)
+    parser.add_argument('--frontend-port', type=int, default=5101)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='fisierul JSON in care se salveaza raportul')
+    parser.add_argument('--max-error-rate', type=float, default=0.01, help='rata de erori peste care scriptul se termina cu cod 1')
+    parser.add_argument('--keep', action='store_true', help='pastreaza directorul temporar (baza generata si logurile)')
+    args = parser.parse_args(argv)
+
+    try:
+        mix = citeste_mix(args.mix)
+    except ValueError as eroare:
+        parser.error(str(eroare))
+    stiva_externa = bool(args.backend_url or args.frontend_url)
+    if stiva_externa and not (args.backend_url and args.frontend_url and args.user_count):
+        parser.error('pentru o stiva deja pornita sunt necesare --backend-url, --frontend-url si --user-count')
+
+    director = tempfile.mkdtemp(prefix='movie-load-')
+    try:
+        return _ruleaza(args, mix, stiva_externa, director)
+    except RuntimeError as eroare:
+        print(f'Eroare: {eroare}')
+        return 1
+    finally:
+        if args.keep:
+            print(f'Directorul temporar a fost pastrat: {director}')
+        else:
+            shutil.rmtree(director, ignore_errors=True)
+
+def _ruleaza(args, mix, stiva_externa, director):
+    procese, tvmaze = [], None
+    if stiva_externa:
+        url_backend, url_frontend = args.backend_url.rstrip('/'), args.frontend_url.rstrip('/')
+        numar_utilizatori = args.user_count
+    else:
+        cale_db = args.db
+        if not cale_db:
+            import generate_dataset
+            cale_db = os.path.join(director, 'load.db')
+            generate_dataset.main(['--output', cale_db, '--users', str(args.dataset_users), '--avg-movies', '50',
+                                   '--avg-friends', '10', '--avg-recommendations', '5', '--titles', '5000',
+                                   '--seed', str(args.seed), '--password', args.password,
+                                   '--username-prefix', args.username_prefix])
+        numar_utilizatori = args.user_count
+        if not numar_utilizatori:
+            with sqlite3.connect(cale_db) as conn:
+                numar_utilizatori = conn.execute("SELECT COUNT(*) FROM users WHERE username LIKE ? || '%'",
+                                                 (args.username_prefix,)).fetchone()[0]
+        print(f'Pornire stiva (loguri in {director})...')
+        url_backend, url_frontend, procese, tvmaze = porneste_stiva(args, cale_db, director)
+
+    config = {
+        'backend_url': url_backend,
+        'frontend_url': url_frontend,
+        'user_count': numar_utilizatori,
+        'username_prefix': args.username_prefix,
+        'password': args.password,
+        'mix': mix,
+        'duration': args.duration,
+        'think': args.think_ms / 1000.0,
+        'timeout': args.timeout,
+        'seed': args.seed,
+    }
+
+    numar_procese = max(1, min(args.processes, args.vus))
+    print(f'{args.vus} utilizatori virtuali in {numar_procese} procese, {args.duration:g}s '
+          f'({url_frontend} / {url_backend})')
+    lucratori = []
+    try:
+        context = multiprocessing.get_context('spawn')
+        coada = context.Queue()
+        # Pornirea proceselor (spawn) dureaza; toate incep la acelasi moment
+        termen_start = time.time() + 1.0 + 0.2 * numar_procese
+        lucratori = [context.Process(target=proces_incarcare,
+                                     args=(config, list(range(index, args.vus, numar_procese)), termen_start, coada))
+                     for index in range(numar_procese)]
+        for lucrator in lucratori:
+            lucrator.start()
+        # Un parcurs inceput inainte de termen se poate termina cu cel mult un timeout de cerere mai tarziu
+        rezultate = colecteaza_rezultate(coada, lucratori, termen_start + args.duration + args.timeout + 30)
+        for lucrator in lucratori:
+            lucrator.join()
+    finally:
+        for lucrator in lucratori:
+            if lucrator.is_alive():
+                lucrator.terminate()
+        if procese:
+            opreste_stiva(procese, tvmaze)
+
+    raport = agrega(rezultate, args.duration)
+    raport['config'] = {'vus': args.vus, 'processes': numar_procese, 'mix': mix, 'users': numar_utilizatori,
+                        'think_ms': args.think_ms, 'tvmaze_latency_ms': None if stiva_externa else args.tvmaze_latency_ms}
+    afiseaza(raport)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fisier:
+            json.dump(raport, fisier, indent=2)
+        print(f'Raport salvat in {args.output}')
+    return 1 if raport['error_rate'] > args.max_error_rate else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
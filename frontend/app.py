@@ -15,6 +15,18 @@ app = Flask(__name__,
             static_folder='static')
 app.secret_key = 'movie_manager_secret_key_change_in_production'  # Pentru sessions
 
+# Conexiunile la baza de date (folosite direct de views) sunt eliberate la teardown
+from models.database import init_app
+init_app(app)
+
+# Urmarirea interogarilor SQL din views (doar cu MOVIE_MANAGER_SQL_TRACE activ)
+from models.sql_trace import instrumenteaza_sql
+instrumenteaza_sql(app)
+
+# Profilarea la cerere a unei singure pagini (doar cu MOVIE_MANAGER_PROFILE_KEY setat)
+from profiling import activeaza_profilare
+activeaza_profilare(app)
+
 # Importam view handlers
 from views import auth_views, dashboard_views, friend_views
 
@@ -1,10 +1,44 @@
 // url pentru cautare filme
 const MOVIE_SEARCH_URL = 'http://localhost:5000/api/search-movies';
+// url pentru sugestii dupa prefix (index in memorie, raspuns imediat)
+const MOVIE_SUGGEST_URL = 'http://localhost:5000/api/search-movies/suggest';
 
 // variabile pentru debounce la cautare
 let searchTimeout = null;
+let suggestTimeout = null;
 let currentSearchResults = [];
 
+// generatia cautarii curente (creste la fiecare tasta) si ultima generatie
+// pentru care au fost afisate rezultatele complete
+let searchGeneration = 0;
+let fullResultsGeneration = -1;
+
+// Afiseaza sugestiile dupa prefix pana sosesc rezultatele complete
+function suggestMovies(searchTerm, containerId) {
+    if (suggestTimeout) {
+        clearTimeout(suggestTimeout);
+    }
+    const generation = ++searchGeneration;
+    
+    suggestTimeout = setTimeout(async () => {
+        try {
+            const response = await fetch(`${MOVIE_SUGGEST_URL}?prefix=${encodeURIComponent(searchTerm.trim())}`);
+            const data = await response.json();
+            
+            // nu suprascriem rezultatele complete si nici o tasta mai noua
+            if (generation !== searchGeneration || fullResultsGeneration === generation) {
+                return;
+            }
+            if (data.suggestions && data.suggestions.length > 0) {
+                currentSearchResults = data.suggestions.map(title => ({Title: title, Year: '', Type: 'suggestion'}));
+                displaySearchResults(currentSearchResults, containerId);
+            }
+        } catch (error) {
+            // sugestiile sunt optionale, cautarea completa urmeaza oricum
+        }
+    }, 100);
+}
+
 // variabile pentru a salva filmele selectate
 let selectedMovieDashboard = null; // filmul selectat din dashboard
 let selectedMovieRecommend = null; // filmul selectat pentru recomandare
@@ -23,6 +57,10 @@ function searchMovies(searchTerm) {
         return;
     }
     
+    // afisam imediat sugestiile din indexul de titluri
+    suggestMovies(searchTerm, 'movie-search-results');
+    const generation = searchGeneration;
+    
     // asteptam 300ms inainte de a face request-ul
     searchTimeout = setTimeout(async () => {
         try {
@@ -34,6 +72,7 @@ function searchMovies(searchTerm) {
             if (data.Response === 'True' && data.Search) {
                 // salvam rezultatele
                 currentSearchResults = data.Search;
+                fullResultsGeneration = generation;
                 // afisam rezultatele in dropdown
                 displaySearchResults(currentSearchResults, 'movie-search-results');
             } else {
@@ -69,6 +108,10 @@ function searchMoviesRecommend(searchTerm) {
         return;
     }
     
+    // afisam imediat sugestiile din indexul de titluri
+    suggestMovies(searchTerm, 'movie-search-results-recommend');
+    const generation = searchGeneration;
+    
     // asteptam 300ms inainte de a face request-ul
     searchTimeout = setTimeout(async () => {
         try {
@@ -80,6 +123,7 @@ function searchMoviesRecommend(searchTerm) {
             if (data.Response === 'True' && data.Search) {
                 // salvam rezultatele
                 currentSearchResults = data.Search;
+                fullResultsGeneration = generation;
                 // afisam rezultatele in dropdown
                 displaySearchResults(currentSearchResults, 'movie-search-results-recommend');
             } else {
@@ -0,0 +1,117 @@
+// url pentru fluxul de recomandari noi (Server-Sent Events)
+const RECOMMENDATION_STREAM_URL = 'http://localhost:5000/api/recommendations/stream';
+
+// url pentru token-ul de flux: token-ul API nu este pus niciodata in url-ul EventSource
+const STREAM_TOKEN_URL = 'http://localhost:5000/api/recommendations/stream-token';
+
+// id-urile recomandarilor afisate deja (o reconectare poate retrimite cateva)
+const shownRecommendations = new Set();
+
+// Construieste cardul unei recomandari (acelasi markup ca in recommendations.html)
+function createRecommendationCard(rec, deleteUrlTemplate) {
+    const card = document.createElement('div');
+    card.className = 'recommendation-card';
+
+    const form = document.createElement('form');
+    form.method = 'POST';
+    form.action = deleteUrlTemplate.replace('/0/', `/${rec.id}/`);
+    form.style.display = 'inline';
+    form.style.float = 'right';
+    form.addEventListener('submit', function(event) {
+        event.preventDefault();
+        showConfirmDialog(`Are you sure you want to delete the recommendation for "${rec.movie_title}" from ${rec.from_username}?`, form);
+    });
+
+    const button = document.createElement('button');
+    button.type = 'submit';
+    button.className = 'recommendation-delete-btn';
+    button.title = 'Delete recommendation';
+    const icon = document.createElement('span');
+    icon.className = 'delete-icon';
+    icon.textContent = '×';
+    button.appendChild(icon);
+    form.appendChild(button);
+
+    const title = document.createElement('h4');
+    title.textContent = rec.movie_title;
+    const from = document.createElement('div');
+    from.className = 'recommendation-from';
+    from.textContent = `Recommended by: ${rec.from_username}`;
+
+    card.appendChild(form);
+    card.appendChild(title);
+    card.appendChild(from);
+    return card;
+}
+
+// Pauzele (ms) inainte de o noua conexiune, dupa ce serverul a refuzat fluxul
+// (token de flux expirat, 503 cand worker-ul are prea multe fluxuri); cresc pana la maxim
+const RECONNECT_MIN_DELAY_MS = 1000;
+const RECONNECT_MAX_DELAY_MS = 30000;
+
+// Cere un token de flux de scurta durata (header-ul Authorization nu ajunge in url)
+function fetchStreamToken(token) {
+    return fetch(STREAM_TOKEN_URL, {method: 'POST', headers: {'Authorization': token}})
+        .then(function(response) {
+            if (!response.ok) {
+                throw new Error(`stream-token: ${response.status}`);
+            }
+            return response.json();
+        })
+        .then(function(data) {
+            return data.token;
+        });
+}
+
+// Se aboneaza la recomandarile noi si le adauga in varful listei
+function subscribeToRecommendations(listId) {
+    const list = document.getElementById(listId);
+    if (!list || !window.EventSource || !window.fetch) {
+        return;
+    }
+    const token = list.dataset.token;
+    const deleteUrlTemplate = list.dataset.deleteUrl;
+    let lastId = list.dataset.lastId || '0';
+    let delay = RECONNECT_MIN_DELAY_MS;
+
+    function retry() {
+        setTimeout(connect, delay);
+        delay = Math.min(delay * 2, RECONNECT_MAX_DELAY_MS);
+    }
+
+    function connect() {
+        fetchStreamToken(token).then(function(streamToken) {
+            const source = new EventSource(`${RECOMMENDATION_STREAM_URL}?token=${encodeURIComponent(streamToken)}&after=${lastId}`);
+            source.addEventListener('open', function() {
+                delay = RECONNECT_MIN_DELAY_MS;
+            });
+            source.addEventListener('recommendation', function(event) {
+                const rec = JSON.parse(event.data);
+                // id-ul SSE: toate recomandarile pana la el au fost primite (ca Last-Event-ID)
+                if (event.lastEventId) {
+                    lastId = event.lastEventId;
+                }
+                if (shownRecommendations.has(rec.id)) {
+                    return;
+                }
+                shownRecommendations.add(rec.id);
+
+                // eliminam mesajul "No recommendations yet."
+                const empty = list.querySelector('.recommendations-empty');
+                if (empty) {
+                    empty.remove();
+                }
+                list.insertBefore(createRecommendationCard(rec, deleteUrlTemplate), list.firstChild);
+            });
+            // Dupa o eroare de retea browserul se reconecteaza singur, cu acelasi url; un raspuns
+            // refuzat (token expirat, 503) inchide insa fluxul: cerem un token nou, dupa o pauza
+            source.addEventListener('error', function() {
+                if (source.readyState === EventSource.CLOSED) {
+                    retry();
+                }
+            });
+        }).catch(retry);
+    }
+
+    connect();
+}
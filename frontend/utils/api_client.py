@@ -1,166 +1,337 @@
 import requests
+from requests.adapters import HTTPAdapter
 import os
+import sys
+import threading
+
+# Importam din backend (cache-ul LRU)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BACKEND_DIR = os.path.join(BASE_DIR, 'backend')
+sys.path.insert(0, BACKEND_DIR)
+from cache import CacheLRU, LIPSA
 
 # URL-ul backend API
 API_URL = os.getenv('BACKEND_API_URL', 'http://localhost:5000/api')
 
+# Numarul de conexiuni keep-alive pastrate catre backend
+POOL_SIZE = int(os.getenv('BACKEND_API_POOL', '16'))
+
+# Timeout-uri (secunde) pentru conectare si pentru citirea raspunsului
+CONNECT_TIMEOUT = float(os.getenv('BACKEND_API_CONNECT_TIMEOUT', '3'))
+READ_TIMEOUT = float(os.getenv('BACKEND_API_READ_TIMEOUT', '10'))
+
+# Numarul maxim de raspunsuri pastrate pentru GET-urile conditionale (per client)
+ETAG_CACHE_SIZE = int(os.getenv('BACKEND_API_ETAG_CACHE', '32'))
+
+# Parametrii pentru care raspunsul nu este pastrat: paginile urmatoare ale unei parcurgeri
+# (cursor) si delta-urile sync() (since) sunt citite o singura data, iar pastrarea lor ar
+# tine in memorie toata biblioteca
+UNCACHED_PARAMS = ('cursor', 'since')
+
+# Session-ul HTTP partajat de toti clientii (refoloseste conexiunile TCP)
+_session = None
+_session_lock = threading.Lock()
+
+# Returneaza session-ul partajat, creandu-l la primul apel
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
 # Client pentru apelarea backend API
 class APIClient:
-    
-    def __init__(self, token=None):
+
+    def __init__(self, token=None, session=None):
         self.token = token
         self.base_url = API_URL
-    
+        self.session = session or get_session()
+        self.timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+        # Ultimul ETag si raspunsul primit pentru GET-urile repetate (pentru If-None-Match),
+        # marginit ca dimensiune; ETag-ul este revalidat la fiecare cerere, deci TTL-ul doar elibereaza memoria
+        self._etag_cache = CacheLRU(dimensiune_maxima=ETAG_CACHE_SIZE, ttl=3600)
+        # Copia locala a bibliotecii, actualizata incremental de sync()
+        self.library = {'version': 0, 'movies': {}, 'recommendations': {}}
+
     # Returneaza header-ele pentru request-uri
     def _get_headers(self):
         headers = {'Content-Type': 'application/json'}
         if self.token:
             headers['Authorization'] = self.token
         return headers
-    
+
+    # Trimite un request catre backend folosind session-ul partajat
+    def _request(self, method, path, **kwargs):
+        return self.session.request(
+            method,
+            f'{self.base_url}{path}',
+            headers=self._get_headers(),
+            timeout=self.timeout,
+            **kwargs
+        )
+
+    # GET conditional: trimite If-None-Match cu ultimul ETag primit pentru aceeasi
+    # cale si, la 304 Not Modified, returneaza datele pastrate local
+    # Cererile cu cursor sau since nu sunt conditionale (vezi UNCACHED_PARAMS)
+    # Returneaza (status, data), cu status 200 si pentru raspunsurile 304
+    def _get_json(self, path, params=None):
+        params = params or {}
+        cacheable = not any(name in params for name in UNCACHED_PARAMS)
+        key = (self.token, path, tuple(sorted(params.items())))
+        cached = self._etag_cache.obtine(key) if cacheable else LIPSA
+        headers = self._get_headers()
+        if cached is not LIPSA:
+            headers['If-None-Match'] = cached[0]
+
+        response = self.session.get(
+            f'{self.base_url}{path}',
+            headers=headers,
+            params=params,
+            timeout=self.timeout
+        )
+        if response.status_code == 304 and cached is not LIPSA:
+            return 200, cached[1]
+
+        data = response.json() if response.content else None
+        etag = response.headers.get('ETag')
+        if cacheable and response.status_code == 200 and etag:
+            self._etag_cache.seteaza(key, (etag, data))
+        return response.status_code, data
+
+    # Batch
+    # Trimite mai multe apeluri intr-un singur request HTTP
+    # calls: lista de tupluri (method, path) sau (method, path, body)
+    # Returneaza o lista de tupluri (status, data), in aceeasi ordine
+    def batch(self, calls):
+        requests_list = []
+        for call in calls:
+            method, path = call[0], call[1]
+            item = {'method': method, 'path': path}
+            if len(call) > 2 and call[2] is not None:
+                item['body'] = call[2]
+            requests_list.append(item)
+
+        response = self._request('POST', '/batch', json={'requests': requests_list})
+        if response.status_code != 200:
+            data = response.json() if response.content else {}
+            return [(response.status_code, data) for _ in calls]
+        return [(item['status'], item['body']) for item in response.json()['responses']]
+
     # Auth methods
     # Login utilizator
     def login(self, username, password):
-        response = requests.post(
-            f'{self.base_url}/login',
-            json={'username': username, 'password': password},
-            headers=self._get_headers()
-        )
+        response = self._request('POST', '/login', json={'username': username, 'password': password})
         if response.status_code == 200:
             data = response.json()
             self.token = data.get('token')
             return True, data
         return False, response.json() if response.content else {'message': 'Login failed'}
-    
+
     # Inregistrare utilizator nou
     def register(self, username, password):
-        response = requests.post(
-            f'{self.base_url}/register',
-            json={'username': username, 'password': password},
-            headers=self._get_headers()
-        )
+        response = self._request('POST', '/register', json={'username': username, 'password': password})
         data = response.json() if response.content else {}
         return response.status_code == 201, data
-    
+
     # Obtine username-ul utilizatorului curent
     def get_username(self):
-        response = requests.get(
-            f'{self.base_url}/user/username',
-            headers=self._get_headers()
-        )
+        response = self._request('GET', '/user/username')
         if response.status_code == 200:
             return True, response.json()
         return False, {}
-    
+
     # Movie methods
     # Obtine toate filmele utilizatorului
     def get_movies(self):
-        response = requests.get(
-            f'{self.base_url}/movies',
-            headers=self._get_headers()
-        )
-        if response.status_code == 200:
-            return True, response.json()
+        status, data = self._get_json('/movies')
+        if status == 200:
+            return True, data
         return False, {}
-    
+
+    # Parcurge filmele utilizatorului pagina cu pagina (cursor)
+    # Genereaza dictionare {'id', 'title', 'rating', 'status'}
+    def iter_movies(self, page_size=100):
+        return self._iter_movie_pages('/movies', page_size)
+
+    # Parcurge paginile unei liste de filme grupate pe status
+    def _iter_movie_pages(self, path, page_size):
+        cursor = None
+        while True:
+            params = {'limit': page_size}
+            if cursor:
+                params['cursor'] = cursor
+            status_code, data = self._get_json(path, params)
+            if status_code != 200:
+                return
+            for status, movies in data['movies'].items():
+                for movie in movies:
+                    yield dict(movie, status=status)
+            cursor = data.get('next_cursor')
+            if not cursor:
+                return
+
+    # Obtine datele dashboard-ului intr-un singur request: filmele grupate pe liste,
+    # prietenii si numarul de recomandari primite (acelasi snapshot)
+    def get_dashboard(self):
+        status, data = self._get_json('/dashboard')
+        if status == 200:
+            return True, data
+        return False, data or {}
+
+    # Sincronizare incrementala
+    # Aduce doar modificarile de la ultima sincronizare si le aplica pe copia locala
+    # (self.library: version, movies si recommendations indexate dupa id)
+    # Returneaza (True, library) sau (False, data) daca request-ul a esuat
+    def sync(self):
+        library = self.library
+        status, data = self._get_json('/movies/changes', {'since': library['version']})
+        if status != 200:
+            return False, data or {}
+        if data['version'] == library['version'] and not data['full']:
+            return True, library
+
+        if data['full']:
+            library['movies'].clear()
+            library['recommendations'].clear()
+        for name in ('movies', 'recommendations'):
+            items = library[name]
+            for item in data[name]['upserted']:
+                items[item['id']] = item
+            for item_id in data[name]['deleted']:
+                items.pop(item_id, None)
+        library['version'] = data['version']
+        return True, library
+
     # Adauga un film nou
     def add_movie(self, title, status='To Watch'):
-        response = requests.post(
-            f'{self.base_url}/movies',
-            json={'title': title, 'status': status},
-            headers=self._get_headers()
-        )
+        response = self._request('POST', '/movies', json={'title': title, 'status': status})
         data = response.json() if response.content else {}
         return response.status_code == 201, data
-    
+
     # Muta un film intre liste
     def move_movie(self, movie_id, new_list):
-        response = requests.put(
-            f'{self.base_url}/movies/{movie_id}/move',
-            json={'new_list': new_list},
-            headers=self._get_headers()
-        )
+        response = self._request('PUT', f'/movies/{movie_id}/move', json={'new_list': new_list})
         data = response.json() if response.content else {}
         return response.status_code == 200, data
-    
+
     # Noteaza un film
     def rate_movie(self, movie_id, rating):
-        response = requests.put(
-            f'{self.base_url}/movies/{movie_id}/rate',
-            json={'rating': str(rating)},
-            headers=self._get_headers()
-        )
+        response = self._request('PUT', f'/movies/{movie_id}/rate', json={'rating': str(rating)})
         data = response.json() if response.content else {}
         return response.status_code == 200, data
-    
+
     # Sterge un film
     def delete_movie(self, movie_id):
-        response = requests.delete(
-            f'{self.base_url}/movies/{movie_id}',
-            headers=self._get_headers()
+        response = self._request('DELETE', f'/movies/{movie_id}')
+        data = response.json() if response.content else {}
+        return response.status_code == 200, data
+
+    # Aplica mai multe operatii pe filme (add/move/rate/delete) intr-o singura tranzactie
+    def batch_movies(self, operations):
+        response = self._request('POST', '/movies/batch', json={'operations': operations})
+        data = response.json() if response.content else {}
+        return response.status_code == 200, data
+
+    # Importa filme dintr-un fisier CSV sau JSON Lines, trimis in streaming
+    # data: fisier deschis in mod binar, bytes sau un generator de bytes
+    # Returneaza (True, {'imported', 'skipped', 'errors'}) sau (False, data)
+    def import_movies(self, data, fmt='csv'):
+        headers = self._get_headers()
+        headers['Content-Type'] = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+        response = self.session.post(
+            f'{self.base_url}/movies/import',
+            headers=headers,
+            params={'format': fmt},
+            data=data,
+            timeout=(CONNECT_TIMEOUT, None)
         )
+        result = response.json() if response.content else {}
+        return response.status_code == 200, result
+
+    # Exporta biblioteca in format CSV sau JSON Lines
+    # Genereaza liniile pe masura ce sosesc (fara a incarca tot raspunsul in memorie)
+    def export_movies(self, fmt='csv'):
+        with self.session.get(
+            f'{self.base_url}/movies/export',
+            headers=self._get_headers(),
+            params={'format': fmt},
+            stream=True,
+            timeout=self.timeout
+        ) as response:
+            response.raise_for_status()
+            response.encoding = 'utf-8'
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    yield line
+
+    # Cauta filme (TVMaze sau catalogul local, in functie de configurarea backend-ului)
+    def search_movies(self, term):
+        response = self._request('GET', '/search-movies', params={'s': term})
         data = response.json() if response.content else {}
         return response.status_code == 200, data
-    
+
     # Friend methods
     # Obtine lista de prieteni
     def get_friends(self):
-        response = requests.get(
-            f'{self.base_url}/friends',
-            headers=self._get_headers()
-        )
-        if response.status_code == 200:
-            return True, response.json()
+        status, data = self._get_json('/friends')
+        if status == 200:
+            return True, data
         return False, []
-    
+
     # Adauga un prieten
     def add_friend(self, friend_username):
-        response = requests.post(
-            f'{self.base_url}/friends/add',
-            json={'friend_username': friend_username},
-            headers=self._get_headers()
-        )
+        response = self._request('POST', '/friends/add', json={'friend_username': friend_username})
         data = response.json() if response.content else {}
         return response.status_code == 201, data
-    
+
     # Obtine filmele unui prieten
     def get_friend_movies(self, friend_username):
-        response = requests.get(
-            f'{self.base_url}/friends/{friend_username}/movies',
-            headers=self._get_headers()
-        )
-        if response.status_code == 200:
-            return True, response.json()
-        data = response.json() if response.content else {}
-        return False, data
-    
+        status, data = self._get_json(f'/friends/{friend_username}/movies')
+        if status == 200:
+            return True, data
+        return False, data or {}
+
+    # Parcurge filmele unui prieten pagina cu pagina (cursor)
+    def iter_friend_movies(self, friend_username, page_size=100):
+        return self._iter_movie_pages(f'/friends/{friend_username}/movies', page_size)
+
     # Recommendation methods
     # Obtine recomandarile primite
     def get_recommendations(self):
-        response = requests.get(
-            f'{self.base_url}/recommendations',
-            headers=self._get_headers()
-        )
-        if response.status_code == 200:
-            return True, response.json()
+        status, data = self._get_json('/recommendations')
+        if status == 200:
+            return True, data
         return False, []
-    
+
+    # Parcurge recomandarile primite pagina cu pagina (cursor)
+    def iter_recommendations(self, page_size=100):
+        cursor = None
+        while True:
+            params = {'limit': page_size}
+            if cursor:
+                params['cursor'] = cursor
+            status, data = self._get_json('/recommendations', params)
+            if status != 200:
+                return
+            yield from data['recommendations']
+            cursor = data.get('next_cursor')
+            if not cursor:
+                return
+
     # Trimite o recomandare
     def recommend_movie(self, friend_username, movie_title):
-        response = requests.post(
-            f'{self.base_url}/friends/recommend',
-            json={'friend_username': friend_username, 'movie_title': movie_title},
-            headers=self._get_headers()
-        )
+        response = self._request('POST', '/friends/recommend', json={'friend_username': friend_username, 'movie_title': movie_title})
         data = response.json() if response.content else {}
         return response.status_code == 201, data
-    
+
     # Sterge o recomandare
     def delete_recommendation(self, recommendation_id):
-        response = requests.delete(
-            f'{self.base_url}/recommendations/{recommendation_id}',
-            headers=self._get_headers()
-        )
+        response = self._request('DELETE', f'/recommendations/{recommendation_id}')
         data = response.json() if response.content else {}
         return response.status_code == 200, data
-
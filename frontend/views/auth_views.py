@@ -41,11 +41,11 @@ def login():
     
     # Apelam direct baza de date pentru autentificare
     from models.database import get_db_connection
+    from models.repository import utilizator_dupa_nume
     from werkzeug.security import check_password_hash
     
     conn = get_db_connection()
-    user = conn.execute('SELECT * FROM users WHERE username = ?', (username,)).fetchone()
-    conn.close()
+    user = utilizator_dupa_nume(conn, username)
     
     if user and check_password_hash(user['password'], password):
         # Setam session
@@ -85,25 +85,22 @@ def register():
     
     # Apelam direct baza de date pentru inregistrare
     from models.database import get_db_connection
+    from models.repository import creeaza_utilizator
     from werkzeug.security import generate_password_hash
     import sqlite3
     
     conn = get_db_connection()
     try:
         password_hash = generate_password_hash(password)
-        conn.execute('INSERT INTO users (username, password) VALUES (?, ?)', 
-                    (username, password_hash))
+        creeaza_utilizator(conn, username, password_hash)
         conn.commit()
-        conn.close()
         
         flash('Account created successfully! Please login.', 'success')
         return redirect(url_for('auth.show_login'))
     except sqlite3.IntegrityError:
-        conn.close()
         flash('Username already exists', 'error')
         return render_template('register.html')
     except Exception as e:
-        conn.close()
         flash('Registration error', 'error')
         return render_template('register.html')
 
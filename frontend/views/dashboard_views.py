@@ -8,6 +8,8 @@ BACKEND_DIR = os.path.join(BASE_DIR, 'backend')
 sys.path.insert(0, BACKEND_DIR)
 
 from models.database import get_db_connection
+from models.repository import date_dashboard, are_film, adauga_film, muta_film, noteaza_film, sterge_film
+from services.pagination import LIMITA_IMPLICITA
 
 # Importam validators din frontend
 FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,42 +35,15 @@ def show_dashboard():
     user_id = session['user_id']
     username = session.get('username', 'User')
     
-    # Obtinem filmele din baza de date
+    # Obtinem filmele (organizate pe liste, citite pagina cu pagina) si prietenii pentru sidebar,
+    # din acelasi snapshot
     conn = get_db_connection()
-    movies_data = conn.execute(
-        'SELECT id, title, status, rating FROM movies WHERE user_id = ?',
-        (user_id,)
-    ).fetchall()
-    conn.close()
-    
-    # Organizam filmele pe liste
-    movies = {'To Watch': [], 'Watching': [], 'Completed': []}
-    for row in movies_data:
-        status = row['status']
-        if status in movies:
-            rating = row['rating'] if row['rating'] and row['rating'] != '-' else None
-            movies[status].append({
-                'id': row['id'],
-                'title': row['title'],
-                'rating': rating
-            })
-    
-    # Obtinem lista de prieteni pentru sidebar
-    conn = get_db_connection()
-    friends_data = conn.execute('''
-        SELECT DISTINCT u.username 
-        FROM users u
-        INNER JOIN friends f ON (f.friend_id = u.id AND f.user_id = ?) OR (f.user_id = u.id AND f.friend_id = ?)
-        WHERE u.id != ?
-    ''', (user_id, user_id, user_id)).fetchall()
-    conn.close()
-    
-    friends = [friend['username'] for friend in friends_data]
+    data = date_dashboard(conn, user_id, rating_lipsa=None, dimensiune_pagina=LIMITA_IMPLICITA)
     
     return render_template('dashboard.html', 
-                         movies=movies, 
+                         movies=data['movies'], 
                          username=username,
-                         friends=friends)
+                         friends=data['friends'])
 
 @dashboard_bp.route('/movies/add', methods=['POST'])
 # Adauga un film nou
@@ -99,27 +74,16 @@ def add_movie():
     
     # Verificam daca filmul exista deja pentru acest utilizator
     conn = get_db_connection()
-    existing_movie = conn.execute(
-        'SELECT id FROM movies WHERE user_id = ? AND title = ?',
-        (user_id, title)
-    ).fetchone()
-    
-    if existing_movie:
-        conn.close()
+    if are_film(conn, user_id, title):
         flash('This movie already exists in your list!', 'error')
         return redirect(url_for('dashboard.show_dashboard'))
     
     # Adaugam filmul in baza de date
     try:
-        conn.execute(
-            'INSERT INTO movies (user_id, title, status, rating) VALUES (?, ?, ?, ?)',
-            (user_id, title, status, '-')
-        )
+        adauga_film(conn, user_id, title, status)
         conn.commit()
-        conn.close()
         flash('Movie added successfully!', 'success')
     except Exception as e:
-        conn.close()
         flash('Error adding movie', 'error')
     
     return redirect(url_for('dashboard.show_dashboard'))
@@ -139,24 +103,11 @@ def move_movie(movie_id):
         return redirect(url_for('dashboard.show_dashboard'))
     
     conn = get_db_connection()
-    # Verificam ca filmul apartine utilizatorului
-    movie = conn.execute(
-        'SELECT id FROM movies WHERE id = ? AND user_id = ?',
-        (movie_id, user_id)
-    ).fetchone()
-    
-    if not movie:
-        conn.close()
+    # Actualizam statusul (doar daca filmul apartine utilizatorului)
+    if not muta_film(conn, user_id, movie_id, new_status):
         flash('Movie not found', 'error')
         return redirect(url_for('dashboard.show_dashboard'))
-    
-    # Actualizam statusul
-    conn.execute(
-        'UPDATE movies SET status = ? WHERE id = ? AND user_id = ?',
-        (new_status, movie_id, user_id)
-    )
     conn.commit()
-    conn.close()
     
     flash(f'Movie moved to {new_status} successfully!', 'success')
     return redirect(url_for('dashboard.show_dashboard'))
@@ -178,24 +129,11 @@ def rate_movie(movie_id):
         return redirect(url_for('dashboard.show_dashboard'))
     
     conn = get_db_connection()
-    # Verificam ca filmul apartine utilizatorului
-    movie = conn.execute(
-        'SELECT id FROM movies WHERE id = ? AND user_id = ?',
-        (movie_id, user_id)
-    ).fetchone()
-    
-    if not movie:
-        conn.close()
+    # Actualizam rating-ul (doar daca filmul apartine utilizatorului)
+    if not noteaza_film(conn, user_id, movie_id, rating):
         flash('Movie not found', 'error')
         return redirect(url_for('dashboard.show_dashboard'))
-    
-    # Actualizam rating-ul
-    conn.execute(
-        'UPDATE movies SET rating = ? WHERE id = ? AND user_id = ?',
-        (rating, movie_id, user_id)
-    )
     conn.commit()
-    conn.close()
     
     flash(f'Movie rated {rating}/10!', 'success')
     return redirect(url_for('dashboard.show_dashboard'))
@@ -210,24 +148,11 @@ def delete_movie(movie_id):
     user_id = session['user_id']
     
     conn = get_db_connection()
-    # Verificam ca filmul apartine utilizatorului
-    movie = conn.execute(
-        'SELECT id FROM movies WHERE id = ? AND user_id = ?',
-        (movie_id, user_id)
-    ).fetchone()
-    
-    if not movie:
-        conn.close()
+    # Stergem filmul (doar daca apartine utilizatorului)
+    if not sterge_film(conn, user_id, movie_id):
         flash('Movie not found', 'error')
         return redirect(url_for('dashboard.show_dashboard'))
-    
-    # Stergem filmul
-    conn.execute(
-        'DELETE FROM movies WHERE id = ? AND user_id = ?',
-        (movie_id, user_id)
-    )
     conn.commit()
-    conn.close()
     
     flash('Movie deleted successfully!', 'success')
     return redirect(url_for('dashboard.show_dashboard'))
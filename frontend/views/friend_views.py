@@ -8,6 +8,9 @@ BACKEND_DIR = os.path.join(BASE_DIR, 'backend')
 sys.path.insert(0, BACKEND_DIR)
 
 from models.database import get_db_connection
+from models.repository import (id_utilizator, lista_prieteni, sunt_prieteni, adauga_prietenie, filme_pe_liste,
+                               itereaza_recomandari, adauga_recomandare, sterge_recomandare, tranzactie_citire)
+from services.pagination import LIMITA_IMPLICITA
 
 # Importam validators din frontend
 FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -34,15 +37,7 @@ def show_friends():
     
     # Obtinem lista de prieteni
     conn = get_db_connection()
-    friends_data = conn.execute('''
-        SELECT DISTINCT u.username 
-        FROM users u
-        INNER JOIN friends f ON (f.friend_id = u.id AND f.user_id = ?) OR (f.user_id = u.id AND f.friend_id = ?)
-        WHERE u.id != ?
-    ''', (user_id, user_id, user_id)).fetchall()
-    conn.close()
-    
-    friends = [friend['username'] for friend in friends_data]
+    friends = lista_prieteni(conn, user_id)
     
     return render_template('friends.html', friends=friends)
 
@@ -65,41 +60,28 @@ def add_friend():
     conn = get_db_connection()
     
     # Cautam utilizatorul prieten
-    friend_user = conn.execute('SELECT id FROM users WHERE username = ?', (friend_username,)).fetchone()
+    friend_id = id_utilizator(conn, friend_username)
     
-    if not friend_user:
-        conn.close()
+    if not friend_id:
         flash('User not found', 'error')
         return redirect(url_for('friend.show_friends'))
     
-    friend_id = friend_user['id']
-    
     # Verificam daca nu incearca sa se adauge pe sine
     if user_id == friend_id:
-        conn.close()
         flash('You cannot add yourself', 'error')
         return redirect(url_for('friend.show_friends'))
     
     # Verificam daca prietenia exista deja
-    existing = conn.execute('''
-        SELECT id FROM friends 
-        WHERE (user_id = ? AND friend_id = ?) OR (user_id = ? AND friend_id = ?)
-    ''', (user_id, friend_id, friend_id, user_id)).fetchone()
-    
-    if existing:
-        conn.close()
+    if sunt_prieteni(conn, user_id, friend_id):
         flash('Friendship already exists', 'error')
         return redirect(url_for('friend.show_friends'))
     
     # Adaugam prietenia (bidirectionala)
     try:
-        conn.execute('INSERT INTO friends (user_id, friend_id) VALUES (?, ?)', (user_id, friend_id))
-        conn.execute('INSERT INTO friends (user_id, friend_id) VALUES (?, ?)', (friend_id, user_id))
+        adauga_prietenie(conn, user_id, friend_id)
         conn.commit()
-        conn.close()
         flash('Friend added successfully!', 'success')
     except Exception as e:
-        conn.close()
         flash('Error adding friend', 'error')
     
     return redirect(url_for('friend.show_friends'))
@@ -115,44 +97,19 @@ def show_friend_profile(username):
     
     # Verificam daca prietenia exista
     conn = get_db_connection()
-    friend_user = conn.execute('SELECT id FROM users WHERE username = ?', (username,)).fetchone()
+    friend_id = id_utilizator(conn, username)
     
-    if not friend_user:
-        conn.close()
+    if not friend_id:
         flash('User not found', 'error')
         return redirect(url_for('friend.show_friends'))
     
-    friend_id = friend_user['id']
-    
     # Verificam prietenia
-    friendship = conn.execute('''
-        SELECT id FROM friends 
-        WHERE (user_id = ? AND friend_id = ?) OR (user_id = ? AND friend_id = ?)
-    ''', (user_id, friend_id, friend_id, user_id)).fetchone()
-    
-    if not friendship:
-        conn.close()
+    if not sunt_prieteni(conn, user_id, friend_id):
         flash('You are not friends with this user', 'error')
         return redirect(url_for('friend.show_friends'))
     
-    # Obtinem filmele prietenului
-    movies_data = conn.execute(
-        'SELECT id, title, status, rating FROM movies WHERE user_id = ? ORDER BY status, title',
-        (friend_id,)
-    ).fetchall()
-    conn.close()
-    
-    # Organizam filmele pe liste
-    movies = {'To Watch': [], 'Watching': [], 'Completed': []}
-    for row in movies_data:
-        status = row['status']
-        if status in movies:
-            rating = row['rating'] if row['rating'] and row['rating'] != '-' else None
-            movies[status].append({
-                'id': row['id'],
-                'title': row['title'],
-                'rating': rating
-            })
+    # Obtinem filmele prietenului, organizate pe liste (citite pagina cu pagina)
+    movies = filme_pe_liste(conn, friend_id, rating_lipsa=None, dimensiune_pagina=LIMITA_IMPLICITA)
     
     return render_template('friend_profile.html', friend_username=username, movies=movies)
 
@@ -181,35 +138,21 @@ def recommend_movie(username):
     conn = get_db_connection()
     
     # Verificam prietenia
-    friend_user = conn.execute('SELECT id FROM users WHERE username = ?', (username,)).fetchone()
-    if not friend_user:
-        conn.close()
+    friend_id = id_utilizator(conn, username)
+    if not friend_id:
         flash('User not found', 'error')
         return redirect(url_for('friend.show_friends'))
     
-    friend_id = friend_user['id']
-    
-    friendship = conn.execute('''
-        SELECT id FROM friends 
-        WHERE (user_id = ? AND friend_id = ?) OR (user_id = ? AND friend_id = ?)
-    ''', (user_id, friend_id, friend_id, user_id)).fetchone()
-    
-    if not friendship:
-        conn.close()
+    if not sunt_prieteni(conn, user_id, friend_id):
         flash('You are not friends with this user', 'error')
         return redirect(url_for('friend.show_friends'))
     
     # Adaugam recomandarea
     try:
-        conn.execute(
-            'INSERT INTO recommendations (from_user_id, to_user_id, movie_title) VALUES (?, ?, ?)',
-            (user_id, friend_id, movie_title)
-        )
+        adauga_recomandare(conn, user_id, friend_id, movie_title)
         conn.commit()
-        conn.close()
         flash('Recommendation sent successfully!', 'success')
     except Exception as e:
-        conn.close()
         flash('Error sending recommendation', 'error')
     
     return redirect(url_for('friend.show_friend_profile', username=username))
@@ -223,25 +166,17 @@ def show_recommendations():
     
     user_id = session['user_id']
     
-    # Obtinem recomandarile
+    # Obtinem recomandarile, pagina cu pagina, din acelasi snapshot
     conn = get_db_connection()
-    recommendations_data = conn.execute('''
-        SELECT r.id, r.movie_title, u.username as from_username
-        FROM recommendations r
-        INNER JOIN users u ON r.from_user_id = u.id
-        WHERE r.to_user_id = ?
-        ORDER BY r.id DESC
-    ''', (user_id,)).fetchall()
-    conn.close()
-    
-    recommendations = [
-        {
-            'id': rec['id'],
-            'movie_title': rec['movie_title'],
-            'from_username': rec['from_username']
-        }
-        for rec in recommendations_data
-    ]
+    with tranzactie_citire(conn):
+        recommendations = [
+            {
+                'id': rec['id'],
+                'movie_title': rec['movie_title'],
+                'from_username': rec['from_username']
+            }
+            for rec in itereaza_recomandari(conn, user_id, LIMITA_IMPLICITA)
+        ]
     
     return render_template('recommendations.html', recommendations=recommendations)
 
@@ -256,24 +191,11 @@ def delete_recommendation(recommendation_id):
     
     conn = get_db_connection()
     
-    # Verificam ca recomandarea apartine utilizatorului
-    rec = conn.execute(
-        'SELECT id FROM recommendations WHERE id = ? AND to_user_id = ?',
-        (recommendation_id, user_id)
-    ).fetchone()
-    
-    if not rec:
-        conn.close()
+    # Stergem recomandarea (doar daca apartine utilizatorului)
+    if not sterge_recomandare(conn, user_id, recommendation_id):
         flash('Recommendation not found', 'error')
         return redirect(url_for('friend.show_recommendations'))
-    
-    # Stergem recomandarea
-    conn.execute(
-        'DELETE FROM recommendations WHERE id = ? AND to_user_id = ?',
-        (recommendation_id, user_id)
-    )
     conn.commit()
-    conn.close()
     
     flash('Recommendation deleted successfully!', 'success')
     return redirect(url_for('friend.show_recommendations'))
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Server de productie pentru backend si frontend (folosit de start.py --prod)
+Procesul principal (Supraveghetor) deschide cate un socket de ascultare pentru fiecare
+aplicatie si porneste N procese worker care il mostenesc si accepta conexiuni din el.
+Fiecare worker serveste cererile cu un numar fix de thread-uri si accepta o conexiune
+noua doar cand are un thread liber, asa ca un worker ocupat lasa conexiunile celorlalti.
+
+Sanatatea worker-ilor:
+    - fiecare worker verifica periodic aplicatia (GET /api/health, respectiv GET /) si
+      atinge un fisier de heartbeat doar daca bucla de acceptare merge si aplicatia raspunde;
+      verificarea nu este numarata in metricile HTTP
+    - supraveghetorul reporneste worker-ii care s-au oprit sau al caror heartbeat este mai
+      vechi decat timeout-ul (cu asteptare crescatoare daca un worker cade imediat la pornire)
+
+Starea din memorie este per worker:
+    - metricile de la /api/metrics au eticheta worker="backend-N" (MOVIE_MANAGER_WORKER)
+    - cache-urile (token-uri, cautari) expira dupa TTL-ul lor in fiecare worker
+    - fluxurile SSE deschise sunt limitate la --threads - 2 (peste limita raspund 503 cu
+      Retry-After), ca thread-urile ramase sa serveasca in continuare celelalte cereri
+    - token-urile de flux SSE sunt semnate cu o cheie comuna, generata de supraveghetor
+      (MOVIE_MANAGER_STREAM_SECRET), deci sunt acceptate de orice worker
+    - recomandarile publicate de alt worker ajung la fluxurile SSE prin baza de date:
+      cu mai multi worker-i, versiunea de date este verificata la fiecare
+      MOVIE_MANAGER_SSE_POLL secunde (implicit 1)
+
+Oprirea (SIGTERM / SIGINT) este gradata: worker-ii nu mai accepta conexiuni, inchid
+conexiunile keep-alive inactive, termina cererile in curs (fluxurile SSE sunt inchise la
+urmatorul mesaj, iar browserul se reconecteaza) si ies; dupa timpul de gratie sunt opriti fortat.
+
+Functioneaza doar pe sisteme POSIX (socket-ul este transmis worker-ilor prin pass_fds).
+"""
+import argparse
+import logging
+import os
+import secrets
+import select
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.absolute()
+
+# Aplicatiile servite: directorul si calea verificata la heartbeat
+APLICATII = {
+    'backend': {'nume': 'Backend', 'director': BASE_DIR / 'backend', 'sanatate': '/api/health'},
+    'frontend': {'nume': 'Frontend', 'director': BASE_DIR / 'frontend', 'sanatate': '/'},
+}
+
+# Timpul maxim (secunde) de asteptare a unei cereri pe o conexiune noua
+TIMEOUT_CERERE = 30
+
+# Intervalul (secunde) la care bucla de acceptare verifica oprirea
+INTERVAL_ACCEPTARE = 0.5
+
+# Asteptarea maxima (secunde) inainte de repornirea unui worker care cade la pornire
+ASTEPTARE_MAXIMA_REPORNIRE = 30
+
+# Intervalul implicit (secunde) de verificare a recomandarilor din alti worker-i (SSE)
+INTERVAL_SSE_WORKERI = '1'
+
+# Thread-urile unui worker care nu pot fi ocupate de fluxuri SSE (raman pentru celelalte cereri)
+THREADURI_REZERVATE = 2
+
+logger = logging.getLogger('movie_manager.serving')
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+def _clasa_handler():
+    # Importat aici: supraveghetorul nu are nevoie de werkzeug
+    from werkzeug.serving import WSGIRequestHandler
+
+    class HandlerCereri(WSGIRequestHandler):
+        """
+        Handler cu keep-alive limitat: o conexiune inactiva tine ocupat un thread
+        cel mult keep_alive secunde, iar la oprire este inchisa imediat
+        """
+
+        def setup(self):
+            super().setup()
+            self.cereri_servite = 0
+
+        def handle_one_request(self):
+            server = self.server
+            if self.cereri_servite and not server.keep_alive:
+                self.close_connection = True
+                return
+            # Asteptam inceputul urmatoarei cereri (conexiunea este inactiva)
+            with server.lock:
+                server.inactive.add(self.connection)
+            try:
+                if server.se_opreste:
+                    date = b''
+                else:
+                    self.connection.settimeout(server.keep_alive if self.cereri_servite else TIMEOUT_CERERE)
+                    date = self.rfile.peek(1)
+            except OSError:
+                date = b''
+            finally:
+                with server.lock:
+                    server.inactive.discard(self.connection)
+            if not date:
+                self.close_connection = True
+                return
+
+            # Cererea a inceput: o terminam chiar daca intre timp a inceput oprirea
+            self.connection.settimeout(TIMEOUT_CERERE)
+            super().handle_one_request()
+            self.cereri_servite += 1
+            if server.se_opreste:
+                self.close_connection = True
+
+        def log_request(self, code='-', size='-'):
+            if self.server.log_acces:
+                super().log_request(code, size)
+
+    return HandlerCereri
+
+class _FluxInchis:
+    """
+    Invelis peste un raspuns SSE: fluxul se termina la primul mesaj dupa inceperea opririi
+    """
+
+    def __init__(self, iterabil, server):
+        self._iterabil = iterabil
+        self._server = server
+
+    def __iter__(self):
+        for bucata in self._iterabil:
+            yield bucata
+            if self._server.se_opreste:
+                break
+
+    def close(self):
+        if hasattr(self._iterabil, 'close'):
+            self._iterabil.close()
+
+def _clasa_server():
+    from werkzeug.serving import BaseWSGIServer
+
+    class ServerWorker(BaseWSGIServer):
+        """
+        Server WSGI pe un socket mostenit, cu un pool fix de thread-uri
+        """
+        multithread = True
+
+        def __init__(self, host, fd, aplicatie, thread_uri, keep_alive, log_acces):
+            super().__init__(host, 0, self._inveleste(aplicatie), handler=_clasa_handler(), fd=fd)
+            # BaseWSGIServer foloseste o copie a descriptorului
+            os.close(fd)
+            self.thread_uri = thread_uri
+            self.keep_alive = keep_alive
+            self.log_acces = log_acces
+            self.se_opreste = False
+            self.lock = threading.Lock()
+            self.inactive = set()
+            self.ultima_bucla = time.monotonic()
+            self._locuri = threading.BoundedSemaphore(thread_uri)
+            self._pool = ThreadPoolExecutor(max_workers=thread_uri, thread_name_prefix='request')
+
+        # Fluxurile SSE nu se termina singure: le inchidem la oprire
+        def _inveleste(self, aplicatie):
+            def aplicatie_invelita(mediu, start_response):
+                flux_sse = []
+
+                def _start_response(status, antete, exc_info=None):
+                    for nume, valoare in antete:
+                        if nume.lower() == 'content-type' and valoare.startswith('text/event-stream'):
+                            flux_sse.append(True)
+                    return start_response(status, antete, exc_info)
+
+                rezultat = aplicatie(mediu, _start_response)
+                return _FluxInchis(rezultat, self) if flux_sse else rezultat
+            return aplicatie_invelita
+
+        def serveste(self):
+            """
+            Bucla de acceptare: o conexiune noua este acceptata doar cand exista un thread liber
+            (socket-ul este neblocant si impartit cu ceilalti worker-i)
+            """
+            while not self.se_opreste:
+                self.ultima_bucla = time.monotonic()
+                if not self._locuri.acquire(timeout=INTERVAL_ACCEPTARE):
+                    continue
+                try:
+                    pregatit, _, _ = select.select([self.socket], [], [], INTERVAL_ACCEPTARE)
+                    conexiune, adresa = self.socket.accept() if pregatit else (None, None)
+                except OSError:
+                    # Conexiunea a fost luata de alt worker (sau socket-ul a fost inchis)
+                    conexiune = None
+                if conexiune is None:
+                    self._locuri.release()
+                    continue
+                self._pool.submit(self._serveste_conexiunea, conexiune, adresa)
+
+        def _serveste_conexiunea(self, conexiune, adresa):
+            try:
+                self.finish_request(conexiune, adresa)
+            except Exception:
+                self.handle_error(conexiune, adresa)
+            finally:
+                self.shutdown_request(conexiune)
+                self._locuri.release()
+
+        def goleste(self, gratie):
+            """
+            Opreste acceptarea, inchide conexiunile inactive si asteapta cererile in curs
+            Returns:
+                True daca toate cererile s-au terminat in timpul de gratie
+            """
+            self.se_opreste = True
+            self.socket.close()
+            with self.lock:
+                for conexiune in self.inactive:
+                    try:
+                        conexiune.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass
+            termen = time.monotonic() + gratie
+            for _ in range(self.thread_uri):
+                if not self._locuri.acquire(timeout=max(0.0, termen - time.monotonic())):
+                    return False
+            self._pool.shutdown(wait=False)
+            return True
+
+    return ServerWorker
+
+def _bucla_heartbeat(server, aplicatie, cale_sanatate, fisier_heartbeat, interval):
+    """
+    Atinge fisierul de heartbeat cat timp bucla de acceptare merge si aplicatia raspunde
+    """
+    # Cheia din metrics.py (CHEIE_FARA_METRICI): verificarea nu apare in /api/metrics
+    from metrics import CHEIE_FARA_METRICI
+    client = aplicatie.test_client()
+    while not server.se_opreste:
+        try:
+            sanatos = client.get(cale_sanatate, environ_base={CHEIE_FARA_METRICI: True}).status_code < 500
+        except Exception:
+            logger.exception('Verificarea %s a esuat', cale_sanatate)
+            sanatos = False
+        if sanatos and time.monotonic() - server.ultima_bucla < interval + INTERVAL_ACCEPTARE * 2:
+            os.utime(fisier_heartbeat)
+        time.sleep(interval)
+
+def ruleaza_worker(argumente):
+    specificatie = APLICATII[argumente.app]
+    logging.basicConfig(level=logging.INFO, format=f"[{specificatie['nume']} #{argumente.index}] %(message)s")
+
+    # Fiecare flux SSE tine ocupat un thread pana la inchidere: limitam fluxurile sub numarul
+    # de thread-uri, altfel cateva pagini deschise opresc acceptarea conexiunilor in worker
+    # (limita este citita de services/events.py la import; peste ea fluxurile primesc 503)
+    limita_sse = max(0, argumente.threads - THREADURI_REZERVATE)
+    os.environ['MOVIE_MANAGER_SSE_MAX'] = str(min(limita_sse, int(os.environ.get('MOVIE_MANAGER_SSE_MAX', limita_sse))))
+
+    # Aplicatia este importata ca in pornirea din directorul ei (python app.py)
+    os.chdir(specificatie['director'])
+    sys.path.insert(0, str(specificatie['director']))
+    from app import app
+
+    server = _clasa_server()(argumente.host, argumente.fd, app, argumente.threads,
+                             argumente.keep_alive, argumente.access_log)
+
+    semnale = []
+
+    def _opreste(numar_semnal, cadru):
+        semnale.append(numar_semnal)
+        if len(semnale) > 1:
+            # Al doilea semnal: oprire imediata
+            os._exit(1)
+        server.se_opreste = True
+
+    signal.signal(signal.SIGTERM, _opreste)
+    signal.signal(signal.SIGINT, _opreste)
+
+    threading.Thread(target=_bucla_heartbeat, daemon=True, name='heartbeat',
+                     args=(server, app, specificatie['sanatate'], argumente.heartbeat,
+                           argumente.heartbeat_interval)).start()
+    logger.info('pid %d, %d thread-uri (cel mult %s fluxuri SSE)', os.getpid(), argumente.threads,
+                os.environ['MOVIE_MANAGER_SSE_MAX'])
+
+    server.serveste()
+    if not server.goleste(argumente.grace):
+        logger.warning('Timpul de gratie (%gs) a expirat; cererile ramase sunt intrerupte', argumente.grace)
+    # Thread-urile ramase (cereri intrerupte) nu mai sunt asteptate
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(0)
+
+# ---------------------------------------------------------------------------
+# Supraveghetor
+# ---------------------------------------------------------------------------
+
+class _LocWorker:
+    """
+    Un loc de worker: procesul curent, heartbeat-ul si istoricul repornirilor
+    """
+
+    def __init__(self, aplicatie, index):
+        self.aplicatie = aplicatie
+        self.index = index
+        self.proces = None
+        self.pornit_la = 0.0
+        self.esecuri = 0
+        self.repornire_la = 0.0
+        self.oprit_la = None
+        fd, self.heartbeat = tempfile.mkstemp(prefix=f'movie-manager-{aplicatie}-{index}-', suffix='.heartbeat')
+        os.close(fd)
+
+    # Numele worker-ului (eticheta din metrici), acelasi si dupa o repornire
+    @property
+    def nume(self):
+        return f'{self.aplicatie}-{self.index}'
+
+class Supraveghetor:
+    """
+    Porneste, supravegheaza si opreste worker-ii pentru backend si frontend
+    """
+
+    def __init__(self, aplicatii, host='127.0.0.1', workeri=2, thread_uri=8, keep_alive=2.0,
+                 gratie=30.0, timeout=30.0, log_acces=False, backlog=1024):
+        self.host = host
+        self.workeri = workeri
+        self.thread_uri = thread_uri
+        self.keep_alive = keep_alive
+        self.gratie = gratie
+        self.timeout = timeout
+        self.log_acces = log_acces
+        # Cheia comuna a worker-ilor pentru token-urile de flux SSE (security.py)
+        self.cheie_flux = secrets.token_hex(32)
+        self.socketuri = {}
+        self.locuri = []
+        self.se_opreste = False
+        for aplicatie, port in aplicatii.items():
+            self.socketuri[aplicatie] = self._asculta(port, backlog)
+            self.locuri.extend(_LocWorker(aplicatie, index) for index in range(1, workeri + 1))
+
+    def _asculta(self, port, backlog):
+        familie = socket.AF_INET6 if ':' in self.host else socket.AF_INET
+        sock = socket.socket(familie, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, port))
+        sock.listen(backlog)
+        # Neblocant: mai multi worker-i sunt treziti de aceeasi conexiune, doar unul o primeste
+        sock.setblocking(False)
+        return sock
+
+    # Mediul unui worker: numele pentru metrici, cheia token-urilor de flux si, cu mai multi
+    # worker-i, verificarea SSE mai deasa
+    def _mediu(self, loc):
+        mediu = {**os.environ, 'MOVIE_MANAGER_WORKER': loc.nume}
+        # Token-urile de flux SSE emise de un worker trebuie acceptate de toti ceilalti
+        mediu.setdefault('MOVIE_MANAGER_STREAM_SECRET', self.cheie_flux)
+        if self.workeri > 1:
+            mediu.setdefault('MOVIE_MANAGER_SSE_POLL', INTERVAL_SSE_WORKERI)
+        return mediu
+
+    def _porneste_worker(self, loc):
+        sock = self.socketuri[loc.aplicatie]
+        os.utime(loc.heartbeat)
+        loc.proces = subprocess.Popen(
+            [sys.executable, str(Path(__file__).absolute()), 'worker',
+             '--app', loc.aplicatie, '--index', str(loc.index), '--host', self.host,
+             '--fd', str(sock.fileno()), '--threads', str(self.thread_uri),
+             '--keep-alive', str(self.keep_alive), '--grace', str(self.gratie),
+             '--heartbeat', loc.heartbeat, '--heartbeat-interval', str(max(1.0, self.timeout / 6))]
+            + (['--access-log'] if self.log_acces else []),
+            pass_fds=(sock.fileno(),),
+            env=self._mediu(loc),
+        )
+        loc.pornit_la = time.monotonic()
+        loc.oprit_la = None
+
+    def porneste(self):
+        for loc in self.locuri:
+            self._porneste_worker(loc)
+
+    # Verifica worker-ii: reporneste pe cei opriti, opreste pe cei fara heartbeat
+    def verifica(self):
+        acum = time.monotonic()
+        for loc in self.locuri:
+            nume = f"{APLICATII[loc.aplicatie]['nume']} #{loc.index}"
+            cod = loc.proces.poll() if loc.proces else None
+            if loc.proces is not None and cod is None:
+                vechime = time.time() - os.stat(loc.heartbeat).st_mtime
+                if loc.oprit_la is None and vechime > self.timeout:
+                    print(f'[Supraveghetor] {nume} nu a mai raportat de {vechime:.0f}s, repornire', flush=True)
+                    loc.proces.terminate()
+                    loc.oprit_la = acum
+                elif loc.oprit_la is not None and acum - loc.oprit_la > 5:
+                    loc.proces.kill()
+                continue
+
+            if loc.proces is not None:
+                # Worker-ul s-a oprit: repornire, cu asteptare crescatoare daca a cazut imediat
+                loc.esecuri = loc.esecuri + 1 if acum - loc.pornit_la < 5 else 0
+                asteptare = min(ASTEPTARE_MAXIMA_REPORNIRE, 0.5 * 2 ** loc.esecuri) if loc.esecuri else 0
+                print(f'[Supraveghetor] {nume} s-a oprit (cod {cod}), repornire'
+                      + (f' peste {asteptare:g}s' if asteptare else ''), flush=True)
+                loc.proces = None
+                loc.repornire_la = acum + asteptare
+            if acum >= loc.repornire_la:
+                self._porneste_worker(loc)
+
+    def ruleaza(self):
+        """
+        Supravegheaza worker-ii pana la SIGTERM / SIGINT, apoi ii opreste gradat
+        """
+        def _opreste(numar_semnal, cadru):
+            if self.se_opreste:
+                # Al doilea semnal: oprire fortata
+                for loc in self.locuri:
+                    if loc.proces is not None and loc.proces.poll() is None:
+                        loc.proces.kill()
+            self.se_opreste = True
+
+        signal.signal(signal.SIGTERM, _opreste)
+        signal.signal(signal.SIGINT, _opreste)
+        try:
+            while not self.se_opreste:
+                self.verifica()
+                time.sleep(0.5)
+        finally:
+            self.opreste()
+
+    def opreste(self):
+        for sock in self.socketuri.values():
+            sock.close()
+        pornite = [loc.proces for loc in self.locuri if loc.proces is not None]
+        for proces in pornite:
+            if proces.poll() is None:
+                proces.terminate()
+        termen = time.monotonic() + self.gratie + 5
+        for proces in pornite:
+            try:
+                proces.wait(timeout=max(0.0, termen - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                proces.kill()
+                proces.wait()
+        for loc in self.locuri:
+            try:
+                os.unlink(loc.heartbeat)
+            except OSError:
+                pass
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Worker de productie (pornit de start.py --prod)')
+    subcomenzi = parser.add_subparsers(dest='command', required=True)
+    worker = subcomenzi.add_parser('worker')
+    worker.add_argument('--app', choices=sorted(APLICATII), required=True)
+    worker.add_argument('--index', type=int, default=1)
+    worker.add_argument('--host', default='127.0.0.1')
+    worker.add_argument('--fd', type=int, required=True)
+    worker.add_argument('--threads', type=int, default=8)
+    worker.add_argument('--keep-alive', type=float, default=2.0)
+    worker.add_argument('--grace', type=float, default=30.0)
+    worker.add_argument('--heartbeat', required=True)
+    worker.add_argument('--heartbeat-interval', type=float, default=5.0)
+    worker.add_argument('--access-log', action='store_true')
+    ruleaza_worker(parser.parse_args(argv))
+
+if __name__ == '__main__':
+    main()
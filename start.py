@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
+import argparse
+import http.client
 import os
+import queue
+import selectors
+import signal
 import sys
 import subprocess
 import time
@@ -11,82 +16,254 @@ BASE_DIR = Path(__file__).parent.absolute()
 BACKEND_DIR = BASE_DIR / 'backend'
 FRONTEND_DIR = BASE_DIR / 'frontend'
 
-def run_backend():
-    # Porneste backend-ul Flask pe portul 5000
-    os.chdir(BACKEND_DIR)
-    # Rulam app.py din backend
-    return subprocess.Popen(
-        [sys.executable, 'app.py'],
-        cwd=str(BACKEND_DIR),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1
-    )
+# Porturile serverelor (frontend-ul si JavaScript-ul din pagini folosesc backend-ul de pe 5000)
+BACKEND_PORT = 5000
+FRONTEND_PORT = 5001
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Porneste backend-ul si frontend-ul (implicit in modul dezvoltare, cu debug si reloader)')
+    parser.add_argument('--prod', action='store_true',
+                        help='mod productie: procese worker pre-fork, fara debug (doar POSIX)')
+    parser.add_argument('--workers', type=int, default=max(2, os.cpu_count() or 1),
+                        help='procese worker pentru fiecare aplicatie (implicit numarul de CPU-uri, minim 2)')
+    parser.add_argument('--threads', type=int, default=8, help='thread-uri pentru fiecare worker')
+    parser.add_argument('--host', default='127.0.0.1', help='adresa pe care asculta serverele in productie')
+    parser.add_argument('--keep-alive', type=float, default=2.0,
+                        help='secunde in care o conexiune inactiva este pastrata (0 = fara keep-alive)')
+    parser.add_argument('--grace', type=float, default=30.0,
+                        help='secunde pentru terminarea cererilor in curs la oprire')
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help='un worker fara heartbeat atatea secunde este repornit')
+    parser.add_argument('--access-log', action='store_true', help='logheaza fiecare cerere (productie)')
+    return parser.parse_args(argv)
+
+def run_production(args):
+    # Mod productie: worker-ii fiecarei aplicatii impart acelasi socket (serving.py)
+    if os.name != 'posix':
+        print('Modul productie necesita un sistem POSIX (Linux, macOS).')
+        sys.exit(1)
+    from serving import Supraveghetor
+
+    # Baza de date este initializata o singura data, inainte de pornirea worker-ilor
+    sys.path.insert(0, str(BACKEND_DIR))
+    from models.database import init_db, conexiune_din_pool
+    from services.delta_sync import curata_jurnalul
+    init_db()
+    # Jurnalul de modificari este curatat tot o singura data, inainte de pornire
+    with conexiune_din_pool() as conn:
+        curata_jurnalul(conn)
+
+    supervisor = Supraveghetor({'backend': BACKEND_PORT, 'frontend': FRONTEND_PORT}, host=args.host,
+                               workeri=args.workers, thread_uri=args.threads, keep_alive=args.keep_alive,
+                               gratie=args.grace, timeout=args.timeout, log_acces=args.access_log)
+    started = time.monotonic()
+    supervisor.porneste()
+    try:
+        for name, port, path in (('Backend', BACKEND_PORT, '/api/health'), ('Frontend', FRONTEND_PORT, '/')):
+            if not wait_ready(port, path, lambda: True):
+                print(f"{name} nu răspunde încă (port {port}); worker-ii sunt supravegheați în continuare.")
+    except KeyboardInterrupt:
+        supervisor.opreste()
+        return
+    print(f"Mod producție: {args.workers} worker-i x {args.threads} thread-uri pentru fiecare aplicație "
+          f"(pornite în {time.monotonic() - started:.2f}s)")
+    print(f"Backend API:  http://{args.host}:{BACKEND_PORT}")
+    print(f"Frontend Web: http://{args.host}:{FRONTEND_PORT}")
+    print("Oprire gradată: Ctrl+C sau SIGTERM (a doua oară: oprire forțată)", flush=True)
+    supervisor.ruleaza()
+    print("Servere oprite.")
+
+class LogRelay:
+    """
+    Transmite output-ul serverelor in consola, cu prefixul fiecaruia
+    Un singur thread citeste toate pipe-urile (neblocant) si le goleste imediat, ca
+    serverele sa nu se blocheze niciodata la scriere; liniile citite impreuna sunt
+    scrise dintr-o data de un al doilea thread. Daca consola nu tine pasul, liniile
+    care nu mai incap in coada sunt numarate si raportate, in loc sa blocheze serverele.
+    """
+
+    def __init__(self, output=None, max_pending=1024):
+        self.output = output or sys.stdout.buffer
+        self.selector = selectors.DefaultSelector()
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+    # Adauga output-ul unui proces (inainte de start)
+    def add(self, name, process):
+        fd = process.stdout.fileno()
+        os.set_blocking(fd, False)
+        self.selector.register(fd, selectors.EVENT_READ, [f'[{name}] '.encode(), b''])
+
+    # Mesajele proprii trec prin aceeasi coada, ca sa pastreze ordinea cu cele ale serverelor
+    def message(self, text=''):
+        self._enqueue(f'{text}\n'.encode())
+
+    def _enqueue(self, chunk):
+        try:
+            self.pending.put_nowait(chunk)
+        except queue.Full:
+            with self.lock:
+                self.dropped += chunk.count(b'\n')
+
+    def _read(self):
+        while self.selector.get_map():
+            lines = []
+            for key, _ in self.selector.select():
+                prefix, partial = key.data
+                try:
+                    data = os.read(key.fd, 65536)
+                except BlockingIOError:
+                    continue
+                if not data:
+                    # Procesul s-a oprit: scriem si ultima linie neterminata
+                    if partial:
+                        lines.append(prefix + partial + b'\n')
+                    self.selector.unregister(key.fd)
+                    continue
+                *complete, key.data[1] = (partial + data).split(b'\n')
+                lines.extend(prefix + line.rstrip(b'\r') + b'\n' for line in complete)
+            if lines:
+                self._enqueue(b''.join(lines))
 
-def run_frontend():
-    # Porneste frontend-ul Flask pe portul 5001
-    os.chdir(FRONTEND_DIR)
-    # Rulam app.py din frontend
+    def _write(self):
+        while True:
+            chunk = self.pending.get()
+            with self.lock:
+                dropped, self.dropped = self.dropped, 0
+            if dropped:
+                chunk = f'[start.py] {dropped} linii de log pierdute (consola prea lenta)\n'.encode() + chunk
+            try:
+                self.output.write(chunk)
+                self.output.flush()
+            except (OSError, ValueError):
+                return
+
+    def start(self):
+        threading.Thread(target=self._read, daemon=True, name='log-reader').start()
+        threading.Thread(target=self._write, daemon=True, name='log-writer').start()
+
+    # Asteapta (scurt) scrierea mesajelor ramase in coada
+    def flush(self, timeout=1.0):
+        deadline = time.monotonic() + timeout
+        while not self.pending.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+def wait_ready(port, path, alive, timeout=15.0):
+    """
+    Asteapta ca serverul de pe port sa raspunda la GET path (orice status sub 500)
+    Intervalul dintre incercari creste de la 10 ms la 200 ms
+    Returns:
+        True daca serverul a raspuns, False daca procesul s-a oprit sau timpul a expirat
+    """
+    delay = 0.01
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not alive():
+            return False
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+        try:
+            connection.request('GET', path)
+            if connection.getresponse().status < 500:
+                return True
+        except OSError:
+            pass
+        finally:
+            connection.close()
+        time.sleep(delay)
+        delay = min(delay * 2, 0.2)
+    return False
+
+def run_app(directory):
+    # Porneste app.py din directorul aplicatiei (serverul de dezvoltare Flask)
     return subprocess.Popen(
         [sys.executable, 'app.py'],
-        cwd=str(FRONTEND_DIR),
+        cwd=str(directory),
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1
+        # Output-ul nebufferizat ajunge imediat in consola
+        env={**os.environ, 'PYTHONUNBUFFERED': '1'},
+        # Grup de procese propriu: la oprire este oprit si procesul pornit de reloader
+        start_new_session=(os.name == 'posix'),
     )
 
-if __name__ == '__main__':    
+def interrupt_on_signals():
+    # SIGTERM (timeout, systemd, docker stop) si SIGHUP (terminal inchis) urmeaza aceeasi cale ca
+    # Ctrl+C, ca blocul finally sa opreasca grupurile de procese ale serverelor
+    def handler(signum, frame):
+        raise KeyboardInterrupt
+    for name in ('SIGTERM', 'SIGHUP'):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), handler)
+
+def ignore_signals():
+    # In timpul opririi, un al doilea semnal nu trebuie sa intrerupa oprirea serverelor
+    for name in ('SIGINT', 'SIGTERM', 'SIGHUP'):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), signal.SIG_IGN)
+
+def stop_app(process):
+    if process.poll() is not None:
+        return
+    if os.name == 'posix':
+        os.killpg(process.pid, signal.SIGTERM)
+    else:
+        process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)
+        process.kill()
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.prod:
+        run_production(args)
+        sys.exit(0)
+
+    started = time.monotonic()
+    relay = LogRelay()
     processes = []
-    
+    interrupt_on_signals()
+
     try:
-        # Pornim backend-ul
-        print("Pornire backend API...")
-        backend_process = run_backend()
-        processes.append(('Backend', backend_process))
-        time.sleep(2)  # Asteptam ca backend-ul sa porneasca
-        
-        # Pornim frontend-ul
-        print("Pornire frontend web...")
-        frontend_process = run_frontend()
-        processes.append(('Frontend', frontend_process))
-        time.sleep(2)  # Asteptam ca frontend-ul sa porneasca
-        
-        print()
-        print("Ambele servere rulează!")
-        print()
-        print("Backend API:  http://localhost:5000")
-        print("Frontend Web: http://localhost:5001")
-        print()
-        print("Deschide browser-ul la: http://localhost:5001")
-        print()
-        
-        # Afisam output-ul proceselor
-        def monitor_process(name, process):
-            for line in iter(process.stdout.readline, ''):
-                if line:
-                    print(f"[{name}] {line.rstrip()}")
-        
-        threads = []
-        for name, process in processes:
-            thread = threading.Thread(target=monitor_process, args=(name, process), daemon=True)
-            thread.start()
-            threads.append(thread)
-        
+        # Pornim ambele servere in paralel
+        relay.message("Pornire backend API si frontend web...")
+        processes.append(('Backend', run_app(BACKEND_DIR), BACKEND_PORT, '/api/health'))
+        processes.append(('Frontend', run_app(FRONTEND_DIR), FRONTEND_PORT, '/'))
+        for name, process, _, _ in processes:
+            relay.add(name, process)
+        relay.start()
+
+        # Asteptam sa raspunda amandoua (pornite in paralel, deci cat cel mai lent)
+        for name, process, port, path in processes:
+            if not wait_ready(port, path, lambda: process.poll() is None):
+                relay.message(f"{name} nu a pornit (port {port}).")
+                raise SystemExit(1)
+
+        relay.message()
+        relay.message(f"Ambele servere rulează! (pornite în {time.monotonic() - started:.2f}s)")
+        relay.message()
+        relay.message(f"Backend API:  http://localhost:{BACKEND_PORT}")
+        relay.message(f"Frontend Web: http://localhost:{FRONTEND_PORT}")
+        relay.message()
+        relay.message(f"Deschide browser-ul la: http://localhost:{FRONTEND_PORT}")
+        relay.message()
+
         # Asteptam ca procesele sa ruleze
-        while all(p.poll() is None for _, p in processes):
-            time.sleep(1)
-            
-    except KeyboardInterrupt:
-        print()
-        print("Oprire servere...")
-        for name, process in processes:
-            if process.poll() is None:
-                process.terminate()
-                try:
-                    process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    process.kill()
-        sys.exit(0)
+        while all(process.poll() is None for _, process, _, _ in processes):
+            time.sleep(0.5)
+        for name, process, _, _ in processes:
+            if process.poll() is not None:
+                relay.message(f"{name} s-a oprit (cod {process.returncode}).")
 
+    except KeyboardInterrupt:
+        relay.message()
+        relay.message("Oprire servere...")
+    finally:
+        ignore_signals()
+        for _, process, _, _ in processes:
+            stop_app(process)
+        relay.flush()
@@ -0,0 +1,68 @@
+"""
+Configurarea comuna a testelor
+Backend-ul citeste calea bazei de date (si cheia de profilare) la import, asa ca mediul
+este setat inainte de orice import din backend: testele folosesc o baza temporara,
+niciodata instance/production.db.
+"""
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(BASE_DIR, 'backend')
+
+# Directorul temporar cu baza de date a testelor (sters la final)
+DIRECTOR_TESTE = tempfile.mkdtemp(prefix='movie-tests-')
+os.environ['MOVIE_MANAGER_DB'] = os.path.join(DIRECTOR_TESTE, 'test.db')
+os.environ.pop('MOVIE_MANAGER_PROFILE_KEY', None)
+os.environ.pop('MOVIE_MANAGER_SQL_TRACE', None)
+
+sys.path.insert(0, BACKEND_DIR)
+
+# Contor pentru nume de utilizatori unice (toate testele folosesc aceeasi baza)
+_numar_utilizator = itertools.count(1)
+
+def pytest_unconfigure(config):
+    shutil.rmtree(DIRECTOR_TESTE, ignore_errors=True)
+
+@pytest.fixture(scope='session')
+def app():
+    from models.database import init_db
+    init_db()
+    from app import app as aplicatie
+    aplicatie.config['TESTING'] = True
+    return aplicatie
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def creeaza_utilizator(client):
+    """
+    Returneaza o functie care creeaza un utilizator nou, cu numele, id-ul si header-ele de autentificare
+    """
+    from models.database import get_db_connection
+    from models.repository import id_utilizator
+    from security import PREFIX_TOKEN
+
+    def creeaza():
+        nume = f'test_{next(_numar_utilizator)}'
+        raspuns = client.post('/api/register', json={'username': nume, 'password': 'parola123'})
+        assert raspuns.status_code == 201
+
+        conn = get_db_connection()
+        try:
+            id_user = id_utilizator(conn, nume)
+        finally:
+            conn.close()
+        return {'nume': nume, 'id': id_user, 'headere': {'Authorization': PREFIX_TOKEN + nume}}
+    return creeaza
+
+@pytest.fixture
+def utilizator(creeaza_utilizator):
+    return creeaza_utilizator()
@@ -0,0 +1,85 @@
+"""
+Teste pentru cache-ul de ETag-uri din APIClient (frontend/utils/api_client.py)
+"""
+import os
+import sys
+
+import pytest
+
+from conftest import BASE_DIR
+
+sys.path.insert(0, os.path.join(BASE_DIR, 'frontend'))
+from utils import api_client
+from utils.api_client import APIClient
+
+class RaspunsTest:
+    """
+    Raspunsul clientului de test Flask, cu interfata folosita de APIClient din requests.Response
+    """
+
+    def __init__(self, raspuns):
+        self.status_code = raspuns.status_code
+        self.content = raspuns.data
+        self.headers = raspuns.headers
+        self._raspuns = raspuns
+
+    def json(self):
+        return self._raspuns.get_json()
+
+class SesiuneTest:
+    """
+    Sesiune requests care trimite cererile catre aplicatia backend, in proces
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.cereri = []
+
+    def request(self, method, url, headers=None, params=None, json=None, timeout=None, **kwargs):
+        cale = url.replace(api_client.API_URL, '/api', 1)
+        self.cereri.append((method, cale, dict(params or {}), dict(headers or {})))
+        return RaspunsTest(self.client.open(cale, method=method, query_string=params, headers=headers, json=json))
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+@pytest.fixture
+def api(client, utilizator):
+    return APIClient(token=utilizator['headere']['Authorization'], session=SesiuneTest(client))
+
+def _conditionale(api):
+    return [(cale, parametri) for _, cale, parametri, headere in api.session.cereri if 'If-None-Match' in headere]
+
+def test_get_repetat_este_conditional(api):
+    api.add_movie('Dark')
+    assert api.get_movies()[1]['To Watch'][0]['title'] == 'Dark'
+    assert api.get_movies()[1]['To Watch'][0]['title'] == 'Dark'
+    assert _conditionale(api) == [('/api/movies', {})]
+
+def test_paginile_cu_cursor_nu_sunt_pastrate(api):
+    for titlu in ('A', 'B', 'C', 'D', 'E'):
+        api.add_movie(titlu)
+
+    for _ in range(2):
+        assert sorted(film['title'] for film in api.iter_movies(page_size=2)) == ['A', 'B', 'C', 'D', 'E']
+    # Doar prima pagina (fara cursor) este pastrata si revalidata
+    assert api._etag_cache.statistici()['size'] == 1
+    assert _conditionale(api) == [('/api/movies', {'limit': 2})]
+
+def test_sync_nu_este_pastrat(api):
+    api.add_movie('Dark')
+    api.sync()
+    api.add_movie('Lost')
+    ok, biblioteca = api.sync()
+    assert ok
+    assert sorted(film['title'] for film in biblioteca['movies'].values()) == ['Dark', 'Lost']
+    assert api._etag_cache.statistici()['size'] == 0
+    assert _conditionale(api) == []
+
+def test_cache_marginit(api):
+    api.add_movie('Dark')
+    for limita in range(1, api_client.ETAG_CACHE_SIZE + 10):
+        api._get_json('/movies', {'limit': limita})
+    statistici = api._etag_cache.statistici()
+    assert statistici['size'] == api_client.ETAG_CACHE_SIZE
+    assert statistici['evictions'] == 9
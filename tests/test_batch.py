@@ -0,0 +1,113 @@
+"""
+Teste pentru ruta /api/batch: fiecare apel este izolat de erorile celorlalte
+"""
+from flask import g
+
+from metrics import registru_http
+from models.database import get_db_connection
+from routes.batch_routes import MAXIM_APELURI
+
+def _cereri_terminate(endpoint, metoda, status):
+    text = registru_http.text_prometheus()
+    serie = f'movie_manager_http_requests_total{{endpoint="{endpoint}",method="{metoda}",status="{status}"}} '
+    linie = next((linie for linie in text.splitlines() if linie.startswith(serie)), None)
+    return int(linie.rsplit(' ', 1)[1]) if linie else 0
+
+def _batch(client, utilizator, apeluri):
+    raspuns = client.post('/api/batch', json={'requests': apeluri}, headers=utilizator['headere'])
+    assert raspuns.status_code == 200
+    return [(r['status'], r['body']) for r in raspuns.get_json()['responses']]
+
+def test_apeluri_in_ordine(client, utilizator):
+    raspunsuri = _batch(client, utilizator, [
+        {'method': 'POST', 'path': '/movies', 'body': {'title': 'Dark'}},
+        {'method': 'GET', 'path': '/movies'},
+        {'method': 'GET', 'path': '/user/username'},
+    ])
+    assert raspunsuri[0][0] == 201
+    # Apelurile folosesc aceeasi conexiune: citirea vede filmul adaugat de apelul anterior
+    assert raspunsuri[1][0] == 200
+    assert [film['title'] for film in raspunsuri[1][1]['To Watch']] == ['Dark']
+    assert raspunsuri[2] == (200, {'username': utilizator['nume']})
+
+def test_apelurile_invalide_nu_opresc_batch_ul(client, utilizator):
+    raspunsuri = _batch(client, utilizator, [
+        {'method': 'GET', 'path': '/nu-exista'},
+        {'method': 'PATCH', 'path': '/movies'},
+        {'method': 'DELETE', 'path': '/user/username'},
+        {'method': 'POST', 'path': '/batch', 'body': {'requests': []}},
+        {'method': 'GET', 'path': 'fara-slash'},
+        'nu este obiect',
+        {'method': 'POST', 'path': '/movies', 'body': {'title': ''}},
+        {'method': 'POST', 'path': '/movies', 'body': {'title': 'Lost'}},
+    ])
+    assert [status for status, _ in raspunsuri] == [404, 400, 405, 400, 400, 400, 400, 201]
+
+def test_exceptie_intr_un_apel(app, client, utilizator, monkeypatch):
+    # Ruta care scrie fara commit si apoi cade: scrierea nu ajunge in baza de date
+    def ruta_defecta():
+        conn = get_db_connection()
+        conn.execute("INSERT INTO movies (user_id, title, status, rating) VALUES (?, 'Fantoma', 'To Watch', '-')",
+                     (utilizator['id'],))
+        raise RuntimeError('eroare simulata')
+    monkeypatch.setitem(app.view_functions, 'movies.get_username', ruta_defecta)
+
+    raspunsuri = _batch(client, utilizator, [
+        {'method': 'GET', 'path': '/user/username'},
+        {'method': 'POST', 'path': '/movies', 'body': {'title': 'Dark'}},
+        {'method': 'GET', 'path': '/movies'},
+    ])
+    assert raspunsuri[0] == (500, {'message': 'Eroare interna'})
+    assert raspunsuri[1][0] == 201
+    assert [film['title'] for film in raspunsuri[2][1]['To Watch']] == ['Dark']
+
+    conn = get_db_connection()
+    try:
+        titluri = [rand['title'] for rand in conn.execute('SELECT title FROM movies WHERE user_id = ?', (utilizator['id'],))]
+    finally:
+        conn.close()
+    assert titluri == ['Dark']
+
+def test_token_invalid_pentru_fiecare_apel(client):
+    raspuns = client.post('/api/batch', json={'requests': [{'method': 'GET', 'path': '/movies'}]},
+                          headers={'Authorization': 'token_secret_pentru_nimeni'})
+    assert raspuns.status_code == 200
+    assert raspuns.get_json()['responses'][0]['status'] == 401
+
+def test_cereri_batch_invalide(client, utilizator):
+    assert client.post('/api/batch', json={}, headers=utilizator['headere']).status_code == 400
+    assert client.post('/api/batch', json={'requests': 'x'}, headers=utilizator['headere']).status_code == 400
+    prea_multe = [{'method': 'GET', 'path': '/movies'}] * (MAXIM_APELURI + 1)
+    assert client.post('/api/batch', json={'requests': prea_multe}, headers=utilizator['headere']).status_code == 400
+
+def test_streaming_respins(client, utilizator):
+    raspunsuri = _batch(client, utilizator, [{'method': 'GET', 'path': '/recommendations/stream'}])
+    assert raspunsuri[0][0] == 400
+
+def test_apelurile_trec_prin_hook_uri(client, utilizator):
+    # Fiecare apel este numarat in metrici la ruta lui, inclusiv cele fara ruta sau care esueaza
+    inainte = {cheie: _cereri_terminate(*cheie) for cheie in
+               [('movies.get_username', 'GET', '200'), ('<unmatched>', 'GET', '404'), ('batch.batch', 'POST', '200')]}
+    _batch(client, utilizator, [
+        {'method': 'GET', 'path': '/user/username'},
+        {'method': 'GET', 'path': '/user/username'},
+        {'method': 'GET', 'path': '/nu-exista'},
+    ])
+    assert _cereri_terminate('movies.get_username', 'GET', '200') == inainte[('movies.get_username', 'GET', '200')] + 2
+    assert _cereri_terminate('<unmatched>', 'GET', '404') == inainte[('<unmatched>', 'GET', '404')] + 1
+    assert _cereri_terminate('batch.batch', 'POST', '200') == inainte[('batch.batch', 'POST', '200')] + 1
+    assert 'movie_manager_http_requests_in_flight{endpoint="movies.get_username",method="GET"} 0' in registru_http.text_prometheus()
+
+def test_apelurile_nu_impart_g(app, client, utilizator, monkeypatch):
+    # Fiecare apel are propriul g, dar aceeasi conexiune la baza de date (a batch-ului)
+    vazute = []
+    def ruta_test():
+        vazute.append((g.get('marcaj'), id(get_db_connection())))
+        g.marcaj = len(vazute)
+        return {'ok': True}
+    monkeypatch.setitem(app.view_functions, 'movies.get_username', ruta_test)
+
+    raspunsuri = _batch(client, utilizator, [{'method': 'GET', 'path': '/user/username'}] * 3)
+    assert [status for status, _ in raspunsuri] == [200] * 3
+    assert [marcaj for marcaj, _ in vazute] == [None] * 3
+    assert len({conexiune for _, conexiune in vazute}) == 1
@@ -0,0 +1,64 @@
+"""
+Teste pentru cererile conditionale (ETag / If-None-Match) bazate pe versiunile de date
+"""
+
+def _get(client, cale, utilizator, etag=None, **parametri):
+    headere = dict(utilizator['headere'])
+    if etag:
+        headere['If-None-Match'] = etag
+    return client.get(cale, query_string=parametri, headers=headere)
+
+def test_304_pentru_versiunea_curenta(client, utilizator):
+    client.post('/api/movies', json={'title': 'Dark'}, headers=utilizator['headere'])
+
+    raspuns = _get(client, '/api/movies', utilizator)
+    assert raspuns.status_code == 200
+    etag = raspuns.headers['ETag']
+    assert raspuns.headers['Cache-Control'] == 'private, no-cache'
+
+    nemodificat = _get(client, '/api/movies', utilizator, etag=etag)
+    assert nemodificat.status_code == 304
+    assert nemodificat.data == b''
+    assert nemodificat.headers['ETag'] == etag
+
+def test_modificarea_schimba_etag(client, utilizator):
+    etag = _get(client, '/api/movies', utilizator).headers['ETag']
+
+    assert client.post('/api/movies', json={'title': 'Lost'}, headers=utilizator['headere']).status_code == 201
+
+    raspuns = _get(client, '/api/movies', utilizator, etag=etag)
+    assert raspuns.status_code == 200
+    assert raspuns.headers['ETag'] != etag
+    assert [film['title'] for film in raspuns.get_json()['To Watch']] == ['Lost']
+
+def test_pagini_diferite_au_etag_diferit(client, utilizator):
+    for titlu in ('A', 'B', 'C'):
+        client.post('/api/movies', json={'title': titlu}, headers=utilizator['headere'])
+
+    prima = _get(client, '/api/movies', utilizator, limit=1)
+    a_doua = _get(client, '/api/movies', utilizator, limit=1, cursor=prima.get_json()['next_cursor'])
+    assert prima.headers['ETag'] != a_doua.headers['ETag']
+    # ETag-ul unei pagini nu valideaza alta pagina
+    assert _get(client, '/api/movies', utilizator, etag=prima.headers['ETag'], limit=2).status_code == 200
+
+def test_etag_diferit_intre_utilizatori(client, creeaza_utilizator):
+    primul, al_doilea = creeaza_utilizator(), creeaza_utilizator()
+    etag = _get(client, '/api/movies', primul).headers['ETag']
+    assert _get(client, '/api/movies', al_doilea, etag=etag).status_code == 200
+
+def test_recomandarea_primita_invalideaza_destinatarul(client, creeaza_utilizator):
+    expeditor, destinatar = creeaza_utilizator(), creeaza_utilizator()
+    raspuns = client.post('/api/friends/add', json={'friend_username': destinatar['nume']}, headers=expeditor['headere'])
+    assert raspuns.status_code == 201
+
+    etag_prieteni = _get(client, '/api/friends', destinatar).headers['ETag']
+    etag_recomandari = _get(client, '/api/recommendations', destinatar).headers['ETag']
+    assert _get(client, '/api/recommendations', destinatar, etag=etag_recomandari).status_code == 304
+
+    raspuns = client.post('/api/friends/recommend', json={'friend_username': destinatar['nume'], 'movie_title': 'Dark'},
+                          headers=expeditor['headere'])
+    assert raspuns.status_code == 201
+
+    assert _get(client, '/api/recommendations', destinatar, etag=etag_recomandari).status_code == 200
+    # Versiunea este comuna pentru toate datele utilizatorului
+    assert _get(client, '/api/friends', destinatar, etag=etag_prieteni).status_code == 200
@@ -0,0 +1,116 @@
+"""
+Teste pentru sincronizarea incrementala (GET /api/movies/changes?since=) si jurnalul de modificari
+"""
+from models.database import get_db_connection
+from services import delta_sync
+
+def _modificari(client, utilizator, since=None, etag=None):
+    headere = dict(utilizator['headere'])
+    if etag:
+        headere['If-None-Match'] = etag
+    parametri = {} if since is None else {'since': since}
+    return client.get('/api/movies/changes', query_string=parametri, headers=headere)
+
+def _id_film(client, utilizator, titlu):
+    liste = client.get('/api/movies', headers=utilizator['headere']).get_json()
+    return next(film['id'] for lista in liste.values() for film in lista if film['title'] == titlu)
+
+def _adauga(client, utilizator, *titluri):
+    for titlu in titluri:
+        assert client.post('/api/movies', json={'title': titlu}, headers=utilizator['headere']).status_code == 201
+
+def test_fara_since_returneaza_toata_biblioteca(client, utilizator):
+    _adauga(client, utilizator, 'Dark', 'Lost')
+
+    corp = _modificari(client, utilizator).get_json()
+    assert corp['full'] is True
+    assert corp['version'] == 2
+    assert sorted(film['title'] for film in corp['movies']['upserted']) == ['Dark', 'Lost']
+    assert corp['movies']['deleted'] == []
+
+def test_delta_dupa_o_versiune(client, utilizator):
+    _adauga(client, utilizator, 'Dark', 'Lost', 'Arcane')
+    versiune = _modificari(client, utilizator).get_json()['version']
+
+    id_dark, id_lost = _id_film(client, utilizator, 'Dark'), _id_film(client, utilizator, 'Lost')
+    client.put(f'/api/movies/{id_dark}/move', json={'new_list': 'Completed'}, headers=utilizator['headere'])
+    client.delete(f'/api/movies/{id_lost}', headers=utilizator['headere'])
+    _adauga(client, utilizator, 'Severance')
+
+    corp = _modificari(client, utilizator, since=versiune).get_json()
+    assert corp['full'] is False
+    assert corp['version'] == versiune + 3
+    assert sorted((film['title'], film['status']) for film in corp['movies']['upserted']) == [
+        ('Dark', 'Completed'), ('Severance', 'To Watch')]
+    assert corp['movies']['deleted'] == [id_lost]
+
+    # La versiunea curenta nu mai este nimic de trimis
+    corp = _modificari(client, utilizator, since=corp['version']).get_json()
+    assert corp['full'] is False
+    assert corp['movies'] == {'upserted': [], 'deleted': []}
+
+def test_film_adaugat_si_sters_apare_doar_ca_sters(client, utilizator):
+    _adauga(client, utilizator, 'Dark')
+    versiune = _modificari(client, utilizator).get_json()['version']
+    _adauga(client, utilizator, 'Temporar')
+    id_temporar = _id_film(client, utilizator, 'Temporar')
+    client.delete(f'/api/movies/{id_temporar}', headers=utilizator['headere'])
+
+    corp = _modificari(client, utilizator, since=versiune).get_json()
+    assert corp['movies'] == {'upserted': [], 'deleted': [id_temporar]}
+
+def test_recomandari_in_delta(client, creeaza_utilizator):
+    expeditor, destinatar = creeaza_utilizator(), creeaza_utilizator()
+    client.post('/api/friends/add', json={'friend_username': destinatar['nume']}, headers=expeditor['headere'])
+    versiune = _modificari(client, destinatar).get_json()['version']
+
+    client.post('/api/friends/recommend', json={'friend_username': destinatar['nume'], 'movie_title': 'Dark'},
+                headers=expeditor['headere'])
+
+    corp = _modificari(client, destinatar, since=versiune).get_json()
+    assert corp['full'] is False
+    assert [(r['movie_title'], r['from_username']) for r in corp['recommendations']['upserted']] == [('Dark', expeditor['nume'])]
+
+def test_versiune_din_viitor_returneaza_toata_biblioteca(client, utilizator):
+    _adauga(client, utilizator, 'Dark')
+    corp = _modificari(client, utilizator, since=1000).get_json()
+    assert corp['full'] is True
+    assert [film['title'] for film in corp['movies']['upserted']] == ['Dark']
+
+def test_versiune_in_afara_ferestrei_returneaza_toata_biblioteca(client, utilizator, monkeypatch):
+    monkeypatch.setattr(delta_sync, 'VERSIUNI_PASTRATE', 2)
+    _adauga(client, utilizator, 'A', 'B', 'C', 'D', 'E')
+
+    # Versiunea curenta este 5: since=3 este in fereastra, since=2 nu mai este
+    assert _modificari(client, utilizator, since=3).get_json()['full'] is False
+    corp = _modificari(client, utilizator, since=2).get_json()
+    assert corp['full'] is True
+    assert len(corp['movies']['upserted']) == 5
+
+def test_curatarea_jurnalului_pastreaza_fereastra(client, utilizator):
+    _adauga(client, utilizator, 'A', 'B', 'C', 'D', 'E')
+
+    conn = get_db_connection()
+    try:
+        delta_sync.curata_jurnalul(conn, versiuni_pastrate=2)
+        versiuni = [rand['version'] for rand in conn.execute(
+            'SELECT version FROM changes WHERE user_id = ? ORDER BY version', (utilizator['id'],))]
+    finally:
+        conn.close()
+    # Raman versiunile necesare pentru since >= 3 (versiunea curenta - 2)
+    assert versiuni == [4, 5]
+
+def test_since_invalid(client, utilizator):
+    assert _modificari(client, utilizator, since=-1).status_code == 400
+
+def test_304_pentru_changes(client, utilizator):
+    _adauga(client, utilizator, 'Dark')
+    raspuns = _modificari(client, utilizator, since=1)
+    assert raspuns.status_code == 200
+    etag = raspuns.headers['ETag']
+    assert _modificari(client, utilizator, since=1, etag=etag).status_code == 304
+    # Alt since inseamna alt raspuns
+    assert _modificari(client, utilizator, since=0, etag=etag).status_code == 200
+
+    _adauga(client, utilizator, 'Lost')
+    assert _modificari(client, utilizator, since=1, etag=etag).status_code == 200
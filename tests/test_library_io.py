@@ -0,0 +1,112 @@
+"""
+Teste pentru importul si exportul bibliotecii (POST /api/movies/import, GET /api/movies/export)
+"""
+import json
+
+import pytest
+
+from services import library_io
+
+def _importa(client, utilizator, continut, tip='text/csv', **parametri):
+    date = continut.encode() if isinstance(continut, str) else continut
+    return client.post('/api/movies/import', data=date, content_type=tip, query_string=parametri,
+                       headers=utilizator['headere'])
+
+def _titluri(client, utilizator):
+    liste = client.get('/api/movies', headers=utilizator['headere']).get_json()
+    return sorted(film['title'] for lista in liste.values() for film in lista)
+
+def test_import_csv(client, utilizator):
+    raspuns = _importa(client, utilizator, '﻿title,status,rating\nDark,Completed,9\nLost,,\n')
+    assert raspuns.status_code == 200
+    assert raspuns.get_json() == {'imported': 2, 'skipped': 0, 'errors': []}
+    liste = client.get('/api/movies', headers=utilizator['headere']).get_json()
+    assert liste['Completed'] == [{'id': liste['Completed'][0]['id'], 'title': 'Dark', 'rating': '9'}]
+    assert [film['title'] for film in liste['To Watch']] == ['Lost']
+
+def test_randuri_csv_invalide_sunt_ignorate(client, utilizator):
+    continut = 'title,status\nDark,Completed\n,Watching\nLost,Abandoned\n"Arcane",Watching\n'
+    corp = _importa(client, utilizator, continut).get_json()
+    assert corp['imported'] == 2
+    assert corp['skipped'] == 2
+    assert corp['errors'] == [{'line': 3, 'message': 'Titlul este obligatoriu'},
+                              {'line': 4, 'message': 'Status invalid'}]
+    assert _titluri(client, utilizator) == ['Arcane', 'Dark']
+
+@pytest.mark.parametrize('continut', ['', 'name,status\nDark,Completed\n', 'Dark,Completed\n'])
+def test_csv_fara_coloana_title(client, utilizator, continut):
+    raspuns = _importa(client, utilizator, continut)
+    assert raspuns.status_code == 400
+    assert 'title' in raspuns.get_json()['message']
+
+def test_csv_cu_codare_invalida(client, utilizator):
+    raspuns = _importa(client, utilizator, b'title\nDark\n\xff\xfe\xfa\n')
+    assert raspuns.status_code == 400
+    assert raspuns.get_json()['message'].startswith('Fisier invalid')
+
+@pytest.mark.parametrize('continut', ['title\nDark\n"Lost\nArcane\n', 'title,status\n"Dark"x,Watching\n'])
+def test_csv_cu_ghilimele_invalide(client, utilizator, continut):
+    # Ghilimelele neinchise nu inghit restul fisierului intr-un singur titlu
+    raspuns = _importa(client, utilizator, continut)
+    assert raspuns.status_code == 400
+    assert raspuns.get_json()['message'].startswith('Fisier invalid')
+    assert _titluri(client, utilizator) == []
+
+def test_loturile_salvate_raman_dupa_eroare(client, utilizator, monkeypatch):
+    monkeypatch.setattr(library_io, 'DIMENSIUNE_LOT', 100)
+    # Fluxul este decodat in bucati de cativa KB: eroarea apare dupa ce primele randuri au fost citite
+    continut = 'title\n' + ''.join(f'Film {i:05d}\n' for i in range(3000))
+    raspuns = _importa(client, utilizator, continut.encode() + b'\xff\n')
+    assert raspuns.status_code == 400
+    # Loturile complete salvate inainte de eroare raman, lotul in curs este anulat
+    salvate = len(_titluri(client, utilizator))
+    assert 0 < salvate < 3000
+    assert salvate % 100 == 0
+
+def test_import_jsonl_cu_linii_invalide(client, utilizator):
+    linii = [
+        json.dumps({'title': 'Dark', 'status': 'Watching', 'rating': 8}),
+        '{"title": "Lost"',
+        '',
+        '["nu", "obiect"]',
+        json.dumps({'title': 42}),
+        json.dumps({'title': 'Arcane', 'status': 'Gata'}),
+        json.dumps({'title': 'Severance'}),
+    ]
+    raspuns = _importa(client, utilizator, '\n'.join(linii) + '\n', tip='application/x-ndjson')
+    assert raspuns.status_code == 200
+    corp = raspuns.get_json()
+    assert corp['imported'] == 2
+    assert corp['skipped'] == 4
+    assert corp['errors'] == [
+        {'line': 2, 'message': 'Rand invalid'},
+        {'line': 4, 'message': 'Rand invalid'},
+        {'line': 5, 'message': 'Titlul este obligatoriu'},
+        {'line': 6, 'message': 'Status invalid'},
+    ]
+    assert _titluri(client, utilizator) == ['Dark', 'Severance']
+
+def test_erorile_sunt_limitate(client, utilizator):
+    continut = 'title\n' + '\n'.join('""' for _ in range(library_io.MAXIM_ERORI + 10)) + '\n'
+    corp = _importa(client, utilizator, continut).get_json()
+    assert corp['skipped'] == library_io.MAXIM_ERORI + 10
+    assert len(corp['errors']) == library_io.MAXIM_ERORI
+
+def test_format_necunoscut(client, utilizator):
+    assert _importa(client, utilizator, 'title\nDark\n', tip='application/octet-stream').status_code == 400
+    assert _importa(client, utilizator, 'title\nDark\n', format='xml').status_code == 400
+
+def test_import_fara_token(client):
+    raspuns = client.post('/api/movies/import', data=b'title\nDark\n', content_type='text/csv')
+    assert raspuns.status_code == 401
+
+@pytest.mark.parametrize('format_fisier', ['csv', 'jsonl'])
+def test_export_si_reimport(client, creeaza_utilizator, format_fisier):
+    sursa, destinatie = creeaza_utilizator(), creeaza_utilizator()
+    _importa(client, sursa, 'title,status,rating\n"Dark, sezonul 1",Completed,9\nLost,To Watch,-\n')
+
+    exportat = client.get('/api/movies/export', query_string={'format': format_fisier}, headers=sursa['headere'])
+    assert exportat.status_code == 200
+    corp = _importa(client, destinatie, exportat.data, format=format_fisier).get_json()
+    assert corp == {'imported': 2, 'skipped': 0, 'errors': []}
+    assert _titluri(client, destinatie) == _titluri(client, sursa)
@@ -0,0 +1,97 @@
+"""
+Teste pentru migrarile versionate ale schemei (models/migrations.py)
+"""
+import sqlite3
+
+import pytest
+
+from models import database
+from models.migrations import MIGRARI, aplica_migrarile, migrari_in_asteptare, versiune_curenta
+
+ULTIMA_VERSIUNE = MIGRARI[-1][0]
+
+# Schema de baza, asa cum era inainte de migrari (user_version 0)
+SCHEMA_VECHE = (
+    'CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT UNIQUE, password TEXT)',
+    'CREATE TABLE movies (id INTEGER PRIMARY KEY, user_id INTEGER, title TEXT, status TEXT, rating TEXT)',
+    'CREATE TABLE friends (id INTEGER PRIMARY KEY, user_id INTEGER, friend_id INTEGER, UNIQUE(user_id, friend_id))',
+    'CREATE TABLE recommendations (id INTEGER PRIMARY KEY, from_user_id INTEGER, to_user_id INTEGER, movie_title TEXT)',
+)
+
+@pytest.fixture
+def cale_db(tmp_path, monkeypatch):
+    cale = str(tmp_path / 'migrari.db')
+    monkeypatch.setattr(database, 'DB_PATH', cale)
+    return cale
+
+def _obiecte(conn, tip):
+    return {rand[0] for rand in conn.execute('SELECT name FROM sqlite_master WHERE type = ?', (tip,))}
+
+def test_versiunile_sunt_consecutive():
+    assert [migrare[0] for migrare in MIGRARI] == list(range(1, len(MIGRARI) + 1))
+
+def test_baza_noua(cale_db):
+    database.init_db()
+
+    with sqlite3.connect(cale_db) as conn:
+        assert versiune_curenta(conn) == ULTIMA_VERSIUNE
+        assert migrari_in_asteptare(conn) == []
+        indexuri = _obiecte(conn, 'index')
+        assert {'idx_movies_user_keyset', 'idx_recommendations_to_user', 'idx_friends_friend',
+                'idx_changes_user_version'} <= indexuri
+        # Indexul inlocuit de migrarea 5 nu mai exista
+        assert 'idx_movies_user_status' not in indexuri
+        assert {'user_versions', 'changes', 'catalog_shows', 'catalog_shows_fts'} <= _obiecte(conn, 'table')
+
+def test_init_db_repetat_nu_mai_aplica_nimic(cale_db):
+    database.init_db()
+    database.init_db()
+
+    with sqlite3.connect(cale_db) as conn:
+        assert aplica_migrarile(conn) == []
+        assert versiune_curenta(conn) == ULTIMA_VERSIUNE
+
+def test_baza_veche_pastreaza_datele(cale_db):
+    with sqlite3.connect(cale_db) as conn:
+        for instructiune in SCHEMA_VECHE:
+            conn.execute(instructiune)
+        conn.execute("INSERT INTO users (id, username, password) VALUES (1, 'ana', 'x')")
+        conn.execute("INSERT INTO movies (user_id, title, status, rating) VALUES (1, 'Dark', 'Watching', '-')")
+        assert versiune_curenta(conn) == 0
+
+    database.init_db()
+
+    with sqlite3.connect(cale_db) as conn:
+        assert versiune_curenta(conn) == ULTIMA_VERSIUNE
+        assert conn.execute('SELECT title, status FROM movies').fetchall() == [('Dark', 'Watching')]
+
+        # Triggerele din migrarile 6 si 7 urmaresc modificarile de dupa migrare
+        conn.execute("INSERT INTO movies (user_id, title, status, rating) VALUES (1, 'Lost', 'To Watch', '-')")
+        assert conn.execute('SELECT version FROM user_versions WHERE user_id = 1').fetchone() == (1,)
+        assert conn.execute('SELECT entity, op, version FROM changes WHERE user_id = 1').fetchall() == [('movie', 'upsert', 1)]
+
+def test_baza_partial_migrata(cale_db):
+    with sqlite3.connect(cale_db, isolation_level=None) as conn:
+        for instructiune in SCHEMA_VECHE:
+            conn.execute(instructiune)
+        for versiune, _, instructiuni in MIGRARI[:3]:
+            for instructiune in instructiuni:
+                conn.execute(instructiune)
+        conn.execute('PRAGMA user_version = 3')
+
+        assert [migrare[0] for migrare in migrari_in_asteptare(conn)] == list(range(4, ULTIMA_VERSIUNE + 1))
+        assert aplica_migrarile(conn) == list(range(4, ULTIMA_VERSIUNE + 1))
+        assert versiune_curenta(conn) == ULTIMA_VERSIUNE
+
+def test_migrare_esuata_nu_schimba_versiunea(cale_db, monkeypatch):
+    with sqlite3.connect(cale_db, isolation_level=None) as conn:
+        for instructiune in SCHEMA_VECHE:
+            conn.execute(instructiune)
+        migrari = MIGRARI + [(ULTIMA_VERSIUNE + 1, 'Migrare invalida', ['CREATE INDEX idx_invalid ON lipsa (x)'])]
+        monkeypatch.setattr('models.migrations.MIGRARI', migrari)
+
+        with pytest.raises(sqlite3.OperationalError):
+            aplica_migrarile(conn)
+        # Migrarile valide au fost salvate, cea esuata nu
+        assert versiune_curenta(conn) == ULTIMA_VERSIUNE
+        assert not conn.in_transaction
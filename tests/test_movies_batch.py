@@ -0,0 +1,129 @@
+"""
+Teste pentru POST /api/movies/batch (mai multe operatii pe filme intr-o singura tranzactie)
+"""
+import sqlite3
+
+import pytest
+
+from routes import movie_routes
+from routes.movie_routes import MAXIM_OPERATII_BATCH
+
+def _batch(client, utilizator, operatii):
+    raspuns = client.post('/api/movies/batch', json={'operations': operatii}, headers=utilizator['headere'])
+    assert raspuns.status_code == 200
+    return [rezultat['status'] for rezultat in raspuns.get_json()['results']]
+
+def _filme(client, utilizator):
+    liste = client.get('/api/movies', headers=utilizator['headere']).get_json()
+    return {film['title']: (status, film['rating'], film['id']) for status, lista in liste.items() for film in lista}
+
+def _adauga(client, utilizator, *titluri):
+    assert _batch(client, utilizator, [{'op': 'add', 'title': titlu} for titlu in titluri]) == [201] * len(titluri)
+    filme = _filme(client, utilizator)
+    return [filme[titlu][2] for titlu in titluri]
+
+def test_operatii_mixte(client, utilizator):
+    id_dark, id_lost, id_arcane = _adauga(client, utilizator, 'Dark', 'Lost', 'Arcane')
+
+    statusuri = _batch(client, utilizator, [
+        {'op': 'add', 'title': 'Severance', 'status': 'Watching'},
+        {'op': 'move', 'id': id_dark, 'new_list': 'Completed'},
+        {'op': 'rate', 'id': id_dark, 'rating': 9},
+        {'op': 'rate', 'id': id_lost, 'rating': ' 7 '},
+        {'op': 'delete', 'id': id_arcane},
+    ])
+    assert statusuri == [201, 200, 200, 200, 200]
+
+    filme = _filme(client, utilizator)
+    assert filme['Severance'][:2] == ('Watching', '-')
+    assert filme['Dark'][:2] == ('Completed', '9')
+    assert filme['Lost'][:2] == ('To Watch', '7')
+    assert 'Arcane' not in filme
+
+def test_filmul_altui_utilizator(client, creeaza_utilizator):
+    proprietar, strain = creeaza_utilizator(), creeaza_utilizator()
+    [id_film] = _adauga(client, proprietar, 'Dark')
+
+    statusuri = _batch(client, strain, [
+        {'op': 'move', 'id': id_film, 'new_list': 'Completed'},
+        {'op': 'rate', 'id': id_film, 'rating': 1},
+        {'op': 'delete', 'id': id_film},
+    ])
+    assert statusuri == [404, 404, 404]
+    assert _filme(client, proprietar)['Dark'][:2] == ('To Watch', '-')
+
+def test_operatiile_dupa_stergere(client, utilizator):
+    [id_film] = _adauga(client, utilizator, 'Dark')
+
+    statusuri = _batch(client, utilizator, [
+        {'op': 'delete', 'id': id_film},
+        {'op': 'move', 'id': id_film, 'new_list': 'Completed'},
+        {'op': 'rate', 'id': id_film, 'rating': 5},
+        {'op': 'delete', 'id': id_film},
+    ])
+    assert statusuri == [200, 404, 404, 404]
+    assert _filme(client, utilizator) == {}
+
+@pytest.mark.parametrize('operatie, status', [
+    ({'op': 'delete', 'id': [1]}, 400),
+    ({'op': 'delete', 'id': {'id': 1}}, 400),
+    ({'op': 'delete', 'id': True}, 400),
+    ({'op': 'delete', 'id': '1'}, 400),
+    ({'op': 'delete'}, 400),
+    ({'op': 'rate', 'rating': [1]}, 400),
+    ({'op': 'rate', 'rating': {'nota': 1}}, 400),
+    ({'op': 'rate', 'rating': 11}, 400),
+    ({'op': 'rate', 'rating': '0'}, 400),
+    ({'op': 'rate', 'rating': True}, 400),
+    ({'op': 'rate'}, 400),
+    ({'op': 'move', 'new_list': 'Abandoned'}, 400),
+    ({'op': 'add', 'title': ''}, 400),
+    ({'op': 'add', 'title': 'X', 'status': 'Gata'}, 400),
+    ({'op': 'zboara'}, 400),
+    ('nu este obiect', 400),
+    ({'op': 'delete', 'id': 2 ** 62}, 404),
+])
+def test_operatiile_invalide_nu_opresc_restul(client, utilizator, operatie, status):
+    id_dark, id_lost = _adauga(client, utilizator, 'Dark', 'Lost')
+    if isinstance(operatie, dict) and operatie.get('op') in ('rate', 'move') and 'id' not in operatie:
+        operatie = dict(operatie, id=id_dark)
+
+    statusuri = _batch(client, utilizator, [
+        {'op': 'add', 'title': 'Arcane'},
+        operatie,
+        {'op': 'rate', 'id': id_dark, 'rating': '8'},
+        {'op': 'move', 'id': id_lost, 'new_list': 'Watching'},
+    ])
+    assert statusuri == [201, status, 200, 200]
+
+    filme = _filme(client, utilizator)
+    assert 'Arcane' in filme
+    assert filme['Dark'][1] == '8'
+    assert filme['Lost'][0] == 'Watching'
+
+def test_prea_multe_operatii(client, utilizator):
+    operatii = [{'op': 'add', 'title': f'Film {i}'} for i in range(MAXIM_OPERATII_BATCH + 1)]
+    raspuns = client.post('/api/movies/batch', json={'operations': operatii}, headers=utilizator['headere'])
+    assert raspuns.status_code == 400
+    assert _filme(client, utilizator) == {}
+
+@pytest.mark.parametrize('corp', [None, {}, {'operations': 'x'}])
+def test_cerere_invalida(client, utilizator, corp):
+    raspuns = client.post('/api/movies/batch', json=corp, headers=utilizator['headere'])
+    assert raspuns.status_code == 400
+
+def test_fara_token(client):
+    raspuns = client.post('/api/movies/batch', json={'operations': []})
+    assert raspuns.status_code == 401
+
+def test_eroare_a_bazei_de_date(client, utilizator, monkeypatch):
+    def aplica_defect(conn, *operatii):
+        conn.execute("INSERT INTO movies (user_id, title, status, rating) VALUES (?, 'Fantoma', 'To Watch', '-')",
+                     (utilizator['id'],))
+        raise sqlite3.OperationalError('database is locked')
+    monkeypatch.setattr(movie_routes, 'aplica_operatii_filme', aplica_defect)
+
+    raspuns = client.post('/api/movies/batch', json={'operations': [{'op': 'add', 'title': 'Dark'}]},
+                          headers=utilizator['headere'])
+    assert raspuns.status_code == 500
+    assert _filme(client, utilizator) == {}
@@ -0,0 +1,107 @@
+"""
+Teste pentru paginarea dupa cheie (services/pagination.py) si cursoarele ei
+"""
+import pytest
+
+from models.database import get_db_connection
+from services.pagination import (CursorInvalid, decodeaza_cursor, encodeaza_cursor, itereaza_filme,
+                                 pagina_filme, pagina_recomandari)
+
+@pytest.fixture
+def conn():
+    conexiune = get_db_connection()
+    yield conexiune
+    conexiune.close()
+
+# Filmele au si titluri / statusuri NULL (date vechi, inserate direct in baza de date)
+FILME = [
+    ('Completed', 'Dark'), ('Completed', None), ('Completed', 'Dark'), ('To Watch', 'Lost'),
+    (None, 'Fara status'), (None, None), ('Watching', None), ('Watching', 'Arcane'), ('Watching', 'arcane'),
+]
+
+@pytest.fixture
+def filme(conn, utilizator):
+    conn.executemany("INSERT INTO movies (user_id, title, status, rating) VALUES (?, ?, ?, '-')",
+                     [(utilizator['id'], titlu, status) for status, titlu in FILME])
+    conn.commit()
+    return conn.execute('SELECT id, title, status FROM movies WHERE user_id = ? ORDER BY status, title, id',
+                        (utilizator['id'],)).fetchall()
+
+@pytest.mark.parametrize('cheie', [
+    ['Watching', 'Dark', 7],
+    ['Watching', None, 7],
+    [None, None, 1],
+    ['Completed', 'Ţară şi ăâî', 2 ** 63 - 1],
+])
+def test_cursor_dus_intors(cheie):
+    token = encodeaza_cursor(cheie)
+    assert '=' not in token
+    assert decodeaza_cursor(token) == cheie
+
+@pytest.mark.parametrize('token', ['', 'nu-este-base64!', encodeaza_cursor({'id': 1}), 'e30'])
+def test_cursor_invalid(token):
+    with pytest.raises(CursorInvalid):
+        decodeaza_cursor(token)
+
+@pytest.mark.parametrize('cheie', [['Watching', 'Dark'], ['Watching', 'Dark', 'x'], [1, 'Dark', 1],
+                                   ['Watching', 'Dark', True], ['Watching', 'Dark', 2 ** 63]])
+def test_cheie_invalida_pentru_filme(conn, utilizator, cheie):
+    with pytest.raises(CursorInvalid):
+        pagina_filme(conn, utilizator['id'], 10, encodeaza_cursor(cheie))
+
+@pytest.mark.parametrize('limita', [1, 2, 3, 100])
+def test_paginile_acopera_toata_lista_cu_null(conn, utilizator, filme, limita):
+    vazute, cursor = [], None
+    while True:
+        randuri, cursor = pagina_filme(conn, utilizator['id'], limita, cursor)
+        assert len(randuri) <= limita
+        vazute.extend(rand['id'] for rand in randuri)
+        if cursor is None:
+            break
+    # Aceeasi ordine ca ORDER BY status, title, id: fara duplicate si fara randuri sarite
+    assert vazute == [rand['id'] for rand in filme]
+
+def test_cursor_dupa_titlu_null(conn, utilizator, filme):
+    # Cursorul construit dintr-un rand cu titlu NULL continua cu randul urmator din ordine
+    pozitie = next(i for i, rand in enumerate(filme) if rand['status'] == 'Watching' and rand['title'] is None)
+    rand = filme[pozitie]
+    cursor = encodeaza_cursor([rand['status'], None, rand['id']])
+    randuri, _ = pagina_filme(conn, utilizator['id'], 100, cursor)
+    assert [r['id'] for r in randuri] == [r['id'] for r in filme[pozitie + 1:]]
+
+def test_itereaza_filme(conn, utilizator, filme):
+    assert [rand['id'] for rand in itereaza_filme(conn, utilizator['id'], dimensiune_pagina=2)] == [rand['id'] for rand in filme]
+
+def test_pagini_recomandari(conn, utilizator):
+    expeditor = utilizator['id']
+    conn.executemany('INSERT INTO recommendations (from_user_id, to_user_id, movie_title) VALUES (?, ?, ?)',
+                     [(expeditor, expeditor, f'Film {i}') for i in range(5)])
+    conn.commit()
+
+    vazute, cursor = [], None
+    while True:
+        randuri, cursor = pagina_recomandari(conn, expeditor, 2, cursor)
+        vazute.extend(rand['id'] for rand in randuri)
+        if cursor is None:
+            break
+    assert len(vazute) == 5
+    assert vazute == sorted(vazute, reverse=True)
+
+def test_ruta_filme_paginata(client, utilizator, filme):
+    titluri, cursor = [], None
+    while True:
+        parametri = {'limit': 4} if cursor is None else {'limit': 4, 'cursor': cursor}
+        raspuns = client.get('/api/movies', query_string=parametri, headers=utilizator['headere'])
+        assert raspuns.status_code == 200
+        corp = raspuns.get_json()
+        titluri.extend(film['title'] for lista in corp['movies'].values() for film in lista)
+        cursor = corp['next_cursor']
+        if cursor is None:
+            break
+    # Filmele fara status nu apar in nicio lista, dar nu opresc paginarea
+    asteptate = [rand['title'] for rand in filme if rand['status'] is not None]
+    assert sorted(titluri, key=str) == sorted(asteptate, key=str)
+
+def test_ruta_filme_cursor_invalid(client, utilizator):
+    raspuns = client.get('/api/movies', query_string={'cursor': 'gunoi'}, headers=utilizator['headere'])
+    assert raspuns.status_code == 400
@@ -0,0 +1,90 @@
+"""
+Teste pentru profilarea la cerere (profiling.py)
+"""
+import os
+import tracemalloc
+
+import pytest
+from flask import Flask
+from werkzeug.test import Client
+
+import profiling
+from profiling import MiddlewareProfilare, activeaza_profilare
+
+CHEIE = 'cheie-de-test'
+
+@pytest.fixture
+def director(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, 'DIRECTOR_PROFILE', str(tmp_path))
+    return tmp_path
+
+@pytest.fixture
+def aplicatie():
+    app = Flask(__name__)
+
+    @app.route('/ping')
+    def ping():
+        return {'raspuns': sum(range(1000))}
+
+    return app
+
+@pytest.fixture
+def client_profilat(aplicatie):
+    aplicatie.wsgi_app = MiddlewareProfilare(aplicatie.wsgi_app, cheie=CHEIE)
+    return Client(aplicatie)
+
+def test_fara_cheie_configurata_middleware_ul_nu_este_instalat(aplicatie, monkeypatch):
+    monkeypatch.setattr(profiling, 'CHEIE_PROFILARE', '')
+    activeaza_profilare(aplicatie)
+    # wsgi_app ramane metoda clasei Flask, fara niciun strat in fata
+    assert 'wsgi_app' not in vars(aplicatie)
+
+def test_cu_cheie_configurata_middleware_ul_este_instalat(aplicatie, monkeypatch):
+    monkeypatch.setattr(profiling, 'CHEIE_PROFILARE', CHEIE)
+    activeaza_profilare(aplicatie)
+    assert isinstance(aplicatie.wsgi_app, MiddlewareProfilare)
+
+def test_backend_fara_cheie_nu_profileaza(app, client, director):
+    # conftest sterge MOVIE_MANAGER_PROFILE_KEY, deci backend-ul nu are middleware
+    assert not isinstance(app.wsgi_app, MiddlewareProfilare)
+    raspuns = client.get('/api/health', headers={'X-Profile': ''})
+    assert raspuns.status_code == 200
+    assert 'X-Profile-Files' not in raspuns.headers
+    assert os.listdir(director) == []
+
+@pytest.mark.parametrize('headere, query', [
+    ({}, ''),
+    ({'X-Profile': 'cheie-gresita'}, ''),
+    ({}, f'_profile={CHEIE}'),
+])
+def test_cereri_neautorizate_nu_sunt_profilate(client_profilat, director, headere, query):
+    raspuns = client_profilat.get('/ping', query_string=query, headers=headere)
+    assert raspuns.status_code == 200
+    assert raspuns.get_json() == {'raspuns': 499500}
+    assert 'X-Profile-Files' not in raspuns.headers
+    assert os.listdir(director) == []
+
+@pytest.mark.parametrize('format_profil, extensie', [('pstats', '.prof'), ('collapsed', '.collapsed')])
+def test_cerere_autorizata_este_profilata(client_profilat, director, format_profil, extensie):
+    raspuns = client_profilat.get('/ping', headers={'X-Profile': CHEIE, 'X-Profile-Format': format_profil})
+    assert raspuns.status_code == 200
+    assert raspuns.get_json() == {'raspuns': 499500}
+    fisiere = raspuns.headers['X-Profile-Files'].split(', ')
+    assert len(fisiere) == 1 and fisiere[0].endswith(extensie)
+    assert os.listdir(director) == fisiere
+    assert raspuns.headers['X-Profile-Time'].endswith('ms')
+
+def test_profilarea_memoriei_opreste_tracemalloc(client_profilat, director):
+    assert not tracemalloc.is_tracing()
+    raspuns = client_profilat.get('/ping', headers={'X-Profile': CHEIE, 'X-Profile-Memory': '1'})
+    assert raspuns.status_code == 200
+    assert any(fisier.endswith('.mem.txt') for fisier in raspuns.headers['X-Profile-Files'].split(', '))
+    assert not tracemalloc.is_tracing()
+
+def test_tracemalloc_pornit_din_afara_ramane_pornit(client_profilat, director):
+    tracemalloc.start()
+    try:
+        client_profilat.get('/ping', headers={'X-Profile': CHEIE, 'X-Profile-Memory': '1'})
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
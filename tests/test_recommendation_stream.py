@@ -0,0 +1,59 @@
+"""
+Teste pentru fluxul SSE (/api/recommendations/stream): limita de fluxuri si token-urile de flux
+"""
+import pytest
+
+import security
+from security import emite_token_flux, verifica_token_flux
+from services.events import HubEvenimente, PreaMultiAbonati, hub_recomandari
+
+def test_hub_respinge_peste_limita():
+    hub = HubEvenimente(maxim_abonati=2)
+    primul, _ = hub.aboneaza(1), hub.aboneaza(2)
+    with pytest.raises(PreaMultiAbonati):
+        hub.aboneaza(3)
+    hub.dezaboneaza(primul)
+    hub.aboneaza(3)
+
+def test_503_cu_retry_after_peste_limita(client, utilizator, monkeypatch):
+    monkeypatch.setattr(hub_recomandari, 'maxim_abonati', 0)
+    raspuns = client.get('/api/recommendations/stream', headers=utilizator['headere'])
+    assert raspuns.status_code == 503
+    assert int(raspuns.headers['Retry-After']) > 0
+    assert hub_recomandari.statistici()['subscribers'] == 0
+
+def test_token_api_nu_este_acceptat_in_url(client, utilizator):
+    token_api = utilizator['headere']['Authorization']
+    raspuns = client.get('/api/recommendations/stream', query_string={'token': token_api})
+    assert raspuns.status_code == 401
+
+def test_token_de_flux(client, utilizator):
+    raspuns = client.post('/api/recommendations/stream-token', headers=utilizator['headere'])
+    assert raspuns.status_code == 200
+    corp = raspuns.get_json()
+    assert corp['expires_in'] > 0
+    assert utilizator['nume'] not in corp['token']
+    assert verifica_token_flux(corp['token']) == utilizator['id']
+
+    flux = client.get('/api/recommendations/stream', query_string={'token': corp['token']}, buffered=False)
+    try:
+        assert flux.status_code == 200
+        assert flux.mimetype == 'text/event-stream'
+    finally:
+        flux.close()
+
+def test_token_de_flux_nu_este_token_api(client, utilizator):
+    token_flux = client.post('/api/recommendations/stream-token', headers=utilizator['headere']).get_json()['token']
+    assert client.get('/api/movies', headers={'Authorization': token_flux}).status_code == 401
+    assert client.post('/api/recommendations/stream-token').status_code == 401
+
+def test_token_de_flux_expirat_sau_modificat(utilizator, monkeypatch):
+    token = emite_token_flux(utilizator['id'])
+    id_user, expira, semnatura = token.split('.')
+    assert verifica_token_flux(f'{int(id_user) + 1}.{expira}.{semnatura}') is None
+    assert verifica_token_flux(f'{id_user}.{int(expira) + 1000}.{semnatura}') is None
+    assert verifica_token_flux(f'{id_user}.{expira}.ă{semnatura[1:]}') is None
+    assert verifica_token_flux('') is None
+
+    monkeypatch.setattr(security.time, 'time', lambda: int(expira) + 1)
+    assert verifica_token_flux(token) is None